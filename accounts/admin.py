@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.utils.html import format_html
+from core.replicas import ReplicaChangeListMixin
 from .models import CustomUser, Profile
 
 
@@ -16,7 +17,7 @@ class ProfileInline(admin.StackedInline):
 
 
 @admin.register(CustomUser)
-class CustomUserAdmin(UserAdmin):
+class CustomUserAdmin(ReplicaChangeListMixin, UserAdmin):
     """
     Custom admin configuration for CustomUser.
     Uses email as the primary identifier and includes role management.
@@ -46,7 +47,7 @@ class CustomUserAdmin(UserAdmin):
 
 
 @admin.register(Profile)
-class ProfileAdmin(admin.ModelAdmin):
+class ProfileAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
     """
     Admin configuration for Profile model.
     """
@@ -0,0 +1,160 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.functional import LazyObject, empty
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import CustomUser
+
+# User fields copied into every token, so the hot path never needs the row
+TOKEN_USER_CLAIMS = ("role", "is_staff", "is_superuser", "is_active")
+
+
+def add_user_claims(token, user):
+    """
+    Stamp role and staff flags onto a token issued for user.
+    """
+    for field in TOKEN_USER_CLAIMS:
+        token[field] = getattr(user, field)
+    return token
+
+
+class UserCache:
+    """
+    Bounded, thread-safe LRU of CustomUser rows keyed by id.
+    Callers get their own copy, so a request mutating its user cannot leak into others.
+    Entries are dropped on CustomUser save/delete (see accounts.signals) and expire
+    after ttl seconds, which bounds staleness across worker processes.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                return copy.copy(entry[1])
+
+        user = CustomUser.objects.filter(pk=user_id).first()
+        if user is not None:
+            with self._lock:
+                self._entries[user_id] = (now + self.ttl, user)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            user = copy.copy(user)
+        return user
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(
+    maxsize=getattr(settings, "AUTH_USER_CACHE_SIZE", 1024),
+    ttl=getattr(settings, "AUTH_USER_CACHE_TTL", 60),
+)
+
+
+class TokenClaimsUser(LazyObject):
+    """
+    Request user built from token claims.
+
+    id, pk, role and the staff/active flags are answered from the claims, and the
+    object passes isinstance checks against CustomUser, so role checks and queryset
+    filters such as Course.objects.filter(instructor=request.user) run without
+    touching the users table. Any other attribute loads the full row through
+    user_cache on first access.
+    """
+
+    def __init__(self, user_id, claims):
+        super().__init__()
+        self.__dict__["_claims"] = {
+            "id": user_id,
+            "pk": user_id,
+            "is_authenticated": True,
+            "is_anonymous": False,
+            **{field: claims[field] for field in TOKEN_USER_CLAIMS},
+        }
+
+    # Lets Model.__eq__ and related-field checks compare against this object without loading it
+    _meta = CustomUser._meta
+
+    def _setup(self):
+        user = user_cache.get(self._claims["id"])
+        if user is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        self._wrapped = user
+
+    def __getattr__(self, name):
+        claims = self.__dict__["_claims"]
+        if name in claims and self._wrapped is empty:
+            return claims[name]
+        if not name.startswith("_") and not hasattr(CustomUser, name):
+            # Duck-typing probes such as hasattr(user, "resolve_expression") in the ORM
+            raise AttributeError(name)
+        return super().__getattr__(name)
+
+    @property
+    def __class__(self):
+        return CustomUser
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        return isinstance(other, CustomUser) and other.pk == self.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __copy__(self):
+        return TokenClaimsUser(self.pk, self.__dict__["_claims"])
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()
+
+    def __repr__(self):
+        return f"<TokenClaimsUser: {self.pk} ({self.role})>"
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication without the per-request CustomUser SELECT.
+
+    Tokens issued by CustomTokenObtainPairSerializer carry TOKEN_USER_CLAIMS and
+    resolve to a TokenClaimsUser. Older tokens without those claims resolve through
+    the LRU user cache instead of a query per request.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken("Token contained no recognizable user identification") from e
+
+        if all(field in validated_token for field in TOKEN_USER_CLAIMS):
+            user = TokenClaimsUser(user_id, validated_token)
+        else:
+            user = user_cache.get(user_id)
+            if user is None:
+                raise AuthenticationFailed("User not found", code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
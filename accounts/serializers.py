@@ -1,11 +1,13 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
+from accounts.authentication import add_user_claims
 from accounts.models import CustomUser, Profile
+from core.sparse import SparseSerializerMixin
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for user profile information.
     Provides basic profile fields for nested inclusion.
@@ -16,7 +18,7 @@ class ProfileSerializer(serializers.ModelSerializer):
         ref_name = "AccountsProfile"   # ✅ unique schema name to avoid conflicts
 
 
-class CustomUserSerializer(serializers.ModelSerializer):
+class CustomUserSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for listing and retrieving users.
     Includes nested profile information.
@@ -35,13 +37,14 @@ class CustomUserSerializer(serializers.ModelSerializer):
             "is_staff",
         ]
         read_only_fields = ["id", "is_active", "is_staff"]
+        expandable_fields = {"profile": None}
 
     def to_representation(self, instance):
         """
         Ensure null safety for nested profile.
         """
         representation = super().to_representation(instance)
-        if not getattr(instance, "profile", None):
+        if "profile" in self.fields and not getattr(instance, "profile", None):
             representation["profile"] = None
         return representation
 
@@ -97,6 +100,10 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
     username_field = "email"
 
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
     def validate(self, attrs):
         data = super().validate(attrs)
         data.update({
@@ -1,5 +1,6 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from .authentication import user_cache
 from .models import CustomUser, Profile
 
 
@@ -15,3 +16,12 @@ def create_or_update_user_profile(sender, instance, created, **kwargs):
     else:
         if hasattr(instance, "profile"):
             instance.profile.save()
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Drop the user from the authentication LRU so the next request reloads it.
+    """
+    user_cache.invalidate(instance.pk)
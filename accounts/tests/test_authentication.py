@@ -0,0 +1,108 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from accounts.authentication import TokenClaimsUser, UserCache, user_cache
+from accounts.models import CustomUser
+from courses.models import Course
+
+
+class ClaimsJWTAuthenticationTests(TestCase):
+    """
+    Tests for token claims, TokenClaimsUser and the LRU user cache.
+    """
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.client = APIClient()
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.course = Course.objects.create(title="Math 101", instructor=self.instructor)
+
+    def login(self, email="instructor@example.com"):
+        response = self.client.post("/accounts/login/", {"email": email, "password": "password123"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def user_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [q["sql"] for q in ctx.captured_queries if "accounts_customuser" in q["sql"]]
+
+    def test_login_token_carries_role_claims(self):
+        access = AccessToken(self.login()["access"])
+        self.assertEqual(access["role"], "instructor")
+        self.assertFalse(access["is_staff"])
+        self.assertTrue(access["is_active"])
+
+    def test_authenticated_request_does_not_query_users(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.login()['access']}")
+        user_cache.clear()
+        self.assertEqual(self.user_queries("/analytics/instructor/"), [])
+        response = self.client.get("/api/courses/")
+        self.assertEqual([course["title"] for course in response.json()], ["Math 101"])
+
+    def test_inactive_claim_is_rejected(self):
+        token = AccessToken.for_user(self.instructor)
+        for field, value in (("role", "instructor"), ("is_staff", False), ("is_superuser", False), ("is_active", False)):
+            token[field] = value
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(self.client.get("/api/courses/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_without_claims_uses_user_cache(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.instructor)}")
+        self.assertEqual(len(self.user_queries("/analytics/instructor/")), 1)
+        self.assertEqual(self.user_queries("/analytics/instructor/"), [])
+
+    def test_claims_user_behaves_like_custom_user(self):
+        user = TokenClaimsUser(self.instructor.pk, {
+            "role": "instructor", "is_staff": False, "is_superuser": False, "is_active": True,
+        })
+        with self.assertNumQueries(1):
+            self.assertIsInstance(user, CustomUser)
+            self.assertEqual(user, self.instructor)
+            self.assertEqual(list(Course.objects.filter(instructor=user)), [self.course])
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, "instructor@example.com")
+        self.assertEqual(TokenClaimsUser(self.instructor.pk, user.__dict__["_claims"]).email, user.email)
+
+    def test_save_invalidates_user_cache(self):
+        self.assertEqual(user_cache.get(self.instructor.pk).username, None)
+        self.instructor.username = "prof"
+        self.instructor.save()
+        self.assertEqual(user_cache.get(self.instructor.pk).username, "prof")
+
+    def test_user_cache_is_bounded(self):
+        lru = UserCache(maxsize=2)
+        users = [self.instructor] + [
+            CustomUser.objects.create_user(email=f"user{i}@example.com", password="password123") for i in range(2)
+        ]
+        for user in users:
+            lru.get(user.pk)
+        self.assertEqual(list(lru._entries), [users[1].pk, users[2].pk])
+
+    def test_refresh_restamps_role(self):
+        refresh = self.login()["refresh"]
+        self.instructor.role = "admin"
+        self.instructor.save()
+        response = self.client.post("/accounts/refresh/", {"refresh": refresh}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(AccessToken(response.data["access"])["role"], "admin")
+        self.assertEqual(RefreshToken(refresh)["role"], "instructor")
+
+    def test_refresh_ignores_stale_cached_user(self):
+        tokens = self.login()
+        refresh = tokens["refresh"]
+        user_cache.get(AccessToken(tokens["access"])["user_id"])
+        # Saved by another worker process, whose signal cannot reach this process's cache
+        CustomUser.objects.filter(pk=self.instructor.pk).update(role="admin", is_staff=True)
+        response = self.client.post("/accounts/refresh/", {"refresh": refresh}, format="json")
+        access = AccessToken(response.data["access"])
+        self.assertEqual((access["role"], access["is_staff"]), ("admin", True))
@@ -1,15 +1,16 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
     RegisterView,
     SignupView,
     ProfileViewSet,
     CustomUserViewSet,
     CustomTokenObtainPairView,
+    CustomTokenRefreshView,
     ForgotPasswordView,
     ResetPasswordConfirmView,
 )
+from django.db import connections
 from django.http import JsonResponse
 
 # ✅ Router setup
@@ -17,9 +18,17 @@ router = DefaultRouter()
 router.register(r"profile", ProfileViewSet, basename="profile")
 router.register(r"users", CustomUserViewSet, basename="user")
 
-# ✅ Health check view
+# ✅ Health check view (with connection pool metrics per database)
 def health_check(request):
-    return JsonResponse({"status": "ok"}, status=200)
+    databases = {}
+    for alias in connections:
+        connection = connections[alias]
+        pool_metrics = getattr(connection, "pool_metrics", None)
+        databases[alias] = {
+            "vendor": connection.vendor,
+            "pool": pool_metrics() if pool_metrics else None,
+        }
+    return JsonResponse({"status": "ok", "databases": databases}, status=200)
 
 # ✅ URL patterns
 urlpatterns = [
@@ -29,13 +38,13 @@ urlpatterns = [
 
     # JWT authentication endpoints
     path("login/", CustomTokenObtainPairView.as_view(), name="custom_token_obtain_pair"),
-    path("refresh/", TokenRefreshView.as_view(), name="custom_token_refresh"),
+    path("refresh/", CustomTokenRefreshView.as_view(), name="custom_token_refresh"),
 
     # Aliases for compatibility (global wiring under /api/auth/)
     path("auth/login/", CustomTokenObtainPairView.as_view(), name="auth_login"),
-    path("auth/refresh/", TokenRefreshView.as_view(), name="auth_refresh"),
+    path("auth/refresh/", CustomTokenRefreshView.as_view(), name="auth_refresh"),
     path("api/auth/login/", CustomTokenObtainPairView.as_view(), name="api_auth_login"),
-    path("api/auth/refresh/", TokenRefreshView.as_view(), name="api_auth_refresh"),
+    path("api/auth/refresh/", CustomTokenRefreshView.as_view(), name="api_auth_refresh"),
 
     # ✅ Forgot password (reset flow using custom API views)
     path("password-reset/", ForgotPasswordView.as_view(), name="password_reset"),
@@ -2,14 +2,18 @@ from rest_framework import permissions, viewsets, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.decorators import action, api_view, permission_classes
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.auth.forms import PasswordResetForm, SetPasswordForm
 from django.utils.http import urlsafe_base64_decode
 from django.contrib.auth import get_user_model
 
+from core.mixins import SparseFieldsMixin
+from .authentication import add_user_claims, user_cache
 from .models import CustomUser, Profile
 from .serializers import CustomUserSerializer, RegisterSerializer, ProfileSerializer
 
@@ -44,7 +48,7 @@ class SignupView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class CustomUserViewSet(viewsets.ModelViewSet):
+class CustomUserViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     serializer_class = CustomUserSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -71,7 +75,7 @@ class CustomUserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class ProfileViewSet(viewsets.ModelViewSet):
+class ProfileViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     serializer_class = ProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -108,6 +112,11 @@ class ProfileViewSet(viewsets.ModelViewSet):
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     username_field = "email"
 
+    @classmethod
+    def get_token(cls, user):
+        # Role and staff flags travel in the token so requests need no user lookup
+        return add_user_claims(super().get_token(user), user)
+
     def validate(self, attrs):
         data = super().validate(attrs)
         data.update({
@@ -123,6 +132,29 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
 
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Re-stamps the user claims on refreshed access tokens, so a role change takes
+    effect at the next refresh instead of when the refresh token expires.
+    """
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        access = AccessToken(data["access"], verify=False)
+        user_id = access[api_settings.USER_ID_CLAIM]
+        # The cached row may predate a change saved by another worker process
+        user_cache.invalidate(user_id)
+        user = user_cache.get(user_id)
+        if user is not None:
+            add_user_claims(access, user)
+            data["access"] = str(access)
+        return data
+
+
+class CustomTokenRefreshView(TokenRefreshView):
+    serializer_class = CustomTokenRefreshSerializer
+
+
 UserModel = get_user_model()
 
 
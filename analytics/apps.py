@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class AnalyticsConfig(AppConfig):
     name = 'analytics'
+
+    def ready(self):
+        """
+        Import signals so changes to already folded days queue them for re-folding.
+        """
+        import analytics.signals  # noqa
@@ -0,0 +1,49 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics import retention
+
+
+class Command(BaseCommand):
+    """
+    Compact AnalyticsLog events past the retention period into per-day counts and
+    remove the raw rows: whole monthly partitions on PostgreSQL, batched deletes otherwise.
+    Meant to run daily from cron; it also creates the upcoming monthly partitions.
+    """
+    help = "Compact old analytics log events into daily counts and delete the raw rows in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=getattr(settings, "ANALYTICS_LOG_RETENTION_DAYS", 90),
+            help="Keep raw events of this many most recent days.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows removed per DELETE.")
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between DELETE batches.")
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=2,
+            help="Monthly partitions to keep created ahead of the current month (PostgreSQL).",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 1:
+            raise CommandError("--days must be at least 1.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        started = time.perf_counter()
+        result = retention.compact(
+            retention_days=options["days"],
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+            months_ahead=options["months_ahead"],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Compacted {result['compacted_days']} days, dropped {result['dropped_partitions']} partitions, "
+            f"deleted {result['deleted_rows']} rows and created {result['created_partitions']} partitions "
+            f"in {time.perf_counter() - started:.1f}s; raw events now start on {retention.get_watermark()}."
+        ))
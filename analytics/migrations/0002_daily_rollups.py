@@ -0,0 +1,77 @@
+# Generated by Django 4.2.27 on 2026-10-17 08:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_course_counters'),
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupDirtyDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+            ],
+            options={
+                'verbose_name': 'Rollup Dirty Day',
+                'verbose_name_plural': 'Rollup Dirty Days',
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('folded_until', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Rollup Watermark',
+                'verbose_name_plural': 'Rollup Watermarks',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyGradeRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text='Local calendar day')),
+                ('letter', models.CharField(blank=True, default='', max_length=2)),
+                ('grades', models.PositiveIntegerField(default=0)),
+                ('scored_count', models.PositiveIntegerField(default=0, help_text='Grades with a non-null score')),
+                ('score_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('course', models.ForeignKey(help_text='Course the figures belong to', on_delete=django.db.models.deletion.CASCADE, related_name='daily_grade_rollups', to='courses.course')),
+            ],
+            options={
+                'verbose_name': 'Daily Grade Rollup',
+                'verbose_name_plural': 'Daily Grade Rollups',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyCourseRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text='Local calendar day')),
+                ('submissions', models.PositiveIntegerField(default=0)),
+                ('new_enrollments', models.PositiveIntegerField(default=0)),
+                ('course', models.ForeignKey(help_text='Course the figures belong to', on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='courses.course')),
+            ],
+            options={
+                'verbose_name': 'Daily Course Rollup',
+                'verbose_name_plural': 'Daily Course Rollups',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailygraderollup',
+            constraint=models.UniqueConstraint(fields=('course', 'day', 'letter'), name='unique_daily_grade_rollup'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailycourserollup',
+            constraint=models.UniqueConstraint(fields=('course', 'day'), name='unique_daily_course_rollup'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.27 on 2026-10-17 08:31
+
+from django.db import migrations, models
+
+from analytics import partitions
+
+
+def partition_log_table(apps, schema_editor):
+    if partitions.supports_partitions(schema_editor.connection):
+        partitions.partition_table(schema_editor.connection)
+
+
+def unpartition_log_table(apps, schema_editor):
+    if partitions.supports_partitions(schema_editor.connection):
+        partitions.unpartition_table(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_daily_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyLogCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('messages', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Daily Log Count',
+                'verbose_name_plural': 'Daily Log Counts',
+                'ordering': ['-day'],
+            },
+        ),
+        # Before the index, so it is created on the partitioned table and each partition
+        migrations.RunPython(partition_log_table, unpartition_log_table),
+        migrations.AddIndex(
+            model_name='analyticslog',
+            index=models.Index(fields=['created_at'], name='analytics_log_created_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.27 on 2026-10-17 11:30
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_log_partitions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='analyticslog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
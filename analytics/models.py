@@ -1,13 +1,124 @@
 from django.db import models
+from django.utils import timezone
 
 class AnalyticsLog(models.Model):
+    """
+    One analytics event. On PostgreSQL the table is range-partitioned by month of
+    created_at (analytics.partitions); days past the retention period are compacted
+    into DailyLogCount by the compact_analytics_logs command.
+    """
     message = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Not auto_now_add: the buffered writer (analytics.writer) stamps events when they happen
+    created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         verbose_name = "Analytics Log"
         verbose_name_plural = "Analytics Logs"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at"], name="analytics_log_created_idx")
+        ]
 
     def __str__(self):
         return f"Log: {self.message}"
+
+
+class DailyCourseRollup(models.Model):
+    """
+    Submissions and new enrollments (enrollments.Enrollment) of one course on one day.
+    Written by analytics.rollups; see the rollup_analytics command.
+    """
+    course = models.ForeignKey(
+        "courses.Course",
+        on_delete=models.CASCADE,
+        related_name="daily_rollups",
+        help_text="Course the figures belong to"
+    )
+    day = models.DateField(help_text="Local calendar day")
+    submissions = models.PositiveIntegerField(default=0)
+    new_enrollments = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Daily Course Rollup"
+        verbose_name_plural = "Daily Course Rollups"
+        constraints = [
+            models.UniqueConstraint(fields=["course", "day"], name="unique_daily_course_rollup")
+        ]
+
+    def __str__(self):
+        return f"Course #{self.course_id} on {self.day}"
+
+
+class DailyGradeRollup(models.Model):
+    """
+    Grades of one course given on one day with one letter ("" when the grade has none):
+    one row per letter makes the histogram and the score totals a single grouped read.
+    """
+    course = models.ForeignKey(
+        "courses.Course",
+        on_delete=models.CASCADE,
+        related_name="daily_grade_rollups",
+        help_text="Course the figures belong to"
+    )
+    day = models.DateField(help_text="Local calendar day")
+    letter = models.CharField(max_length=2, blank=True, default="")
+    grades = models.PositiveIntegerField(default=0)
+    scored_count = models.PositiveIntegerField(default=0, help_text="Grades with a non-null score")
+    score_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = "Daily Grade Rollup"
+        verbose_name_plural = "Daily Grade Rollups"
+        constraints = [
+            models.UniqueConstraint(fields=["course", "day", "letter"], name="unique_daily_grade_rollup")
+        ]
+
+    def __str__(self):
+        return f"Course #{self.course_id} on {self.day}: {self.letter or '-'}"
+
+
+class RollupWatermark(models.Model):
+    """
+    How far the daily rollups have been folded: they cover every day before folded_until,
+    and rows from that day on are aggregated live.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    folded_until = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Rollup Watermark"
+        verbose_name_plural = "Rollup Watermarks"
+
+    def __str__(self):
+        return f"{self.name}: folded until {self.folded_until}"
+
+
+class RollupDirtyDay(models.Model):
+    """
+    A folded day whose source rows changed (grade updated, row deleted) and must be re-folded.
+    """
+    day = models.DateField(unique=True)
+
+    class Meta:
+        verbose_name = "Rollup Dirty Day"
+        verbose_name_plural = "Rollup Dirty Days"
+
+    def __str__(self):
+        return str(self.day)
+
+
+class DailyLogCount(models.Model):
+    """
+    Number of AnalyticsLog events of one local day, kept once the raw rows are compacted.
+    """
+    day = models.DateField(unique=True)
+    messages = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Daily Log Count"
+        verbose_name_plural = "Daily Log Counts"
+        ordering = ["-day"]
+
+    def __str__(self):
+        return f"{self.day}: {self.messages} events"
@@ -0,0 +1,180 @@
+"""
+Monthly partitions of the AnalyticsLog table on PostgreSQL.
+
+The table is range-partitioned on created_at, one partition per local calendar
+month (analytics_analyticslog_pYYYYMM) plus a default partition for rows outside
+them. The primary key becomes (id, created_at), as PostgreSQL requires the
+partition key in every unique constraint; id stays unique through its identity
+sequence, so the ORM keeps treating it as the primary key.
+
+Dropping a partition whose month is past the retention period is instant and
+takes no row locks, which is what compact_analytics_logs relies on. Other
+backends keep the single table: there, the created_at index bounds each month
+and expired rows are removed with batched deletes (see analytics.retention).
+"""
+import datetime
+import re
+
+from django.db import transaction
+from django.utils import timezone
+
+TABLE = "analytics_analyticslog"
+DEFAULT_PARTITION = f"{TABLE}_default"
+PARTITION_NAME = re.compile(rf"^{TABLE}_p(\d{{4}})(\d{{2}})$")
+
+
+def supports_partitions(connection):
+    return connection.vendor == "postgresql"
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def month_bound(month):
+    """
+    Aware local midnight starting month, as a SQL timestamptz literal.
+    """
+    moment = timezone.make_aware(datetime.datetime.combine(month, datetime.time.min))
+    return f"'{moment.isoformat()}'::timestamptz"
+
+
+def partition_name(month):
+    return f"{TABLE}_p{month:%Y%m}"
+
+
+def is_partitioned(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s AND c.relnamespace = to_regnamespace(current_schema())",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def partitions(connection):
+    """
+    {month: partition name} of the monthly partitions that exist.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class parent ON parent.oid = i.inhparent WHERE parent.relname = %s",
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    found = {}
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        if match:
+            found[datetime.date(int(match[1]), int(match[2]), 1)] = name
+    return found
+
+
+def ensure_partitions(connection, first_month, last_month):
+    """
+    Create the missing monthly partitions from first_month to last_month included.
+    Rows of a month that landed in the default partition (the partition was not
+    created in time) are moved into the new partition before it is attached.
+    """
+    existing = partitions(connection)
+    created = []
+    month = month_start(first_month)
+    while month <= last_month:
+        if month not in existing:
+            create_partition(connection, month)
+            created.append(month)
+        month = add_months(month, 1)
+    return created
+
+
+def create_partition(connection, month):
+    name = partition_name(month)
+    bounds = f"FROM ({month_bound(month)}) TO ({month_bound(add_months(month, 1))})"
+    in_month = f"created_at >= {month_bound(month)} AND created_at < {month_bound(add_months(month, 1))}"
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f'SELECT EXISTS (SELECT 1 FROM "{DEFAULT_PARTITION}" WHERE {in_month})')
+        if not cursor.fetchone()[0]:
+            cursor.execute(f'CREATE TABLE "{name}" PARTITION OF "{TABLE}" FOR VALUES {bounds}')
+            return
+        # Attaching checks that the default partition holds no row of the month
+        cursor.execute(f'CREATE TABLE "{name}" (LIKE "{TABLE}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" WHERE {in_month} RETURNING id, message, created_at) '
+            f'INSERT INTO "{name}" (id, message, created_at) SELECT id, message, created_at FROM moved'
+        )
+        cursor.execute(f'ALTER TABLE "{TABLE}" ATTACH PARTITION "{name}" FOR VALUES {bounds}')
+
+
+def drop_partitions_before(connection, day):
+    """
+    Detach and drop the monthly partitions that end on or before the start of day.
+    """
+    dropped = []
+    with connection.cursor() as cursor:
+        for start, name in sorted(partitions(connection).items()):
+            if add_months(start, 1) <= day:
+                cursor.execute(f'ALTER TABLE "{TABLE}" DETACH PARTITION "{name}"')
+                cursor.execute(f'DROP TABLE "{name}"')
+                dropped.append(start)
+    return dropped
+
+
+def partition_table(connection, months_ahead=2):
+    """
+    Rebuild the plain AnalyticsLog table as a partitioned one, keeping its rows and ids.
+    """
+    if is_partitioned(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{TABLE}_unpartitioned"')
+        cursor.execute(f'ALTER TABLE "{TABLE}_unpartitioned" RENAME CONSTRAINT "{TABLE}_pkey" TO "{TABLE}_unpartitioned_pkey"')
+        cursor.execute(
+            f'CREATE TABLE "{TABLE}" (id bigint GENERATED BY DEFAULT AS IDENTITY, message text NOT NULL, '
+            f"created_at timestamp with time zone NOT NULL, PRIMARY KEY (id, created_at)) "
+            f"PARTITION BY RANGE (created_at)"
+        )
+        cursor.execute(f'CREATE TABLE "{DEFAULT_PARTITION}" PARTITION OF "{TABLE}" DEFAULT')
+        cursor.execute(f'SELECT MIN(created_at) FROM "{TABLE}_unpartitioned"')
+        oldest = cursor.fetchone()[0]
+    today = timezone.localdate()
+    first = month_start(timezone.localdate(oldest) if oldest else today)
+    ensure_partitions(connection, first, add_months(month_start(today), months_ahead))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO "{TABLE}" (id, message, created_at) '
+            f'SELECT id, message, created_at FROM "{TABLE}_unpartitioned"'
+        )
+        cursor.execute(f'DROP TABLE "{TABLE}_unpartitioned"')
+        _reset_sequence(cursor)
+
+
+def unpartition_table(connection):
+    """
+    Inverse of partition_table(): back to one plain table.
+    """
+    if not is_partitioned(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE "{TABLE}_plain" (id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY, '
+            f"message text NOT NULL, created_at timestamp with time zone NOT NULL)"
+        )
+        cursor.execute(f'INSERT INTO "{TABLE}_plain" (id, message, created_at) SELECT id, message, created_at FROM "{TABLE}"')
+        cursor.execute(f'DROP TABLE "{TABLE}"')
+        cursor.execute(f'ALTER TABLE "{TABLE}_plain" RENAME TO "{TABLE}"')
+        cursor.execute(f'ALTER TABLE "{TABLE}" RENAME CONSTRAINT "{TABLE}_plain_pkey" TO "{TABLE}_pkey"')
+        _reset_sequence(cursor)
+
+
+def _reset_sequence(cursor):
+    cursor.execute(
+        f"SELECT setval(pg_get_serial_sequence('\"{TABLE}\"', 'id'), COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) "
+        f'FROM "{TABLE}"'
+    )
@@ -0,0 +1,100 @@
+"""
+Retention of AnalyticsLog events.
+
+Days older than the retention period are compacted into DailyLogCount (one row
+per local day) and their raw rows are then removed. The "log_compaction"
+RollupWatermark records the first day that is not compacted: counts and the
+watermark are written in one transaction, and every row before the watermark is
+already counted, so the deletes that follow can stop and resume at any point
+without losing or double counting events.
+
+On a partitioned PostgreSQL table, whole months before the watermark are dropped
+as partitions; the remaining rows (the part of a month before the watermark, the
+default partition, other backends) go in batches of batch_size rows, one short
+transaction each, so the table is never locked for long.
+"""
+import datetime
+import time
+
+from django.db import connection, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from . import partitions
+from .models import AnalyticsLog, DailyLogCount, RollupWatermark
+from .rollups import day_start
+
+WATERMARK = "log_compaction"
+
+
+def get_watermark():
+    return RollupWatermark.objects.filter(name=WATERMARK).values_list("folded_until", flat=True).first()
+
+
+def compact_days(until):
+    """
+    Count the events of every day before until that is not compacted yet and move
+    the watermark to until. Returns the number of days counted.
+    """
+    watermark = get_watermark()
+    if watermark is not None and watermark >= until:
+        return 0
+    events = AnalyticsLog.objects.filter(created_at__lt=day_start(until))
+    if watermark is not None:
+        events = events.filter(created_at__gte=day_start(watermark))
+    rows = events.annotate(day=TruncDate("created_at")).order_by().values("day").annotate(count=Count("pk"))
+    counts = [DailyLogCount(day=row["day"], messages=row["count"]) for row in rows]
+    with transaction.atomic():
+        DailyLogCount.objects.bulk_create(
+            counts, update_conflicts=True, unique_fields=["day"], update_fields=["messages"]
+        )
+        RollupWatermark.objects.update_or_create(name=WATERMARK, defaults={"folded_until": until})
+    return len(counts)
+
+
+def delete_before(moment, batch_size=5000, pause=0.0):
+    """
+    Delete the events created before moment, batch_size rows per statement,
+    sleeping pause seconds between batches. Returns the number deleted.
+    """
+    deleted = 0
+    events = AnalyticsLog.objects.filter(created_at__lt=moment).order_by()
+    while True:
+        ids = list(events.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        # No signals or relations on AnalyticsLog: one DELETE per batch. created_at
+        # lets PostgreSQL prune the partitions it does not need.
+        deleted += events.filter(pk__in=ids).delete()[0]
+        if pause:
+            time.sleep(pause)
+
+
+def compact(retention_days=90, batch_size=5000, pause=0.0, months_ahead=2, today=None):
+    """
+    Compact and remove the events older than retention_days, and create the
+    upcoming monthly partitions. Returns {"compacted_days", "dropped_partitions",
+    "deleted_rows", "created_partitions"}.
+    """
+    today = today or timezone.localdate()
+    compacted = compact_days(today - datetime.timedelta(days=retention_days))
+    watermark = get_watermark()
+
+    partitioned = partitions.supports_partitions(connection) and partitions.is_partitioned(connection)
+    dropped, created = [], []
+    if partitioned and watermark is not None:
+        dropped = partitions.drop_partitions_before(connection, watermark)
+    deleted = delete_before(day_start(watermark), batch_size, pause) if watermark is not None else 0
+    # Last, so a failure creating partitions never holds back the deletes
+    if partitioned:
+        this_month = partitions.month_start(today)
+        created = partitions.ensure_partitions(
+            connection, this_month, partitions.add_months(this_month, months_ahead)
+        )
+    return {
+        "compacted_days": compacted,
+        "dropped_partitions": len(dropped),
+        "deleted_rows": deleted,
+        "created_partitions": len(created),
+    }
@@ -0,0 +1,159 @@
+"""
+Daily per-course analytics rollups.
+
+DailyCourseRollup and DailyGradeRollup hold, for every local calendar day before
+the watermark (RollupWatermark.folded_until), the submissions, new enrollments
+and grades of each course. Rows from the watermark day on are aggregated live,
+so "rollups + today's delta" always adds up to the source tables.
+
+A folded row that changes or disappears (grade updated, submission deleted...)
+marks its day dirty in RollupDirtyDay through analytics.signals, or through
+mark_dirty() on bulk write paths. Readers skip the rollups of dirty days and
+aggregate those days live until they are re-folded.
+
+fold() advances the watermark to today, folding only the days it passes, and
+re-folds the dirty days. backfill=True rebuilds every day from the oldest
+source row.
+"""
+import datetime
+
+from django.db import transaction
+from django.db.models import Count, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from assignments.models import Submission
+from core.cache import invalidate_tags, table_tag
+from enrollments.models import Enrollment as CourseEnrollment
+from grades.models import Grade
+from .models import DailyCourseRollup, DailyGradeRollup, RollupDirtyDay, RollupWatermark
+
+WATERMARK = "daily"
+
+
+def get_watermark():
+    """
+    First day that is not folded yet, or None when the rollups were never built.
+    """
+    return RollupWatermark.objects.filter(name=WATERMARK).values_list("folded_until", flat=True).first()
+
+
+def day_start(day):
+    """
+    Aware datetime of local midnight at the start of day.
+    """
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def mark_dirty(moments):
+    """
+    Queue the local days of the given datetimes for re-folding. Days from today on
+    are skipped: they are aggregated live and folded once they are over.
+    """
+    today = timezone.localdate()
+    days = {timezone.localdate(moment) for moment in moments if moment is not None}
+    days = {day for day in days if day < today}
+    if days:
+        RollupDirtyDay.objects.bulk_create([RollupDirtyDay(day=day) for day in days], ignore_conflicts=True)
+
+
+def fold_window(start, end):
+    """
+    Recompute the rollups of the days in [start, end) from the source tables:
+    three grouped queries, then the window's rows are replaced. Runs in one
+    transaction that first consumes the window's dirty marks, so readers see
+    either the stale rollups still marked dirty or the new ones, and a change
+    committed after the marks are consumed queues its day again.
+    """
+    with transaction.atomic():
+        RollupDirtyDay.objects.filter(day__gte=start, day__lt=end).delete()
+        courses, grades = aggregate_window(start, end)
+        DailyCourseRollup.objects.filter(day__gte=start, day__lt=end).delete()
+        DailyGradeRollup.objects.filter(day__gte=start, day__lt=end).delete()
+        DailyCourseRollup.objects.bulk_create(courses.values())
+        DailyGradeRollup.objects.bulk_create(grades.values())
+    return len(courses) + len(grades)
+
+
+def aggregate_window(start, end):
+    """
+    Unsaved DailyCourseRollup and DailyGradeRollup rows of the days in [start, end), keyed by group.
+    """
+    lower, upper = day_start(start), day_start(end)
+    courses = {}
+    for row in (
+        Submission.objects.filter(submitted_at__gte=lower, submitted_at__lt=upper)
+        .annotate(day=TruncDate("submitted_at")).order_by()
+        .values("assignment__course_id", "day").annotate(count=Count("pk"))
+    ):
+        key = (row["assignment__course_id"], row["day"])
+        courses.setdefault(key, DailyCourseRollup(course_id=key[0], day=key[1])).submissions = row["count"]
+    for row in (
+        CourseEnrollment.objects.filter(enrolled_at__gte=lower, enrolled_at__lt=upper)
+        .annotate(day=TruncDate("enrolled_at")).order_by()
+        .values("course_id", "day").annotate(count=Count("pk"))
+    ):
+        key = (row["course_id"], row["day"])
+        courses.setdefault(key, DailyCourseRollup(course_id=key[0], day=key[1])).new_enrollments = row["count"]
+
+    grades = {}
+    for row in (
+        Grade.objects.filter(graded_at__gte=lower, graded_at__lt=upper)
+        .annotate(day=TruncDate("graded_at")).order_by()
+        .values("submission__assignment__course_id", "day", "letter")
+        .annotate(count=Count("pk"), scored=Count("score"), total=Sum("score"))
+    ):
+        key = (row["submission__assignment__course_id"], row["day"], row["letter"] or "")
+        # None and "" letters share a row
+        rollup = grades.setdefault(key, DailyGradeRollup(course_id=key[0], day=key[1], letter=key[2], score_sum=0))
+        rollup.grades += row["count"]
+        rollup.scored_count += row["scored"]
+        rollup.score_sum += row["total"] or 0
+    return courses, grades
+
+
+def oldest_day():
+    """
+    Local day of the oldest submission, grade or enrollment, or None without data.
+    """
+    moments = [
+        Submission.objects.aggregate(first=Min("submitted_at"))["first"],
+        Grade.objects.aggregate(first=Min("graded_at"))["first"],
+        CourseEnrollment.objects.aggregate(first=Min("enrolled_at"))["first"],
+    ]
+    moments = [moment for moment in moments if moment is not None]
+    return timezone.localdate(min(moments)) if moments else None
+
+
+def fold(today=None, backfill=False, window_days=31):
+    """
+    Fold every closed day since the watermark plus the dirty days, then move the
+    watermark to today. Returns {"folded_days", "refolded_days", "rows"}.
+    """
+    today = today or timezone.localdate()
+    watermark = get_watermark()
+    # fold_window() consumes the marks of the days it rebuilds
+    dirty = set(RollupDirtyDay.objects.filter(day__lt=today).values_list("day", flat=True))
+
+    if backfill or watermark is None:
+        start = oldest_day() or today
+        DailyCourseRollup.objects.filter(day__lt=start).delete()
+        DailyGradeRollup.objects.filter(day__lt=start).delete()
+    else:
+        start = min(watermark, today)
+
+    rows = 0
+    window = datetime.timedelta(days=window_days)
+    cursor = start
+    while cursor < today:
+        upper = min(cursor + window, today)
+        rows += fold_window(cursor, upper)
+        cursor = upper
+
+    refolded = sorted(day for day in dirty if day < start)
+    for day in refolded:
+        rows += fold_window(day, day + datetime.timedelta(days=1))
+
+    RollupWatermark.objects.update_or_create(name=WATERMARK, defaults={"folded_until": today})
+    invalidate_tags(table_tag(DailyCourseRollup), table_tag(DailyGradeRollup))
+    return {"folded_days": (today - start).days, "refolded_days": len(refolded), "rows": rows}
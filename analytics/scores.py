@@ -0,0 +1,133 @@
+"""
+Score distribution statistics: count, mean, standard deviation, quartiles and
+fixed-bin histograms per group of scores (per assignment, or one course-wide group).
+
+Scores are read with a single values_list query and described in one pass per
+metric over all groups at once: the groups are segments of one sorted NumPy
+array (reduceat sums, index arithmetic for the percentiles, add.at for the
+histograms), so the number of array operations does not depend on the number
+of groups.
+Percentiles use linear interpolation between closest ranks, like numpy.percentile,
+and the standard deviation is the population one.
+"""
+from functools import partial
+
+import numpy
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+
+from assignments.models import Assignment
+from core.parallel import gather
+from grades.models import Grade
+
+PERCENTILES = (25, 50, 75)
+DEFAULT_BINS = 10
+MAX_BINS = 100
+SCORE_RANGE = (0.0, 100.0)
+
+
+def bin_edges(bins=DEFAULT_BINS, low=SCORE_RANGE[0], high=SCORE_RANGE[1]):
+    step = (high - low) / bins
+    return [round(low + step * i, 6) for i in range(bins + 1)]
+
+
+def empty_statistics(bins):
+    return {
+        "count": 0, "mean": None, "std": None, "min": None, "p25": None,
+        "median": None, "p75": None, "max": None, "histogram": [0] * bins,
+    }
+
+
+def describe(groups, values, bins=DEFAULT_BINS):
+    """
+    Describe values grouped by the parallel groups sequence: {group: statistics}.
+    Scores outside SCORE_RANGE are counted in the first or last histogram bin.
+    """
+    if not len(values):
+        return {}
+    edges = bin_edges(bins)
+    groups = numpy.asarray(groups)
+    values = numpy.asarray(values, dtype=float)
+    order = numpy.lexsort((values, groups))  # by group, then by value
+    groups, values = groups[order], values[order]
+
+    starts = numpy.flatnonzero(numpy.r_[True, groups[1:] != groups[:-1]])
+    ends = numpy.r_[starts[1:], len(values)]
+    counts = ends - starts
+    means = numpy.add.reduceat(values, starts) / counts
+    deviations = values - numpy.repeat(means, counts)
+    stds = numpy.sqrt(numpy.add.reduceat(deviations * deviations, starts) / counts)
+
+    quantiles = {}
+    for q in PERCENTILES:
+        position = starts + (counts - 1) * (q / 100)
+        lower = numpy.floor(position).astype(int)
+        upper = numpy.ceil(position).astype(int)
+        quantiles[q] = values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+    bins = len(edges) - 1
+    segment = numpy.repeat(numpy.arange(len(starts)), counts)
+    column = (numpy.searchsorted(numpy.asarray(edges), values, side="right") - 1).clip(0, bins - 1)
+    histograms = numpy.zeros((len(starts), bins), dtype=int)
+    numpy.add.at(histograms, (segment, column), 1)
+
+    return {
+        groups[start].item(): {
+            "count": int(counts[i]),
+            "mean": float(means[i]),
+            "std": float(stds[i]),
+            "min": float(values[start]),
+            "p25": float(quantiles[25][i]),
+            "median": float(quantiles[50][i]),
+            "p75": float(quantiles[75][i]),
+            "max": float(values[ends[i] - 1]),
+            "histogram": histograms[i].tolist(),
+        }
+        for i, start in enumerate(starts)
+    }
+
+
+def score_rows(course):
+    """
+    (assignment id, score) of every scored grade of the course.
+    """
+    return list(
+        Grade.objects.filter(submission__assignment__course=course, score__isnull=False)
+        .order_by()
+        .annotate(value=Cast("score", FloatField()))
+        .values_list("submission__assignment_id", "value")
+    )
+
+
+def assignment_rows(course):
+    return list(Assignment.objects.filter(course=course).order_by("due_date", "pk").values_list("pk", "title"))
+
+
+def combine_course_statistics(course, bins, rows, assignments):
+    assignment_ids, scores = zip(*rows) if rows else ((), ())
+    by_assignment = describe(assignment_ids, scores, bins)
+    overall = describe([0] * len(scores), scores, bins).get(0) or empty_statistics(bins)
+    return {
+        "course": {"id": course.pk, "title": course.title},
+        "bins": bin_edges(bins),
+        "overall": overall,
+        "assignments": [
+            {"id": pk, "title": title, **(by_assignment.get(pk) or empty_statistics(bins))}
+            for pk, title in assignments
+        ],
+    }
+
+
+def course_statistics(course, bins=DEFAULT_BINS):
+    """
+    Course-wide and per-assignment score statistics, in two queries.
+    """
+    return combine_course_statistics(course, bins, score_rows(course), assignment_rows(course))
+
+
+async def course_statistics_async(course, bins=DEFAULT_BINS):
+    """
+    course_statistics() with its two queries issued concurrently (core.parallel).
+    """
+    rows, assignments = await gather(partial(score_rows, course), partial(assignment_rows, course))
+    return combine_course_statistics(course, bins, rows, assignments)
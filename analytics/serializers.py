@@ -79,3 +79,46 @@ class AdminAnalyticsSerializer(serializers.Serializer):
 
     class Meta:
         ref_name = "AnalyticsAdmin"
+
+
+class ScoreStatisticsSerializer(serializers.Serializer):
+    count = serializers.IntegerField(min_value=0, default=0, help_text="Number of scored grades")
+    mean = serializers.FloatField(allow_null=True, help_text="Mean score")
+    std = serializers.FloatField(allow_null=True, help_text="Population standard deviation of the scores")
+    min = serializers.FloatField(allow_null=True, help_text="Lowest score")
+    p25 = serializers.FloatField(allow_null=True, help_text="First quartile")
+    median = serializers.FloatField(allow_null=True, help_text="Median score")
+    p75 = serializers.FloatField(allow_null=True, help_text="Third quartile")
+    max = serializers.FloatField(allow_null=True, help_text="Highest score")
+    histogram = serializers.ListField(
+        child=serializers.IntegerField(min_value=0), default=list, help_text="Scores per bin, see bins"
+    )
+
+    class Meta:
+        ref_name = "AnalyticsScoreStatistics"
+
+
+class AssignmentScoreStatisticsSerializer(ScoreStatisticsSerializer):
+    id = serializers.IntegerField(help_text="Assignment ID")
+    title = serializers.CharField(help_text="Assignment title")
+
+    class Meta:
+        ref_name = "AnalyticsAssignmentScoreStatistics"
+
+
+class CourseAnalyticsCourseSerializer(serializers.Serializer):
+    id = serializers.IntegerField(help_text="Course ID")
+    title = serializers.CharField(help_text="Course title")
+
+    class Meta:
+        ref_name = "AnalyticsCourseRef"
+
+
+class CourseAnalyticsSerializer(serializers.Serializer):
+    course = CourseAnalyticsCourseSerializer(help_text="Course the statistics describe")
+    bins = serializers.ListField(child=serializers.FloatField(), help_text="Histogram bin edges")
+    overall = ScoreStatisticsSerializer(help_text="Statistics over every scored grade of the course")
+    assignments = AssignmentScoreStatisticsSerializer(many=True, help_text="Statistics per assignment")
+
+    class Meta:
+        ref_name = "AnalyticsCourse"
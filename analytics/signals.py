@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from assignments.models import Submission
+from enrollments.models import Enrollment as CourseEnrollment
+from grades.models import Grade
+from .rollups import mark_dirty
+
+
+@receiver(post_save, sender=Grade)
+def grade_saved(sender, instance, created, raw=False, **kwargs):
+    # New grades land on today, which is aggregated live; updates may change a folded day
+    if not created and not raw:
+        mark_dirty([instance.graded_at])
+
+
+@receiver(post_delete, sender=Grade)
+def grade_deleted(sender, instance, **kwargs):
+    mark_dirty([instance.graded_at])
+
+
+@receiver(post_delete, sender=Submission)
+def submission_deleted(sender, instance, **kwargs):
+    mark_dirty([instance.submitted_at])
+
+
+@receiver(post_delete, sender=CourseEnrollment)
+def enrollment_deleted(sender, instance, **kwargs):
+    mark_dirty([instance.enrolled_at])
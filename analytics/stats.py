@@ -0,0 +1,260 @@
+"""
+Shared statistics for the analytics and dashboard endpoints.
+
+Every function here runs a fixed number of queries regardless of how many
+courses, assignments or grades are involved: per-course breakdowns are
+computed with correlated subqueries and role counters with conditional
+aggregation, instead of one query per course. Enrollment, assignment,
+submission and grade counts are read from the denormalized counters on
+Course and Assignment (core.counters) instead of being counted per request.
+"""
+from functools import partial
+
+from django.db.models import Avg, Case, Count, F, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models import DecimalField, FloatField
+from django.db.models.functions import Cast, Coalesce
+
+from accounts.models import CustomUser
+from assignments.models import Assignment, Submission
+from core.parallel import gather
+from courses.models import Course
+from grades.models import Grade
+from . import rollups
+from .models import DailyCourseRollup, DailyGradeRollup, RollupDirtyDay
+
+
+def subquery_aggregate(queryset, group_field, aggregate, output_field, default=0):
+    """
+    Wrap an aggregate over queryset, grouped by the outer-referenced group_field,
+    as a correlated subquery that falls back to default when no rows match.
+    """
+    return Coalesce(
+        Subquery(
+            queryset.order_by()
+            .values(group_field)
+            .annotate(value=aggregate)
+            .values("value")[:1],
+            output_field=output_field,
+        ),
+        Value(default),
+        output_field=output_field,
+    )
+
+
+def _round(value):
+    return round(float(value or 0.0), 2)
+
+
+def student_stats(user):
+    """
+    GPA, completion rate, grades count and assignments count for one student, in one query.
+    """
+    student = OuterRef("pk")
+    row = (
+        CustomUser.objects.filter(pk=user.pk)
+        .annotate(
+            gpa=subquery_aggregate(
+                Grade.objects.filter(submission__student=student),
+                "submission__student", Avg("score"), FloatField(),
+            ),
+            grades_count=subquery_aggregate(
+                Grade.objects.filter(submission__student=student),
+                "submission__student", Count("pk"), IntegerField(),
+            ),
+            assignments_count=subquery_aggregate(
+                Course.objects.filter(enrollments__student=student),
+                "enrollments__student", Sum("assignment_count"), IntegerField(),
+            ),
+            completed_assignments=subquery_aggregate(
+                Submission.objects.filter(student=student),
+                "student", Count("assignment", distinct=True), IntegerField(),
+            ),
+        )
+        .values("gpa", "grades_count", "assignments_count", "completed_assignments")
+        .first()
+    ) or {"gpa": 0.0, "grades_count": 0, "assignments_count": 0, "completed_assignments": 0}
+
+    total = row["assignments_count"]
+    completion_rate = (row["completed_assignments"] / total * 100.0) if total else 0.0
+    return {
+        "gpa": _round(row["gpa"]),
+        "completion_rate": round(completion_rate, 2),
+        "grades_count": row["grades_count"],
+        "assignments_count": total,
+    }
+
+
+def course_breakdown(courses):
+    """
+    Annotate a Course queryset with assignment, submission and grade counts
+    and the average score, as one query. Totals are summed from the assignment
+    counters, so no submission or grade row is read.
+    """
+    assignments = Assignment.objects.filter(course=OuterRef("pk"))
+    return courses.annotate(
+        assignments_count=F("assignment_count"),
+        submissions_count=subquery_aggregate(assignments, "course", Sum("submission_count"), IntegerField()),
+        grades_count=subquery_aggregate(assignments, "course", Sum("graded_count"), IntegerField()),
+        score_sum=subquery_aggregate(
+            assignments, "course", Sum("score_sum"), DecimalField(max_digits=14, decimal_places=2)
+        ),
+        scored_count=subquery_aggregate(assignments, "course", Sum("scored_count"), IntegerField()),
+        average_score=Case(
+            When(scored_count=0, then=Value(None)),
+            default=Cast(F("score_sum"), FloatField()) / F("scored_count"),
+            output_field=FloatField(),
+        ),
+    ).values("id", "title", "assignments_count", "submissions_count", "grades_count", "average_score")
+
+
+def instructor_stats(user):
+    """
+    Teaching totals plus a per-course breakdown for one instructor, in one query.
+    Totals are summed from the breakdown since every assignment belongs to a course.
+    """
+    breakdown = [
+        {**row, "average_score": _round(row["average_score"])}
+        for row in course_breakdown(Course.objects.filter(instructor=user).order_by("title"))
+    ]
+    return {
+        "courses_taught": len(breakdown),
+        "assignments_created": sum(row["assignments_count"] for row in breakdown),
+        "submissions_received": sum(row["submissions_count"] for row in breakdown),
+        "grades_given": sum(row["grades_count"] for row in breakdown),
+        "course_breakdown": breakdown,
+    }
+
+
+def counted_live(field, since):
+    """
+    Rows that are not in the daily rollups: from since on, plus those of the folded
+    days queued in RollupDirtyDay, whose rollups are stale until they are re-folded.
+    """
+    return Q(**{f"{field}__gte": since}) | Q(**{f"{field}__date__in": RollupDirtyDay.objects.values("day")})
+
+
+def folded(rollups):
+    return rollups.exclude(day__in=RollupDirtyDay.objects.values("day"))
+
+
+def enrollment_counts(enrollment_relation="enrollments", since=None):
+    """
+    Distinct enrolled students per course title, in one query.
+    enrollment_relation names the reverse relation from Course to the enrollment
+    model to count ("enrollments" for courses.Enrollment,
+    "course_enrollments" for enrollments.Enrollment). courses.Enrollment is
+    read from Course.enrollment_count; enrollments.Enrollment from the daily
+    rollups before the since datetime plus a live count from then on and on
+    dirty days (everything is counted live when since is None).
+    """
+    if enrollment_relation == "enrollments":
+        return dict(Course.objects.values_list("title", "enrollment_count"))
+    enrollment_model = Course._meta.get_field(enrollment_relation).related_model
+    live = enrollment_model.objects.filter(course=OuterRef("pk"))
+    if since is None:
+        students = subquery_aggregate(live, "course", Count("student", distinct=True), IntegerField())
+    else:
+        students = subquery_aggregate(
+            folded(DailyCourseRollup.objects.filter(course=OuterRef("pk"))), "course", Sum("new_enrollments"),
+            IntegerField(),
+        ) + subquery_aggregate(live.filter(counted_live("enrolled_at", since)), "course", Count("pk"), IntegerField())
+    rows = Course.objects.annotate(students_count=students).values_list("title", "students_count")
+    return dict(rows)
+
+
+def grade_totals(since=None):
+    """
+    Per-letter grade count, score sum and scored count: from the daily rollups
+    before the since datetime plus one grouped pass over the grades given from
+    then on and on dirty days (over every grade when since is None).
+    """
+    live = Grade.objects.all() if since is None else Grade.objects.filter(counted_live("graded_at", since))
+    passes = [
+        live.order_by().values("letter").annotate(
+            count=Count("pk"),
+            score_sum=Coalesce(Sum("score"), Value(0), output_field=DecimalField()),
+            scored=Count("score"),
+        )
+    ]
+    if since is not None:
+        passes.append(
+            folded(DailyGradeRollup.objects.all()).order_by().values("letter").annotate(
+                count=Sum("grades"), score_sum=Sum("score_sum"), scored=Sum("scored_count"),
+            )
+        )
+    totals = {}
+    for rows in passes:
+        for row in rows:
+            letter = totals.setdefault(row["letter"] or "", {"count": 0, "score_sum": 0, "scored": 0})
+            for key in letter:
+                letter[key] += row[key] or 0
+    return totals
+
+
+def user_totals():
+    return CustomUser.objects.aggregate(
+        total_students=Count("pk", filter=Q(role="student")),
+        total_instructors=Count("pk", filter=Q(role="instructor")),
+    )
+
+
+def submission_total():
+    return Assignment.objects.aggregate(total=Coalesce(Sum("submission_count"), 0))["total"]
+
+
+def rollup_since():
+    """
+    Start of the day the daily rollups cover up to, or None before the first rollup.
+    """
+    watermark = rollups.get_watermark()
+    return rollups.day_start(watermark) if watermark else None
+
+
+def combine_admin_stats(users, submissions, grades, course_enrollment_stats):
+    total_grades = 0
+    score_sum = 0
+    scored = 0
+    grade_distribution = {}
+    for letter, row in grades.items():
+        total_grades += row["count"]
+        score_sum += row["score_sum"]
+        scored += row["scored"]
+        if letter and row["count"]:
+            grade_distribution[letter] = row["count"]
+
+    return {
+        "total_courses": len(course_enrollment_stats),
+        "total_students": users["total_students"],
+        "total_instructors": users["total_instructors"],
+        "total_submissions": submissions,
+        "total_grades": total_grades,
+        "global_gpa": _round(score_sum / scored) if scored else 0.0,
+        "grade_distribution": grade_distribution,
+        "course_enrollment_stats": course_enrollment_stats,
+    }
+
+
+def admin_stats(enrollment_relation="enrollments"):
+    """
+    Global counters, GPA, letter distribution and per-course enrollment, in five
+    queries, or seven once the daily rollups exist: grades and enrollments.Enrollment
+    are then read from the rollups plus the rows since the rollup watermark.
+    """
+    users = user_totals()
+    since = rollup_since()
+    return combine_admin_stats(
+        users, submission_total(), grade_totals(since), enrollment_counts(enrollment_relation, since),
+    )
+
+
+async def admin_stats_async(enrollment_relation="enrollments"):
+    """
+    admin_stats() with its independent queries issued concurrently (core.parallel):
+    two round trips of latency, as the grade and enrollment totals need the
+    rollup watermark.
+    """
+    since, users, submissions = await gather(rollup_since, user_totals, submission_total)
+    grades, course_enrollment_stats = await gather(
+        partial(grade_totals, since), partial(enrollment_counts, enrollment_relation, since),
+    )
+    return combine_admin_stats(users, submissions, grades, course_enrollment_stats)
@@ -0,0 +1,96 @@
+import datetime
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from analytics import partitions, retention
+from analytics.models import AnalyticsLog, DailyLogCount
+from analytics.rollups import day_start
+
+
+class RetentionTests(TestCase):
+    """
+    Tests for analytics.retention: old days become DailyLogCount rows, raw rows
+    go in batches, and reruns neither lose nor double count events.
+    """
+
+    def setUp(self):
+        self.today = timezone.localdate()
+
+    def add_events(self, days_ago, count):
+        moment = day_start(self.today - datetime.timedelta(days=days_ago)) + datetime.timedelta(hours=12)
+        logs = AnalyticsLog.objects.bulk_create([AnalyticsLog(message="event") for _ in range(count)])
+        AnalyticsLog.objects.filter(pk__in=[log.pk for log in logs]).update(created_at=moment)
+
+    def counts(self):
+        return {(self.today - row.day).days: row.messages for row in DailyLogCount.objects.all()}
+
+    def test_compact(self):
+        self.add_events(100, 3)
+        self.add_events(95, 2)
+        self.add_events(10, 4)
+        result = retention.compact(retention_days=90, batch_size=2, today=self.today)
+        self.assertEqual(result["compacted_days"], 2)
+        self.assertEqual(result["deleted_rows"], 5)
+        self.assertEqual(self.counts(), {100: 3, 95: 2})
+        self.assertEqual(AnalyticsLog.objects.count(), 4)
+        self.assertEqual(retention.get_watermark(), self.today - datetime.timedelta(days=90))
+
+    def test_batched_deletes(self):
+        self.add_events(100, 5)
+        with CaptureQueriesContext(connection) as ctx:
+            retention.compact(retention_days=90, batch_size=2, today=self.today)
+        deletes = [q for q in ctx.captured_queries if q["sql"].startswith("DELETE")]
+        self.assertEqual(len(deletes), 3)
+
+    def test_rerun_does_not_double_count(self):
+        self.add_events(100, 3)
+        retention.compact(retention_days=90, today=self.today)
+        # Rows left behind by an interrupted delete are removed without being counted again
+        self.add_events(100, 1)
+        self.add_events(88, 2)
+        result = retention.compact(retention_days=90, today=self.today)
+        self.assertEqual(result["compacted_days"], 0)
+        self.assertEqual(result["deleted_rows"], 1)
+        self.assertEqual(self.counts(), {100: 3})
+        # The next day's run compacts the day that crossed the retention period
+        retention.compact(retention_days=90, today=self.today + datetime.timedelta(days=3))
+        self.assertEqual(self.counts(), {100: 3, 88: 2})
+        self.assertFalse(AnalyticsLog.objects.exists())
+
+    def test_command(self):
+        self.add_events(40, 2)
+        out = StringIO()
+        call_command("compact_analytics_logs", "--days", "30", stdout=out)
+        self.assertIn("Compacted 1 days", out.getvalue())
+        self.assertFalse(AnalyticsLog.objects.exists())
+
+
+class PartitionHelperTests(SimpleTestCase):
+    def test_months(self):
+        self.assertEqual(partitions.add_months(datetime.date(2026, 11, 1), 2), datetime.date(2027, 1, 1))
+        self.assertEqual(partitions.add_months(datetime.date(2026, 1, 1), -1), datetime.date(2025, 12, 1))
+        self.assertEqual(partitions.month_start(datetime.date(2026, 10, 17)), datetime.date(2026, 10, 1))
+        name = partitions.partition_name(datetime.date(2026, 3, 1))
+        self.assertEqual(name, "analytics_analyticslog_p202603")
+        self.assertTrue(partitions.PARTITION_NAME.match(name))
+
+
+@skipUnless(connection.vendor == "postgresql", "AnalyticsLog is only partitioned on PostgreSQL")
+class PartitionTests(TestCase):
+    def test_late_partition_takes_rows_from_default_partition(self):
+        month = partitions.add_months(partitions.month_start(timezone.localdate()), 6)
+        log = AnalyticsLog.objects.create(message="event")
+        AnalyticsLog.objects.filter(pk=log.pk).update(created_at=day_start(month) + datetime.timedelta(hours=12))
+        self.assertEqual(partitions.ensure_partitions(connection, month, month), [month])
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT id FROM "{partitions.partition_name(month)}"')
+            self.assertEqual(cursor.fetchall(), [(log.pk,)])
+            cursor.execute(f'SELECT COUNT(*) FROM "{partitions.DEFAULT_PARTITION}"')
+            self.assertEqual(cursor.fetchone()[0], 0)
+        self.assertTrue(AnalyticsLog.objects.filter(pk=log.pk).exists())
@@ -0,0 +1,137 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from analytics import rollups, stats
+from analytics.models import DailyCourseRollup, DailyGradeRollup, RollupDirtyDay
+from assignments.models import Assignment, Submission
+from courses.models import Course
+from enrollments.models import Enrollment as CourseEnrollment
+from grades.models import Grade
+
+
+class RollupTests(TestCase):
+    """
+    Tests for the daily analytics rollups and their use by analytics.stats.admin_stats.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.course = Course.objects.create(title="Math 101", instructor=self.instructor)
+        self.assignment = Assignment.objects.create(course=self.course, title="Homework", due_date=timezone.now())
+        # Two students three days ago, one yesterday, one today
+        self.grades = [
+            self.add_student(0, days_ago=3, score=80, letter="B"),
+            self.add_student(1, days_ago=3, score=None, letter=None),
+            self.add_student(2, days_ago=1, score=90, letter="A"),
+            self.add_student(3, days_ago=0, score=70, letter="C"),
+        ]
+
+    def add_student(self, i, days_ago, score, letter):
+        student = CustomUser.objects.create_user(
+            email=f"student{i}@example.com", password="password123", role="student"
+        )
+        enrollment = CourseEnrollment.objects.create(course=self.course, student=student)
+        submission = Submission.objects.create(assignment=self.assignment, student=student, content="A")
+        grade = Grade.objects.create(submission=submission, instructor=self.instructor, score=score, letter=letter)
+        moment = timezone.now() - datetime.timedelta(days=days_ago)
+        CourseEnrollment.objects.filter(pk=enrollment.pk).update(enrolled_at=moment)
+        Submission.objects.filter(pk=submission.pk).update(submitted_at=moment)
+        Grade.objects.filter(pk=grade.pk).update(graded_at=moment)
+        grade.refresh_from_db()
+        return grade
+
+    def figures(self):
+        data = stats.admin_stats("course_enrollments")
+        return (
+            data["total_grades"], data["global_gpa"], data["grade_distribution"],
+            data["course_enrollment_stats"], data["total_submissions"],
+        )
+
+    def test_backfill_matches_live_figures(self):
+        live = self.figures()
+        self.assertEqual(live, (4, 80.0, {"A": 1, "B": 1, "C": 1}, {"Math 101": 4}, 4))
+        out = StringIO()
+        call_command("rollup_analytics", "--backfill", stdout=out)
+        self.assertIn("rollups now end before", out.getvalue())
+        self.assertEqual(rollups.get_watermark(), self.today)
+
+        three_days_ago = self.today - datetime.timedelta(days=3)
+        day = DailyCourseRollup.objects.get(day=three_days_ago)
+        self.assertEqual((day.submissions, day.new_enrollments), (2, 2))
+        self.assertEqual(
+            set(DailyGradeRollup.objects.filter(day=three_days_ago).values_list("letter", "grades", "scored_count", "score_sum")),
+            {("B", 1, 1, Decimal("80")), ("", 1, 0, Decimal("0"))},
+        )
+        self.assertFalse(DailyCourseRollup.objects.filter(day=self.today).exists())
+        self.assertEqual(self.figures(), live)
+
+    def test_incremental_fold_only_touches_new_days(self):
+        yesterday = self.today - datetime.timedelta(days=1)
+        first = rollups.fold(today=yesterday)
+        self.assertFalse(DailyCourseRollup.objects.filter(day=yesterday).exists())
+        live = self.figures()
+        second = rollups.fold()
+        self.assertEqual((second["folded_days"], second["refolded_days"]), (1, 0))
+        self.assertGreater(first["folded_days"], second["folded_days"])
+        self.assertTrue(DailyCourseRollup.objects.filter(day=yesterday).exists())
+        self.assertEqual(self.figures(), live)
+
+    def test_changed_rows_refold_their_day(self):
+        rollups.fold()
+        grade = self.grades[0]
+        grade.score = Decimal("100")
+        grade.letter = "A"
+        grade.save()
+        self.grades[2].submission.delete()
+        self.assertEqual(RollupDirtyDay.objects.count(), 2)
+
+        result = rollups.fold()
+        self.assertEqual((result["folded_days"], result["refolded_days"]), (0, 2))
+        self.assertFalse(RollupDirtyDay.objects.exists())
+        total_grades, gpa, distribution, _, submissions = self.figures()
+        self.assertEqual((total_grades, gpa, distribution, submissions), (3, 85.0, {"A": 1, "C": 1}, 3))
+
+    def test_dirty_days_are_counted_live_until_refolded(self):
+        rollups.fold()
+        grade = self.grades[0]
+        grade.score = Decimal("100")
+        grade.letter = "A"
+        grade.save()
+        self.grades[2].submission.delete()
+        CourseEnrollment.objects.filter(student=self.grades[1].submission.student).delete()
+        # No fold() in between: the rollups of both days are stale
+        expected = (3, 85.0, {"A": 1, "C": 1}, {"Math 101": 3}, 3)
+        self.assertEqual(self.figures(), expected)
+        rollups.fold()
+        self.assertEqual(self.figures(), expected)
+
+    def test_bulk_grading_marks_folded_days(self):
+        rollups.fold()
+        client = APIClient()
+        client.force_authenticate(user=self.instructor)
+        client.post(
+            "/api/grades/bulk/", {"grades": [{"submission": self.grades[0].submission_id, "score": 60}]}, format="json"
+        )
+        self.assertEqual(
+            list(RollupDirtyDay.objects.values_list("day", flat=True)), [self.today - datetime.timedelta(days=3)]
+        )
+        rollups.fold()
+        self.assertEqual(self.figures()[1], 73.33)
+
+    def test_today_changes_are_live(self):
+        rollups.fold()
+        self.grades[3].delete()
+        self.assertFalse(RollupDirtyDay.objects.exists())
+        self.assertEqual(self.figures()[0], 3)
@@ -0,0 +1,151 @@
+import random
+import statistics
+from unittest import mock
+
+import numpy
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import CustomUser
+from analytics import scores
+from assignments.models import Assignment, Submission
+from courses.models import Course
+from grades.models import Grade
+
+
+class DescribeTests(SimpleTestCase):
+    """
+    Tests for analytics.scores.describe: figures match the statistics module,
+    and all groups are described by the same few passes over one array.
+    """
+
+    def test_matches_statistics_module(self):
+        values = [55.0, 71.5, 80.0, 92.0, 100.0, 64.0, 38.0]
+        data = scores.describe(["a"] * len(values), values)["a"]
+        quartiles = statistics.quantiles(values, n=4, method="inclusive")
+        self.assertEqual(data["count"], 7)
+        self.assertAlmostEqual(data["mean"], statistics.fmean(values))
+        self.assertAlmostEqual(data["std"], statistics.pstdev(values))
+        self.assertAlmostEqual(data["p25"], quartiles[0])
+        self.assertAlmostEqual(data["median"], quartiles[1])
+        self.assertAlmostEqual(data["p75"], quartiles[2])
+        self.assertEqual((data["min"], data["max"]), (38.0, 100.0))
+        # 100 falls in the last bin, like numpy.histogram
+        self.assertEqual(data["histogram"], [0, 0, 0, 1, 0, 1, 1, 1, 1, 2])
+
+    def test_groups_and_out_of_range_scores(self):
+        data = scores.describe([2, 1, 2, 1], [-5.0, 10.0, 150.0, 20.0], bins=2)
+        self.assertEqual(data[1]["histogram"], [2, 0])
+        self.assertEqual(data[2]["histogram"], [1, 1])
+        self.assertEqual(data[1]["median"], 15.0)
+        self.assertEqual(scores.describe([], []), {})
+
+    def test_many_groups_match_statistics_module(self):
+        rng = random.Random(7)
+        groups = [rng.randrange(20) for _ in range(5000)]
+        values = [round(rng.uniform(0, 100), 2) for _ in groups]
+        data = scores.describe(groups, values)
+        self.assertEqual(sorted(data), list(range(20)))
+        for group, row in data.items():
+            group_values = [value for g, value in zip(groups, values) if g == group]
+            quartiles = statistics.quantiles(group_values, n=4, method="inclusive")
+            self.assertEqual(row["count"], len(group_values))
+            self.assertEqual(sum(row["histogram"]), len(group_values))
+            self.assertAlmostEqual(row["mean"], statistics.fmean(group_values))
+            self.assertAlmostEqual(row["std"], statistics.pstdev(group_values))
+            self.assertAlmostEqual(row["p25"], quartiles[0])
+            self.assertAlmostEqual(row["median"], quartiles[1])
+            self.assertAlmostEqual(row["p75"], quartiles[2])
+
+    def test_array_passes_do_not_grow_with_groups(self):
+        rng = random.Random(11)
+
+        def count_passes(group_count):
+            groups = [rng.randrange(group_count) for _ in range(2000)]
+            values = [rng.uniform(0, 100) for _ in groups]
+            with mock.patch.object(scores.numpy, "lexsort", wraps=numpy.lexsort) as lexsort, \
+                    mock.patch.object(scores.numpy, "searchsorted", wraps=numpy.searchsorted) as searchsorted:
+                scores.describe(groups, values)
+            return lexsort.call_count, searchsorted.call_count
+
+        # One sort and one bin lookup over all scores, not one per group
+        self.assertEqual(count_passes(1), (1, 1))
+        self.assertEqual(count_passes(200), (1, 1))
+
+
+class CourseAnalyticsViewTests(APITestCase):
+    """
+    Tests for GET /analytics/course/<pk>/.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.other_instructor = CustomUser.objects.create_user(
+            email="other@example.com", password="password123", role="instructor"
+        )
+        self.admin = CustomUser.objects.create_user(email="admin@example.com", password="password123", role="admin")
+        self.course = Course.objects.create(title="Math 101", instructor=self.instructor)
+        self.homework = Assignment.objects.create(course=self.course, title="Homework", due_date=timezone.now())
+        self.quiz = Assignment.objects.create(course=self.course, title="Quiz", due_date=timezone.now())
+        self.url = f"/analytics/course/{self.course.pk}/"
+
+    def add_grades(self, assignment, values):
+        for value in values:
+            student = CustomUser.objects.create_user(
+                email=f"s{CustomUser.objects.count()}@example.com", password="password123", role="student"
+            )
+            submission = Submission.objects.create(assignment=assignment, student=student, content="A")
+            Grade.objects.create(submission=submission, instructor=self.instructor, score=value)
+
+    def test_statistics(self):
+        self.add_grades(self.homework, [60, 70, 80, 90])
+        self.client.force_authenticate(user=self.instructor)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["course"], {"id": self.course.pk, "title": "Math 101"})
+        self.assertEqual(len(response.data["bins"]), 11)
+        self.assertEqual(response.data["overall"]["count"], 4)
+        self.assertEqual(response.data["overall"]["median"], 75.0)
+        homework, quiz = response.data["assignments"]
+        self.assertEqual((homework["title"], homework["p25"], homework["p75"]), ("Homework", 67.5, 82.5))
+        self.assertEqual(homework["histogram"], [0, 0, 0, 0, 0, 0, 1, 1, 1, 1])
+        self.assertEqual((quiz["count"], quiz["median"], quiz["histogram"]), (0, None, [0] * 10))
+
+    def test_bins_parameter(self):
+        self.add_grades(self.homework, [10, 90])
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.url, {"bins": 2})
+        self.assertEqual(response.data["bins"], [0.0, 50.0, 100.0])
+        self.assertEqual(response.data["overall"]["histogram"], [1, 1])
+        response = self.client.get(self.url, {"bins": "many"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_access(self):
+        self.client.force_authenticate(user=self.other_instructor)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get("/analytics/course/999999/").status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_query_count_does_not_grow(self):
+        self.client.force_authenticate(user=self.instructor)
+
+        def count_queries():
+            cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.get(self.url)
+            return len(ctx.captured_queries)
+
+        self.add_grades(self.homework, [50])
+        few = count_queries()
+        self.add_grades(self.homework, range(6))
+        self.add_grades(self.quiz, range(6))
+        self.assertEqual(count_queries(), few)
@@ -0,0 +1,82 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from analytics import stats
+from assignments.models import Assignment, Submission
+from courses.models import Course, Enrollment
+from enrollments.models import Enrollment as CourseEnrollment
+from grades.models import Grade
+
+
+class StatsTests(TestCase):
+    """
+    Tests for analytics.stats: correct figures and a query count that
+    does not grow with the number of courses.
+    """
+
+    def setUp(self):
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.students = [
+            CustomUser.objects.create_user(email=f"student{i}@example.com", password="password123", role="student")
+            for i in range(2)
+        ]
+        self.add_course("Math 101", scores=[80, 90])
+
+    def add_course(self, title, scores):
+        course = Course.objects.create(title=title, instructor=self.instructor)
+        assignment = Assignment.objects.create(course=course, title="Homework", due_date=timezone.now())
+        for student, score in zip(self.students, scores):
+            Enrollment.objects.create(course=course, student=student)
+            CourseEnrollment.objects.create(course=course, student=student)
+            submission = Submission.objects.create(assignment=assignment, student=student, content="A")
+            Grade.objects.create(submission=submission, instructor=self.instructor, score=score, letter="A")
+        return course
+
+    def count_queries(self, func, *args, **kwargs):
+        with CaptureQueriesContext(connection) as ctx:
+            func(*args, **kwargs)
+        return len(ctx.captured_queries)
+
+    def test_student_stats(self):
+        data = stats.student_stats(self.students[0])
+        self.assertEqual(data, {"gpa": 80.0, "completion_rate": 100.0, "grades_count": 1, "assignments_count": 1})
+
+    def test_instructor_stats(self):
+        self.add_course("Physics 101", scores=[60, 70])
+        data = stats.instructor_stats(self.instructor)
+        self.assertEqual(data["courses_taught"], 2)
+        self.assertEqual(data["assignments_created"], 2)
+        self.assertEqual(data["submissions_received"], 4)
+        self.assertEqual(data["grades_given"], 4)
+        averages = {row["title"]: row["average_score"] for row in data["course_breakdown"]}
+        self.assertEqual(averages, {"Math 101": 85.0, "Physics 101": 65.0})
+
+    def test_admin_stats(self):
+        data = stats.admin_stats()
+        self.assertEqual(data["total_courses"], 1)
+        self.assertEqual(data["total_students"], 2)
+        self.assertEqual(data["total_instructors"], 1)
+        self.assertEqual(data["total_grades"], 2)
+        self.assertEqual(data["global_gpa"], 85.0)
+        self.assertEqual(data["grade_distribution"], {"A": 2})
+        self.assertEqual(data["course_enrollment_stats"], {"Math 101": 2})
+        self.assertEqual(stats.admin_stats("course_enrollments")["course_enrollment_stats"], {"Math 101": 2})
+
+    def test_query_count_is_flat_in_number_of_courses(self):
+        before = (
+            self.count_queries(stats.instructor_stats, self.instructor),
+            self.count_queries(stats.admin_stats),
+        )
+        for i in range(5):
+            self.add_course(f"Extra {i}", scores=[50, 60])
+        after = (
+            self.count_queries(stats.instructor_stats, self.instructor),
+            self.count_queries(stats.admin_stats),
+        )
+        self.assertEqual(before, after)
+        self.assertEqual(before, (1, 5))  # admin: + rollup watermark lookup
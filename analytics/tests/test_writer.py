@@ -0,0 +1,104 @@
+from datetime import datetime, timezone as dt_timezone
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import CustomUser
+from analytics.models import AnalyticsLog
+from analytics.writer import BufferedLogWriter
+
+
+class BufferedLogWriterTests(TestCase):
+    """
+    Tests for analytics.writer with the flush thread off: logging never
+    queries, flushes are batched, and overflow is dropped and counted.
+    """
+
+    def test_log_does_not_query(self):
+        writer = BufferedLogWriter(autostart=False)
+        with CaptureQueriesContext(connection) as ctx:
+            for i in range(10):
+                self.assertTrue(writer.log(f"event {i}"))
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(writer.metrics()["queued"], 10)
+        self.assertFalse(AnalyticsLog.objects.exists())
+
+    def test_flush_in_batches(self):
+        writer = BufferedLogWriter(batch_size=4, autostart=False)
+        for i in range(10):
+            writer.log(f"event {i}")
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(writer.flush(), 10)
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual(AnalyticsLog.objects.count(), 10)
+        metrics = writer.metrics()
+        self.assertEqual((metrics["queued"], metrics["written"], metrics["flushes"]), (0, 10, 3))
+
+    def test_full_queue_drops(self):
+        writer = BufferedLogWriter(max_queue=3, autostart=False)
+        results = [writer.log(f"event {i}") for i in range(5)]
+        self.assertEqual(results, [True, True, True, False, False])
+        metrics = writer.metrics()
+        self.assertEqual((metrics["queued"], metrics["accepted"], metrics["dropped"]), (3, 3, 2))
+
+
+    def test_events_keep_their_log_time(self):
+        writer = BufferedLogWriter(autostart=False)
+        logged_at = datetime(2024, 1, 1, 23, 59, tzinfo=dt_timezone.utc)
+        with mock.patch("analytics.writer.timezone.now", return_value=logged_at):
+            writer.log("late event")
+        writer.flush()
+        self.assertEqual(AnalyticsLog.objects.get(message="late event").created_at, logged_at)
+
+
+class BufferedLogWriterThreadTests(TransactionTestCase):
+    """
+    The background thread writes the queue and close() flushes what is left.
+    """
+
+    def test_close_flushes(self):
+        writer = BufferedLogWriter(batch_size=2, flush_interval=60)
+        for i in range(5):
+            writer.log(f"event {i}")
+        writer.close()
+        self.assertEqual(AnalyticsLog.objects.count(), 5)
+        self.assertEqual(writer.metrics()["written"], 5)
+
+
+class LogWriterMetricsViewTests(APITestCase):
+    def test_admin_only(self):
+        admin = CustomUser.objects.create_user(email="admin@example.com", password="password123", role="admin")
+        student = CustomUser.objects.create_user(email="s@example.com", password="password123", role="student")
+        self.client.force_authenticate(user=student)
+        self.assertEqual(self.client.get("/analytics/log-writer/").status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=admin)
+        response = self.client.get("/analytics/log-writer/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("dropped", response.data)
+        self.assertIn("queued", response.data)
+
+
+@override_settings(ANALYTICS_LOG_REPORTS=True)
+class ReportLoggingTests(APITestCase):
+    def setUp(self):
+        self.student = CustomUser.objects.create_user(
+            email="student@example.com", password="password123", role="student"
+        )
+        self.client.force_authenticate(user=self.student)
+
+    def test_served_report_is_logged(self):
+        with mock.patch("analytics.writer.log_event") as log_event:
+            response = self.client.get("/analytics/student/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        log_event.assert_called_once_with(f"student analytics viewed by user {self.student.pk}")
+
+    def test_refused_report_is_not_logged(self):
+        with mock.patch("analytics.writer.log_event") as log_event:
+            response = self.client.get("/analytics/admin/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        log_event.assert_not_called()
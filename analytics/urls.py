@@ -8,6 +8,7 @@ instructor_analytics = AnalyticsLogViewSet.as_view({"get": "instructor"})
 admin_analytics = AnalyticsLogViewSet.as_view({"get": "admin"})
 overview_analytics = AnalyticsLogViewSet.as_view({"get": "overview"})
 course_analytics = AnalyticsLogViewSet.as_view({"get": "course"})
+log_writer_metrics = AnalyticsLogViewSet.as_view({"get": "log_writer"})
 
 urlpatterns = [
     # Default analytics list (auto-detect role)
@@ -21,6 +22,7 @@ urlpatterns = [
     # Extra analytics endpoints
     path("overview/", overview_analytics, name="overview-analytics"),
     path("course/<int:pk>/", course_analytics, name="course-analytics"),
+    path("log-writer/", log_writer_metrics, name="analytics-log-writer"),
 
     # ✅ Aliases under api/ for compatibility with tests
     path("api/student/", student_analytics, name="api-student-analytics"),
@@ -1,31 +1,51 @@
-from django.db.models import Avg, Count
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from accounts.models import CustomUser
-from courses.models import Course
-from enrollments.models import Enrollment
 from assignments.models import Assignment, Submission
+from core.mixins import TaggedCacheMixin
+from core.parallel import AsyncDispatchMixin
+from core.replicas import ReplicaReadMixin
+from courses.models import Course, Enrollment
+from enrollments.models import Enrollment as CourseEnrollment
 from grades.models import Grade
-
+from . import scores, stats, writer
+from .models import DailyCourseRollup, DailyGradeRollup
 from .serializers import (
     StudentAnalyticsSerializer,
     InstructorAnalyticsSerializer,
     AdminAnalyticsSerializer,
+    CourseAnalyticsSerializer,
 )
 
 
-class AnalyticsLogViewSet(viewsets.ViewSet):
+class AnalyticsLogViewSet(AsyncDispatchMixin, ReplicaReadMixin, TaggedCacheMixin, viewsets.ViewSet):
     """
     Robust analytics ViewSet:
     - Students: GPA, completion rate, grades count, assignments count
     - Instructors: teaching stats, submissions, grades, per-course breakdown
     - Admins: global stats, grade distribution, course enrollment, overview, per-course analytics
+    All figures come from analytics.stats, which uses a constant number of queries per request,
+    and responses are served from the tagged cache until a write touches the user's scope.
+    Score distributions per course (analytics.scores) are read in two queries whatever the grade count.
+    The admin and course figures are async handlers whose independent queries run concurrently.
+    Reports read from a database replica (core.replicas) when one is configured and caught up.
+    Every report served is recorded as an AnalyticsLog event through the buffered writer
+    (analytics.writer), off the request path.
     """
     permission_classes = [permissions.IsAuthenticated]
-
-    def list(self, request):
+    cache_actions = ("list", "student", "instructor", "admin", "course")
+    replica_actions = cache_actions
+    cache_models = (
+        CustomUser, Course, Enrollment, CourseEnrollment, Assignment, Submission, Grade,
+        DailyCourseRollup, DailyGradeRollup,
+    )
+
+    async def list(self, request):
         """
         Auto-detect role and return appropriate analytics.
         """
@@ -33,17 +53,17 @@ class AnalyticsLogViewSet(viewsets.ViewSet):
         role = getattr(user, "role", None)
 
         if role == "student":
-            data = self.student_analytics(user)
+            data = await sync_to_async(self.student_analytics)(user)
             serializer = StudentAnalyticsSerializer(instance=data)
             return Response(serializer.data)
 
         elif role == "instructor":
-            data = self.instructor_analytics(user)
+            data = await sync_to_async(self.instructor_analytics)(user)
             serializer = InstructorAnalyticsSerializer(instance=data)
             return Response(serializer.data)
 
         elif role == "admin":
-            data = self.admin_analytics()
+            data = await self.admin_analytics()
             serializer = AdminAnalyticsSerializer(instance=data)
             return Response(serializer.data)
 
@@ -52,87 +72,39 @@ class AnalyticsLogViewSet(viewsets.ViewSet):
             status=status.HTTP_403_FORBIDDEN,
         )
 
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        action = getattr(self, "action", None)
+        if (
+            response.status_code == status.HTTP_200_OK
+            and action in self.cache_actions
+            and getattr(settings, "ANALYTICS_LOG_REPORTS", True)
+        ):
+            writer.log_event(f"{action} analytics viewed by user {request.user.pk}")
+        return response
+
     # --- Student analytics ---
     def student_analytics(self, user):
-        submissions = Submission.objects.filter(student=user).select_related("assignment")
-        grades = Grade.objects.filter(submission__student=user)
-
-        gpa = grades.aggregate(avg=Avg("score"))["avg"] or 0.0
-        total_assignments = Assignment.objects.filter(course__enrollments__student=user).count()
-        completed_assignments = submissions.values("assignment").distinct().count()
-        completion_rate = (completed_assignments / total_assignments * 100.0) if total_assignments else 0.0
-
-        return {
-            "gpa": round(gpa, 2),
-            "completion_rate": round(completion_rate, 2),
-            "grades_count": grades.count(),
-            "assignments_count": total_assignments,
-        }
+        return stats.student_stats(user)
 
     # --- Instructor analytics ---
     def instructor_analytics(self, user):
-        courses = Course.objects.filter(instructor=user)
-        assignments = Assignment.objects.filter(course__instructor=user)
-        submissions = Submission.objects.filter(assignment__course__instructor=user)
-        grades = Grade.objects.filter(submission__assignment__course__instructor=user)
-
-        # Per-course breakdown
-        course_performance = []
-        for course in courses:
-            course_assignments = Assignment.objects.filter(course=course)
-            course_submissions = Submission.objects.filter(assignment__course=course)
-            course_grades = Grade.objects.filter(submission__assignment__course=course)
-            avg_score = course_grades.aggregate(avg=Avg("score"))["avg"] or 0.0
-
-            course_performance.append({
-                "course": course.title,
-                "assignments_count": course_assignments.count(),
-                "submissions_count": course_submissions.count(),
-                "grades_count": course_grades.count(),
-                "average_score": round(avg_score, 2),
-            })
-
-        return {
-            "courses_taught": courses.count(),
-            "assignments_created": assignments.count(),
-            "submissions_received": submissions.count(),
-            "grades_given": grades.count(),
-            "course_performance": course_performance,
-        }
+        data = stats.instructor_stats(user)
+        breakdown = data.pop("course_breakdown")
+        data["course_performance"] = {row["title"]: row["average_score"] for row in breakdown}
+        data["performance_trend"] = [
+            {"course": row["title"], "average_score": row["average_score"]} for row in breakdown
+        ]
+        return data
 
     # --- Admin analytics ---
-    def admin_analytics(self):
-        courses = Course.objects.all()
-        students = CustomUser.objects.filter(role="student")
-        instructors = CustomUser.objects.filter(role="instructor")
-        submissions = Submission.objects.all()
-        grades = Grade.objects.all()
-
-        global_gpa = grades.aggregate(avg=Avg("score"))["avg"] or 0.0
-
-        grade_distribution = {}
-        if hasattr(Grade, "letter"):  # only if Grade has a 'letter' field
-            grade_distribution = {
-                g["letter"]: g["count"]
-                for g in grades.values("letter").annotate(count=Count("id"))
-                if g["letter"]
-            }
-
-        course_enrollment_stats = {
-            course.title: Enrollment.objects.filter(course=course).values("student").distinct().count()
-            for course in courses
-        }
-
-        return {
-            "total_courses": courses.count(),
-            "total_students": students.count(),
-            "total_instructors": instructors.count(),
-            "total_submissions": submissions.count(),
-            "total_grades": grades.count(),
-            "global_gpa": round(global_gpa, 2),
-            "grade_distribution": grade_distribution,
-            "course_enrollment_stats": course_enrollment_stats,
-        }
+    async def admin_analytics(self):
+        data = await stats.admin_stats_async(enrollment_relation="course_enrollments")
+        data["enrollment_trend"] = [
+            {"course": title, "enrollment_count": count}
+            for title, count in data["course_enrollment_stats"].items()
+        ]
+        return data
 
     # --- Explicit role-based endpoints ---
     @action(detail=False, methods=["get"], url_path="student")
@@ -158,12 +130,50 @@ class AnalyticsLogViewSet(viewsets.ViewSet):
         return Response(serializer.data)
 
     @action(detail=False, methods=["get"], url_path="admin")
-    def admin(self, request):
+    async def admin(self, request):
         if getattr(request.user, "role", None) != "admin":
             return Response(
                 {"detail": "You do not have permission to access admin analytics."},
                 status=status.HTTP_403_FORBIDDEN,
             )
-        data = self.admin_analytics()
+        data = await self.admin_analytics()
         serializer = AdminAnalyticsSerializer(instance=data)
         return Response(serializer.data)
+
+    @action(detail=True, methods=["get"], url_path="course")
+    async def course(self, request, pk=None):
+        """
+        Score statistics of one course and each of its assignments: mean, standard
+        deviation, quartiles and a histogram over ?bins= equal bins of 0-100 (default 10).
+        Available to the course instructor and admins.
+        """
+        course = await sync_to_async(get_object_or_404)(Course, pk=pk)
+        role = getattr(request.user, "role", None)
+        if role != "admin" and not (role == "instructor" and course.instructor_id == request.user.pk):
+            return Response(
+                {"detail": "You do not have permission to access this course's analytics."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        try:
+            bins = int(request.query_params.get("bins", scores.DEFAULT_BINS))
+        except ValueError:
+            bins = 0
+        if not 1 <= bins <= scores.MAX_BINS:
+            return Response(
+                {"bins": [f"Ensure this value is an integer between 1 and {scores.MAX_BINS}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        serializer = CourseAnalyticsSerializer(instance=await scores.course_statistics_async(course, bins))
+        return Response(serializer.data)
+
+    @action(detail=False, methods=["get"], url_path="log-writer")
+    def log_writer(self, request):
+        """
+        Counters of this worker's buffered AnalyticsLog writer (analytics.writer).
+        """
+        if getattr(request.user, "role", None) != "admin":
+            return Response(
+                {"detail": "You do not have permission to access analytics writer metrics."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        return Response(writer.log_writer.metrics())
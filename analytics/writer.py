@@ -0,0 +1,149 @@
+"""
+Buffered AnalyticsLog writer.
+
+log_event() only appends to an in-process queue, so request latency never
+includes an analytics INSERT. A background thread drains the queue with
+bulk_create once batch_size events are waiting or every flush_interval
+seconds, and the queue is flushed one last time when the process exits.
+When the queue is full (the database is down or too slow), new events are
+dropped and counted instead of blocking the caller; metrics() reports the
+queued, dropped, written and failed counts.
+
+created_at is taken when an event is logged, not when it is written, so a
+backlog cannot move events into a later day (see analytics.retention).
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .models import AnalyticsLog
+
+logger = logging.getLogger("lms.analytics")
+
+
+class BufferedLogWriter:
+    def __init__(self, batch_size=500, flush_interval=2.0, max_queue=10000, autostart=True):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.autostart = autostart
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._reset()
+        self._exit_hook = False
+
+    def _reset(self):
+        self._queue = queue.Queue(maxsize=self.max_queue)
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._pid = os.getpid()
+        self._counters = {"accepted": 0, "dropped": 0, "written": 0, "failed": 0, "flushes": 0}
+
+    def start(self):
+        """
+        Start the flush thread if it is not running in this process yet.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker: the parent's thread and queue did not survive the fork
+                self._reset()
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="analytics-log-writer", daemon=True)
+            self._thread.start()
+            if not self._exit_hook:
+                atexit.register(self.close)
+                self._exit_hook = True
+
+    def log(self, message):
+        """
+        Queue one event; returns False when it was dropped because the queue is full.
+        """
+        if self.autostart and (self._thread is None or self._pid != os.getpid()):
+            self.start()
+        try:
+            self._queue.put_nowait(AnalyticsLog(message=message, created_at=timezone.now()))
+        except queue.Full:
+            with self._lock:
+                self._counters["dropped"] += 1
+            return False
+        with self._lock:
+            self._counters["accepted"] += 1
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def flush(self):
+        """
+        Write every queued event, batch_size rows per INSERT. Returns the number written.
+        """
+        with self._flush_lock:
+            written = 0
+            while True:
+                batch = []
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    return written
+                try:
+                    AnalyticsLog.objects.bulk_create(batch)
+                except Exception:
+                    logger.exception("Dropped %d analytics events: bulk insert failed", len(batch))
+                    with self._lock:
+                        self._counters["failed"] += len(batch)
+                    continue
+                written += len(batch)
+                with self._lock:
+                    self._counters["written"] += len(batch)
+                    self._counters["flushes"] += 1
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                # The thread's connection is not covered by request_finished
+                connection.close()
+
+    def close(self, timeout=5.0):
+        """
+        Stop the flush thread and write what is left in the queue.
+        """
+        thread = self._thread
+        if thread is not None and self._pid == os.getpid():
+            self._stopping.set()
+            self._wakeup.set()
+            thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def metrics(self):
+        with self._lock:
+            return {"queued": self._queue.qsize(), **self._counters}
+
+
+log_writer = BufferedLogWriter(
+    batch_size=getattr(settings, "ANALYTICS_LOG_BATCH_SIZE", 500),
+    flush_interval=getattr(settings, "ANALYTICS_LOG_FLUSH_INTERVAL", 2.0),
+    max_queue=getattr(settings, "ANALYTICS_LOG_QUEUE_SIZE", 10000),
+)
+
+
+def log_event(message):
+    """
+    Record an AnalyticsLog entry without touching the database on the caller's thread.
+    """
+    return log_writer.log(message)
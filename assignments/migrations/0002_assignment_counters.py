@@ -0,0 +1,45 @@
+# Generated by Django 4.2.27 on 2026-10-17 07:58
+
+from django.db import migrations, models
+
+from core.counters import assignment_count_expressions, recount
+
+
+def backfill_counters(apps, schema_editor):
+    Assignment = apps.get_model("assignments", "Assignment")
+    recount(
+        Assignment.objects.all(),
+        assignment_count_expressions(apps.get_model("assignments", "Submission"), apps.get_model("grades", "Grade")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0001_initial'),
+        ('grades', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assignment',
+            name='graded_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='assignment',
+            name='score_sum',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='assignment',
+            name='scored_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='assignment',
+            name='submission_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
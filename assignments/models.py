@@ -33,6 +33,11 @@ class Assignment(models.Model):
         help_text="Instructor who created the assignment"
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # ✅ denormalized counters over submissions and their grades, maintained by core.counters
+    submission_count = models.IntegerField(default=0, editable=False)
+    graded_count = models.IntegerField(default=0, editable=False)
+    scored_count = models.IntegerField(default=0, editable=False)
+    score_sum = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
 
     class Meta:
         constraints = [
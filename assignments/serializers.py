@@ -1,9 +1,11 @@
 from rest_framework import serializers
 from accounts.models import CustomUser
+from core.compiled import CompilableSerializerMixin
+from core.sparse import SparseSerializerMixin
 from .models import Assignment, Submission
 
 
-class UserNestedSerializer(serializers.ModelSerializer):
+class UserNestedSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     """
     Nested serializer for displaying basic user info.
     Used in Assignment and Submission serializers to avoid duplication.
@@ -14,7 +16,7 @@ class UserNestedSerializer(serializers.ModelSerializer):
         ref_name = "AssignmentsUserNested"   # ✅ unique schema name
 
 
-class AssignmentSerializer(serializers.ModelSerializer):
+class AssignmentSerializer(CompilableSerializerMixin, SparseSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for assignments.
     Includes course title, module info, and creator details.
@@ -39,6 +41,7 @@ class AssignmentSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ("created_by", "created_at")
         ref_name = "AssignmentsAssignment"   # ✅ unique schema name
+        expandable_fields = {"created_by": "created_by_id"}
 
     def create(self, validated_data):
         """
@@ -49,17 +52,17 @@ class AssignmentSerializer(serializers.ModelSerializer):
             validated_data["created_by"] = request.user
         return super().create(validated_data)
 
-    def to_representation(self, instance):
+    def finish_representation(self, representation):
         """
         Ensure course/module titles are always present, even if null.
         """
-        representation = super().to_representation(instance)
-        representation["course_title"] = getattr(instance.course, "title", None)
-        representation["module_title"] = getattr(instance.module, "title", None)
+        for name in ("course_title", "module_title"):
+            if name in self.fields:
+                representation.setdefault(name, None)
         return representation
 
 
-class SubmissionSerializer(serializers.ModelSerializer):
+class SubmissionSerializer(CompilableSerializerMixin, SparseSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for submissions.
     Student is set automatically, assignment is passed as a PK.
@@ -82,6 +85,7 @@ class SubmissionSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ("student", "submitted_at", "feedback")
         ref_name = "AssignmentsSubmission"   # ✅ unique schema name
+        expandable_fields = {"student": "student_id"}
 
     def create(self, validated_data):
         """
@@ -92,10 +96,10 @@ class SubmissionSerializer(serializers.ModelSerializer):
             validated_data["student"] = request.user
         return super().create(validated_data)
 
-    def to_representation(self, instance):
+    def finish_representation(self, representation):
         """
         Ensure assignment title is always present, even if null.
         """
-        representation = super().to_representation(instance)
-        representation["assignment_title"] = getattr(instance.assignment, "title", None)
+        if "assignment_title" in self.fields:
+            representation.setdefault("assignment_title", None)
         return representation
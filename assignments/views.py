@@ -1,20 +1,26 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
+from core.mixins import CompiledListMixin, ConditionalGetMixin, SparseFieldsMixin, StreamingListMixin, TaggedCacheMixin
 from django.utils import timezone
+from accounts.models import CustomUser
+from courses.models import Course, Enrollment, Module
 from .models import Assignment, Submission
 from .serializers import AssignmentSerializer, SubmissionSerializer
 
 
-class AssignmentViewSet(viewsets.ModelViewSet):
+class AssignmentViewSet(SparseFieldsMixin, TaggedCacheMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing assignments.
     Role-based isolation:
     - Instructors: can create/update/delete assignments for their courses.
     - Students: can list/retrieve assignments from courses they are enrolled in.
     - Admins: can view/manage all assignments.
+    GET responses carry an ETag and honour If-None-Match, and are served from the tagged cache.
     """
     serializer_class = AssignmentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    etag_models = (Assignment, Course, Module, Enrollment, CustomUser)
+    cache_models = (Assignment, Course, Module, Enrollment, CustomUser)
 
     def get_queryset(self):
         user = self.request.user
@@ -49,16 +55,19 @@ class AssignmentViewSet(viewsets.ModelViewSet):
         serializer.save(due_date=due_date, created_by=self.request.user)
 
 
-class SubmissionViewSet(viewsets.ModelViewSet):
+class SubmissionViewSet(CompiledListMixin, SparseFieldsMixin, StreamingListMixin, TaggedCacheMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing submissions.
     Role-based isolation:
     - Students: can create/update their own submissions.
     - Instructors: can view submissions for their courses.
     - Admins: can view/manage all submissions.
+    List and retrieve responses are served from the tagged cache; lists are
+    rendered from values_list() rows by the compiled serializer.
     """
     serializer_class = SubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_models = (Submission, Assignment, CustomUser)
 
     def get_queryset(self):
         user = self.request.user
@@ -2,4 +2,11 @@ from django.apps import AppConfig
 
 
 class CoreConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
     name = 'core'
+
+    def ready(self):
+        """
+        Import signals so table versions are bumped and cache tags invalidated on every write.
+        """
+        import core.signals  # noqa
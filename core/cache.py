@@ -0,0 +1,185 @@
+"""
+Tag-invalidated cache for API responses.
+
+Every entry is stored together with the version token of each tag it depends
+on ("student:4", "course:12", "table:grades.grade") and of the global tag.
+Invalidating a tag replaces its token, so any entry recorded against the old
+token becomes a miss on its next read; entries never have to be enumerated or
+deleted one by one.
+
+Tokens are CacheTag rows, not cache keys: the cache itself may be local to the
+process (LocMemCache), while a write made by any worker or management command
+changes the tokens every process validates against. They are written in the
+writer's transaction, so they become visible when its rows do (on a replica
+too) and a rollback restores them.
+
+Tag versions are read *before* the value is computed and stored alongside it,
+so a write that lands while a response is being built invalidates that
+response as well.
+"""
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+
+from .models import CacheTag
+
+MISS = object()
+
+# Part of every entry's versions: invalidate_all() drops the whole cache
+GLOBAL_TAG = "all"
+
+
+def get_cache():
+    return caches[getattr(settings, "API_CACHE_ALIAS", "default")]
+
+
+def default_timeout():
+    return getattr(settings, "API_CACHE_TIMEOUT", 300)
+
+
+def make_key(*parts):
+    return "api:%s" % hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def table_tag(model):
+    return f"table:{model._meta.label_lower}"
+
+
+def get_tag_versions(tags):
+    """
+    Return {tag: token} for the given tags and the global tag, in one query.
+    Tags that were never invalidated have the empty token.
+    """
+    names = {*tags, GLOBAL_TAG}
+    versions = dict.fromkeys(names, "")
+    versions.update(CacheTag.objects.filter(name__in=names).values_list("name", "token"))
+    return versions
+
+
+def invalidate_tags(*tags):
+    """
+    Give every tag a new token, in one statement of the current transaction.
+    """
+    tags = sorted({tag for tag in tags if tag})
+    if not tags:
+        return
+    token = uuid.uuid4().hex
+    CacheTag.objects.bulk_create(
+        [CacheTag(name=tag, token=token) for tag in tags],
+        update_conflicts=True, unique_fields=["name"], update_fields=["token"],
+    )
+
+
+def invalidate_all():
+    """
+    Invalidate every entry, e.g. after bulk loads that bypass model signals.
+    """
+    invalidate_tags(GLOBAL_TAG)
+
+
+def instance_tags(instance):
+    """
+    Cache tags affected by a change to instance: the owning student, the course
+    it belongs to and the model's table tag.
+    """
+    from assignments.models import Assignment, Submission
+    from courses.models import Course, Enrollment, Module
+    from enrollments.models import Enrollment as CourseEnrollment
+    from grades.models import Grade
+
+    tags = [table_tag(type(instance))]
+    if isinstance(instance, get_user_model()):
+        tags += [f"student:{instance.pk}", f"instructor:{instance.pk}"]
+        # Instructor names are nested in course payloads
+        tags += [f"course:{pk}" for pk in Course.objects.filter(instructor_id=instance.pk).values_list("pk", flat=True)]
+    elif isinstance(instance, Course):
+        tags += [f"course:{instance.pk}", f"instructor:{instance.instructor_id}"]
+    elif isinstance(instance, (Enrollment, CourseEnrollment)):
+        tags += [f"course:{instance.course_id}", f"student:{instance.student_id}"]
+    elif isinstance(instance, (Assignment, Module)):
+        tags.append(f"course:{instance.course_id}")
+    elif isinstance(instance, Submission):
+        tags.append(f"student:{instance.student_id}")
+        tags += [f"course:{pk}" for pk in Assignment.objects.filter(pk=instance.assignment_id).values_list("course_id", flat=True)]
+    elif isinstance(instance, Grade):
+        for student_id, course_id in Submission.objects.filter(pk=instance.submission_id).values_list(
+            "student_id", "assignment__course_id"
+        ):
+            tags += [f"student:{student_id}", f"course:{course_id}"]
+    return tags
+
+
+def invalidate_instances(instances):
+    """
+    Invalidate the tags of every instance. Call this from bulk write paths that
+    bypass model signals (bulk_create, queryset.update), alongside core.versions.bump_versions.
+    """
+    tags = set()
+    for instance in instances:
+        tags.update(instance_tags(instance))
+    invalidate_tags(*tags)
+
+
+def lookup(key, versions):
+    """
+    Return the value stored under key if it was stored with exactly these tag versions, else MISS.
+    """
+    entry = get_cache().get(key)
+    if entry is None or entry["versions"] != versions:
+        return MISS
+    return entry["value"]
+
+
+def store(key, value, versions, timeout=None):
+    get_cache().set(
+        key,
+        {"versions": versions, "value": value},
+        default_timeout() if timeout is None else timeout,
+    )
+
+
+def get_or_set(key, tags, compute, timeout=None):
+    versions = get_tag_versions(tags)
+    value = lookup(key, versions)
+    if value is MISS:
+        value = compute()
+        store(key, value, versions, timeout)
+    return value
+
+
+def student_course_ids(user):
+    from courses.models import Enrollment
+
+    return get_or_set(
+        make_key("scope", "student", user.pk),
+        [f"student:{user.pk}"],
+        lambda: sorted(set(Enrollment.objects.filter(student=user).values_list("course_id", flat=True))),
+    )
+
+
+def instructor_course_ids(user):
+    from courses.models import Course
+
+    return get_or_set(
+        make_key("scope", "instructor", user.pk),
+        [f"instructor:{user.pk}"],
+        lambda: sorted(Course.objects.filter(instructor=user).values_list("pk", flat=True)),
+    )
+
+
+def scope_tags(user, models=()):
+    """
+    Tags covering everything a user can see.
+    Students and instructors depend on their own tag plus one tag per course they
+    are enrolled in or teach; admins see every row, so they depend on the table
+    tags of the given models.
+    """
+    role = getattr(user, "role", None)
+    if role == "student":
+        return [f"student:{user.pk}", *(f"course:{pk}" for pk in student_course_ids(user))]
+    if role == "instructor":
+        return [f"instructor:{user.pk}", *(f"course:{pk}" for pk in instructor_course_ids(user))]
+    return [table_tag(model) for model in models]
@@ -0,0 +1,276 @@
+"""
+Read-only serializers compiled to a flat row-to-dict function.
+
+compile_serializer() walks a serializer's readable fields (after ?fields= and
+?expand= have been applied) and generates one Python function that builds the
+representation straight from a queryset.values_list() tuple, so list responses
+skip model instantiation, Field.get_attribute() and the per-field loop of
+Serializer.to_representation(). The output is the same dict, keys in the same
+order, as serializer.to_representation(instance):
+
+- a value reached through a missing forward relation is skipped or None, as
+  DRF's Field.get_attribute() does on AttributeError; a missing reverse
+  one-to-one gives None, as on ObjectDoesNotExist;
+- None values are not passed to field.to_representation();
+- SerializerMethodFields are called with a stand-in object holding the paths
+  declared in Meta.method_field_sources (forward relations only);
+- post-processing lives in finish_representation() (CompilableSerializerMixin),
+  which both paths run on the finished dict.
+
+Anything else (list or many-to-many fields, source="*", file fields, model
+properties, a custom to_representation) raises NotCompilable, and callers fall
+back to the serializer. core.mixins.CompiledListMixin serves list responses this
+way; the bench_serializers command measures the difference.
+"""
+from types import SimpleNamespace
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.fields import empty
+
+
+class NotCompilable(Exception):
+    """
+    The serializer reads something a values_list() row cannot provide.
+    """
+
+
+class CompilableSerializerMixin:
+    """
+    Keeps a serializer compilable: post-processing of the representation goes in
+    finish_representation(), which sees only the dict and returns it.
+    """
+
+    def to_representation(self, instance):
+        return self.finish_representation(super().to_representation(instance))
+
+    def finish_representation(self, representation):
+        return representation
+
+
+class CompiledSerializer:
+    """
+    paths: the values_list() lookups of a row; to_representation(row): its dict.
+    """
+
+    def __init__(self, paths, function, source):
+        self.paths = paths
+        self.to_representation = function
+        self.source = source
+
+    def rows(self, queryset):
+        return queryset.values_list(*self.paths)
+
+    def to_list(self, rows):
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+    def serialize(self, queryset):
+        return self.to_list(self.rows(queryset))
+
+
+def compile_serializer(serializer):
+    """
+    CompiledSerializer for serializer (the child of a many=True serializer), or NotCompilable.
+    """
+    builder = Builder()
+    builder.emit(1, "r0 = {}")
+    builder.serializer(serializer, "", "r0", 1)
+    builder.emit(1, "return r0")
+    source = "def to_representation(row):\n" + "\n".join(builder.lines)
+    namespace = dict(builder.constants)
+    exec(compile(source, f"<compiled {type(serializer).__name__}>", "exec"), namespace)
+    return CompiledSerializer(list(builder.paths), namespace["to_representation"], source)
+
+
+def resolve(model, attr):
+    """
+    (model field, lookup name, related model or None) of one attribute step.
+    """
+    try:
+        field = model._meta.get_field(attr)
+    except FieldDoesNotExist:
+        raise NotCompilable(f"{model.__name__}.{attr} is not a model field.")
+    if field.many_to_many or field.one_to_many:
+        raise NotCompilable(f"{model.__name__}.{attr} is a multi-valued relation.")
+    if field.is_relation and attr == getattr(field, "attname", None) and attr != field.name:
+        return field, field.name, None  # student_id: the raw key
+    if field.is_relation:
+        return field, field.name, field.related_model
+    if not field.concrete:
+        raise NotCompilable(f"{model.__name__}.{attr} is not a column.")
+    return field, field.name, None
+
+
+def nullable(field):
+    """
+    Whether a relation step can come back None from values_list().
+    """
+    return field.auto_created or field.null
+
+
+class Builder:
+    def __init__(self):
+        self.paths = {}
+        self.aliases = {}
+        self.constants = {"Namespace": SimpleNamespace}
+        self.lines = []
+        self.count = 0
+
+    def emit(self, depth, line):
+        self.lines.append("    " * depth + line)
+
+    def column(self, path):
+        path = self.aliases.get(path, path)
+        return f"row[{self.paths.setdefault(path, len(self.paths))}]"
+
+    def relation(self, path, model_field, related):
+        """
+        Register path as a relation: its related primary key is the foreign key column.
+        """
+        if not model_field.auto_created and model_field.target_field == related._meta.pk:
+            self.aliases[f"{path}__{related._meta.pk.name}"] = path
+
+    def name(self, prefix, value=None):
+        self.count += 1
+        name = f"{prefix}{self.count}"
+        if value is not None:
+            self.constants[name] = value
+        return name
+
+    def serializer(self, serializer, prefix, target, depth):
+        if isinstance(serializer, serializers.ListSerializer):
+            raise NotCompilable("List serializers are not compiled.")
+        if not isinstance(serializer, serializers.ModelSerializer):
+            raise NotCompilable(f"{type(serializer).__name__} is not a ModelSerializer.")
+        if type(serializer).to_representation not in (
+            serializers.Serializer.to_representation, CompilableSerializerMixin.to_representation,
+        ):
+            raise NotCompilable(f"{type(serializer).__name__} overrides to_representation.")
+        model = serializer.Meta.model
+        for field in serializer._readable_fields:
+            self.field(serializer, field, model, prefix, target, depth)
+        finish = getattr(type(serializer), "finish_representation", None)
+        if finish is not None and finish is not CompilableSerializerMixin.finish_representation:
+            self.emit(depth, f"{target} = {self.name('finish', serializer.finish_representation)}({target})")
+
+    def field(self, serializer, field, model, prefix, target, depth):
+        key = repr(field.field_name)
+        if isinstance(field, serializers.SerializerMethodField):
+            self.method_field(serializer, field, model, prefix, target, depth)
+            return
+        if field.source == "*":
+            raise NotCompilable(f"{field.field_name} reads the whole object.")
+        if field.default is not empty:
+            raise NotCompilable(f"{field.field_name} has a default.")
+        if isinstance(field, serializers.FileField):
+            raise NotCompilable(f"{field.field_name} renders a file URL.")
+        if isinstance(field, serializers.RelatedField) and not isinstance(field, serializers.PrimaryKeyRelatedField):
+            raise NotCompilable(f"{field.field_name} is a {type(field).__name__}.")
+        if isinstance(field, serializers.ManyRelatedField):
+            raise NotCompilable(f"{field.field_name} is a many-related field.")
+
+        # Intermediate steps: one guard per relation that can be missing
+        path = prefix
+        for attr in field.source_attrs[:-1]:
+            model_field, name, related = resolve(model, attr)
+            if related is None:
+                raise NotCompilable(f"{field.field_name} traverses {attr}, which is not a relation.")
+            path += name
+            self.relation(path, model_field, related)
+            if nullable(model_field):
+                self.emit(depth, f"if {self.column(path)} is None:")
+                if model_field.auto_created:
+                    self.emit(depth + 1, f"{target}[{key}] = None")
+                elif field.allow_null:
+                    self.emit(depth + 1, f"{target}[{key}] = None")
+                elif not field.required:
+                    self.emit(depth + 1, "pass")
+                else:
+                    raise NotCompilable(f"{field.field_name} raises when {attr} is missing.")
+                self.emit(depth, "else:")
+                depth += 1
+            path += "__"
+            model = related
+
+        model_field, name, related = resolve(model, field.source_attrs[-1])
+        path += name
+        value = self.column(path)
+
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            if field.pk_field is not None or not model_field.is_relation or model_field.auto_created:
+                raise NotCompilable(f"{field.field_name} is not a plain primary key.")
+            self.emit(depth, f"{target}[{key}] = {value}")
+        elif isinstance(field, serializers.BaseSerializer):
+            if related is None:
+                raise NotCompilable(f"{field.field_name} does not read a related object.")
+            inner = self.name("r")
+            self.relation(path, model_field, related)
+            if nullable(model_field):
+                self.emit(depth, f"if {value} is None:")
+                self.emit(depth + 1, f"{target}[{key}] = None")
+                self.emit(depth, "else:")
+                depth += 1
+            self.emit(depth, f"{inner} = {{}}")
+            self.serializer(field, path + "__", inner, depth)
+            self.emit(depth, f"{target}[{key}] = {inner}")
+        else:
+            if related is not None:
+                raise NotCompilable(f"{field.field_name} renders a related object.")
+            converted = self.convert(field, model_field, value)
+            if converted != value and (model_field.null or model_field.is_relation):
+                converted = f"None if {value} is None else {converted}"
+            self.emit(depth, f"{target}[{key}] = {converted}")
+
+    def convert(self, field, model_field, value):
+        """
+        Expression of field.to_representation(value), inlined for the common cases.
+        """
+        method = type(field).to_representation
+        if method is serializers.ReadOnlyField.to_representation:
+            return value
+        if method is serializers.IntegerField.to_representation:
+            is_integer = isinstance(model_field, models.IntegerField) and not model_field.is_relation
+            return value if is_integer else f"int({value})"
+        if method is serializers.CharField.to_representation:
+            is_text = isinstance(model_field, (models.CharField, models.TextField))
+            return value if is_text else f"str({value})"
+        return f"{self.name('field', field.to_representation)}({value})"
+
+    def method_field(self, serializer, field, model, prefix, target, depth):
+        sources = getattr(serializer.Meta, "method_field_sources", {}).get(field.field_name)
+        if sources is None:
+            raise NotCompilable(f"{field.field_name} does not declare its sources.")
+        tree = {}
+        for source in sources:
+            node = tree
+            parts = source.split("__")
+            for part in parts[:-1]:
+                node = node.setdefault(part, {})
+                if node is None:
+                    raise NotCompilable(f"{source} reads past a column.")
+            node.setdefault(parts[-1], None)
+        method = self.name("method", getattr(serializer, field.method_name))
+        self.emit(depth, f"{target}[{repr(field.field_name)}] = {method}({self.stand_in(tree, model, prefix)})")
+
+    def stand_in(self, tree, model, prefix):
+        """
+        Expression building the object a method field receives, with the attributes in tree.
+        """
+        attributes = []
+        for attr, children in tree.items():
+            model_field, name, related = resolve(model, attr)
+            if children is None:
+                if related is not None:
+                    raise NotCompilable(f"{attr} would be a related object.")
+                attributes.append(f"{attr}={self.column(prefix + name)}")
+                continue
+            if related is None or model_field.auto_created:
+                raise NotCompilable(f"{attr} is not a forward relation.")
+            self.relation(prefix + name, model_field, related)
+            inner = self.stand_in(children, related, prefix + name + "__")
+            if model_field.null:
+                inner = f"(None if {self.column(prefix + name)} is None else {inner})"
+            attributes.append(f"{attr}={inner}")
+        return f"Namespace({', '.join(attributes)})"
@@ -0,0 +1,140 @@
+"""
+Denormalized counters on Course and Assignment.
+
+Course.enrollment_count and assignment_count, and Assignment.submission_count,
+graded_count, scored_count and score_sum, are kept in step with F() increments
+so concurrent writers never lose an update: model signals (core.signals) cover
+single-row saves and deletes, including cascades, and bulk write paths call
+add_counts() with their own deltas. Every grade write reads the scores its
+deltas start from with lock_grade_targets(), in the transaction of the write,
+so two writers of the same grade are serialized instead of both counting it. The reconcile_counters command recomputes
+every counter from the source tables and reports drift.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Sum, Value, When
+from django.db.models import DecimalField
+
+
+def add_counts(model, deltas):
+    """
+    Apply {pk: {field: delta}} to rows of model with F() increments, in one UPDATE.
+    """
+    deltas = {pk: fields for pk, fields in deltas.items() if pk is not None and any(fields.values())}
+    if not deltas:
+        return
+    changes = {}
+    for field in {field for fields in deltas.values() for field in fields}:
+        output_field = model._meta.get_field(field)
+        changes[field] = F(field) + Case(
+            *(When(pk=pk, then=Value(fields[field])) for pk, fields in deltas.items() if fields.get(field)),
+            default=Value(0),
+            output_field=output_field,
+        )
+    model.objects.filter(pk__in=deltas).update(**changes)
+
+
+def lock_grade_targets(submission_ids):
+    """
+    Lock the given submissions (SELECT ... FOR UPDATE, in pk order) and return
+    {submission_id: (assignment_id, grade_id, score, graded_at)} of their current
+    grades, None when ungraded. Must run inside the transaction of the grade write.
+    """
+    from assignments.models import Submission
+
+    return {
+        pk: rest
+        for pk, *rest in Submission.objects.select_for_update(of=("self",)).filter(
+            pk__in=submission_ids
+        ).order_by("pk").values_list(
+            "pk", "assignment_id", "grade_record__id", "grade_record__score", "grade_record__graded_at"
+        )
+    }
+
+
+def grade_deltas(assignment_id, old_score, new_score, created=False, deleted=False):
+    """
+    Counter deltas on the grade's assignment for one grade write; scores are None when unset.
+    """
+    if deleted:
+        return {assignment_id: {
+            "graded_count": -1,
+            "scored_count": -(old_score is not None),
+            "score_sum": -(old_score or 0),
+        }}
+    return {assignment_id: {
+        "graded_count": int(created),
+        "scored_count": (new_score is not None) - (not created and old_score is not None),
+        "score_sum": Decimal(new_score or 0) - Decimal(old_score or 0),
+    }}
+
+
+def merge_deltas(*many):
+    """
+    Sum several {pk: {field: delta}} mappings.
+    """
+    merged = defaultdict(lambda: defaultdict(int))
+    for deltas in many:
+        for pk, fields in deltas.items():
+            for field, delta in fields.items():
+                merged[pk][field] += delta
+    return {pk: dict(fields) for pk, fields in merged.items()}
+
+
+def _subquery_count(queryset, group_field, aggregate, output_field):
+    # Imported lazily so historical models can be passed in from migrations
+    from analytics.stats import subquery_aggregate
+
+    return subquery_aggregate(queryset.filter(**{group_field: OuterRef("pk")}), group_field, aggregate, output_field)
+
+
+def course_count_expressions(enrollment_model, assignment_model):
+    """
+    {counter: expression recomputing it from the source tables} for a Course queryset.
+    Model classes are parameters so migrations can pass their historical models.
+    """
+    return {
+        "enrollment_count": _subquery_count(enrollment_model.objects, "course", Count("pk"), IntegerField()),
+        "assignment_count": _subquery_count(assignment_model.objects, "course", Count("pk"), IntegerField()),
+    }
+
+
+def assignment_count_expressions(submission_model, grade_model):
+    """
+    {counter: expression recomputing it from the source tables} for an Assignment queryset.
+    """
+    grades = grade_model.objects
+    return {
+        "submission_count": _subquery_count(submission_model.objects, "assignment", Count("pk"), IntegerField()),
+        "graded_count": _subquery_count(grades, "submission__assignment", Count("pk"), IntegerField()),
+        "scored_count": _subquery_count(grades, "submission__assignment", Count("score"), IntegerField()),
+        "score_sum": _subquery_count(
+            grades, "submission__assignment", Sum("score"), DecimalField(max_digits=12, decimal_places=2)
+        ),
+    }
+
+
+def find_drift(queryset, expressions):
+    """
+    Rows of queryset whose stored counters differ from the recomputed ones:
+    {pk: {"stored": {...}, "actual": {...}}}, in one query.
+    """
+    fields = list(expressions)
+    rows = queryset.order_by().annotate(
+        **{f"actual_{field}": expression for field, expression in expressions.items()}
+    ).values_list("pk", *fields, *(f"actual_{field}" for field in fields))
+    drift = {}
+    for pk, *values in rows:
+        stored = dict(zip(fields, values[:len(fields)]))
+        actual = dict(zip(fields, values[len(fields):]))
+        if stored != actual:
+            drift[pk] = {"stored": stored, "actual": actual}
+    return drift
+
+
+def recount(queryset, expressions):
+    """
+    Overwrite the counters of every row of queryset from the source tables, in one UPDATE.
+    """
+    return queryset.update(**expressions)
@@ -0,0 +1,74 @@
+import time
+
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import CustomUser
+from core.renderers import FastJSONRenderer, orjson
+from dashboard.views import AdminDashboardView, InstructorDashboardView, StudentDashboardView
+
+DASHBOARDS = (
+    ("student", StudentDashboardView),
+    ("instructor", InstructorDashboardView),
+    ("admin", AdminDashboardView),
+)
+
+
+class Command(BaseCommand):
+    """
+    Compare DRF's stdlib JSONRenderer with FastJSONRenderer on real dashboard payloads.
+    """
+    help = "Benchmark the stdlib and orjson JSON renderers on the dashboard payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=50, help="Renders per payload and renderer.")
+        parser.add_argument("--page-size", type=int, default=500, help="Rows per included dashboard section.")
+        for role, _ in DASHBOARDS:
+            parser.add_argument(f"--{role}", help=f"Email of the {role} to render the dashboard for.")
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stderr.write("orjson is not installed; FastJSONRenderer will use the stdlib encoder.")
+
+        factory = APIRequestFactory()
+        rows = []
+        for role, view_class in DASHBOARDS:
+            users = CustomUser.objects.filter(role=role)
+            if options[role]:
+                users = users.filter(email=options[role])
+            user = users.order_by("pk").first()
+            if user is None:
+                self.stdout.write(f"Skipping {role} dashboard: no {role} user found.")
+                continue
+
+            request = factory.get("/", {
+                "include": ",".join(view_class.sections),
+                "page_size": options["page_size"],
+            })
+            force_authenticate(request, user=user)
+            response = async_to_sync(view_class.as_view())(request)
+            if response.status_code != 200:
+                raise CommandError(f"{role} dashboard returned {response.status_code}: {response.data}")
+
+            stdlib = self.time_renderer(JSONRenderer(), response.data, options["iterations"])
+            fast = self.time_renderer(FastJSONRenderer(), response.data, options["iterations"])
+            if stdlib["output"] != fast["output"]:
+                raise CommandError(f"{role} dashboard renders differently with FastJSONRenderer.")
+            rows.append((role, len(stdlib["output"]), stdlib["ms"], fast["ms"]))
+
+        self.stdout.write(f"{'payload':<12}{'size KB':>10}{'stdlib ms':>12}{'fast ms':>10}{'speedup':>10}")
+        for role, size, stdlib_ms, fast_ms in rows:
+            speedup = stdlib_ms / fast_ms if fast_ms else float("inf")
+            self.stdout.write(
+                f"{role:<12}{size / 1024:>10.1f}{stdlib_ms:>12.3f}{fast_ms:>10.3f}{speedup:>9.1f}x"
+            )
+
+    def time_renderer(self, renderer, data, iterations):
+        output = renderer.render(data)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            renderer.render(data)
+        elapsed = time.perf_counter() - start
+        return {"output": output, "ms": elapsed / iterations * 1000}
@@ -0,0 +1,67 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIRequestFactory
+
+from assignments.models import Submission
+from assignments.serializers import SubmissionSerializer
+from core.compiled import compile_serializer
+from core.renderers import FastJSONRenderer
+from grades.models import Grade
+from grades.serializers import GradeSerializer
+
+PAYLOADS = (
+    ("grades", GradeSerializer, lambda: Grade.objects.select_related(
+        "submission__student", "submission__assignment", "instructor"
+    )),
+    ("submissions", SubmissionSerializer, lambda: Submission.objects.select_related("assignment", "student")),
+)
+
+
+class Command(BaseCommand):
+    """
+    Compare the DRF serializers with their compiled row-to-dict functions (core.compiled)
+    on the /api/grades/ and /api/submissions/ list payloads.
+    """
+    help = "Benchmark DRF list serialization against the compiled serializers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=5, help="Runs per payload and path.")
+        parser.add_argument("--limit", type=int, default=5000, help="Rows per payload.")
+
+    def handle(self, *args, **options):
+        context = {"request": APIRequestFactory().get("/"), "sparse": None}
+        renderer = FastJSONRenderer()
+        rows = []
+        for name, serializer_class, queryset in PAYLOADS:
+            queryset = queryset().order_by("pk")[:options["limit"]]
+            compiled = compile_serializer(serializer_class(context=context))
+
+            def drf():
+                return serializer_class(queryset.all(), many=True, context=context).data
+
+            def fast():
+                return compiled.serialize(queryset)
+
+            drf_result = self.time_path(drf, options["iterations"])
+            fast_result = self.time_path(fast, options["iterations"])
+            output = renderer.render(drf_result["data"])
+            if output != renderer.render(fast_result["data"]):
+                raise CommandError(f"{name} renders differently with the compiled serializer.")
+            rows.append((name, len(drf_result["data"]), drf_result["ms"], fast_result["ms"]))
+
+        self.stdout.write(f"{'payload':<14}{'rows':>8}{'drf ms':>12}{'compiled ms':>14}{'speedup':>10}")
+        for name, count, drf_ms, fast_ms in rows:
+            speedup = drf_ms / fast_ms if fast_ms else float("inf")
+            self.stdout.write(f"{name:<14}{count:>8}{drf_ms:>12.2f}{fast_ms:>14.2f}{speedup:>9.1f}x")
+
+    def time_path(self, function, iterations):
+        """
+        Best of iterations runs, query included.
+        """
+        data, timings = None, []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            data = function()
+            timings.append(time.perf_counter() - start)
+        return {"data": data, "ms": min(timings) * 1000}
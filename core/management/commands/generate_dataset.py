@@ -0,0 +1,240 @@
+import datetime
+import math
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.utils import timezone
+
+from accounts.models import CustomUser, Profile
+from assignments.models import Assignment, Submission
+from core.cache import invalidate_all
+from core.versions import bump_versions
+from courses.models import Course, Enrollment
+from enrollments.models import Enrollment as CourseEnrollment
+from grades.models import Grade
+
+# Volumes per preset; every value can be overridden on the command line
+PRESETS = {
+    "small": {"students": 1_000, "instructors": 20, "courses": 40, "assignments": 8, "enrollments": 4},
+    "medium": {"students": 20_000, "instructors": 200, "courses": 500, "assignments": 10, "enrollments": 5},
+    # ~100k students x 5 courses x 12 assignments x ~0.85 submit rate ≈ 5M submissions
+    "large": {"students": 100_000, "instructors": 500, "courses": 2_000, "assignments": 12, "enrollments": 5},
+}
+
+SUBJECTS = (
+    "Algebra", "Biology", "Chemistry", "Databases", "Economics", "French", "Geometry",
+    "History", "Literature", "Music", "Philosophy", "Physics", "Statistics", "Writing",
+)
+
+
+def letter_for(score):
+    for letter, floor in (("A", 90), ("B", 80), ("C", 70), ("D", 60)):
+        if score >= floor:
+            return letter
+    return "F"
+
+
+def zipf_weights(count, exponent=1.1):
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+def purge(queryset):
+    """
+    Delete the rows of queryset and, first, every row that cascades from them, with
+    one DELETE ... WHERE ... IN (subquery) per table and relation path. Unlike
+    QuerySet.delete() no row is loaded and no signal is sent, so the caller rebuilds
+    what the receivers maintain. SET_NULL relations are cleared with an UPDATE.
+    Returns the number of rows deleted.
+    """
+    deleted = 0
+    for relation in queryset.model._meta.get_fields(include_hidden=True):
+        if not relation.auto_created or relation.concrete or not (relation.one_to_many or relation.one_to_one):
+            continue
+        related = relation.related_model._base_manager.filter(**{f"{relation.field.name}__in": queryset})
+        if relation.on_delete is models.CASCADE:
+            deleted += purge(related)
+        elif relation.on_delete is models.SET_NULL:
+            related.update(**{relation.field.name: None})
+        elif relation.on_delete is not models.DO_NOTHING:
+            raise CommandError(f"Cannot purge {queryset.model._meta.label}: {relation.related_model._meta.label} "
+                               f"references it with on_delete={relation.on_delete.__name__}.")
+    return deleted + queryset._raw_delete(queryset.db)
+
+
+class Command(BaseCommand):
+    """
+    Bulk-load a synthetic LMS dataset with realistic skew.
+
+    Course popularity and instructor load follow a Zipf distribution, enrollments
+    per student are log-normal, every student has an engagement rate (share of
+    assignments submitted) and an ability around which their scores are drawn.
+    Rows are written with bulk_create in batches, one student chunk at a time,
+    so memory stays flat at any volume. All generated users share one email
+    domain (--domain) and one password, which the loadtest command logs in with.
+    --clear removes the previous run with set-based DELETEs (see purge()).
+    """
+    help = "Bulk-generate synthetic students, courses, enrollments, submissions and grades."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+        parser.add_argument("--students", type=int, help="Number of students.")
+        parser.add_argument("--instructors", type=int, help="Number of instructors.")
+        parser.add_argument("--courses", type=int, help="Number of courses.")
+        parser.add_argument("--assignments", type=int, help="Mean assignments per course.")
+        parser.add_argument("--enrollments", type=int, help="Mean courses per student.")
+        parser.add_argument("--grade-rate", type=float, default=0.9, help="Share of submissions that get graded.")
+        parser.add_argument("--admins", type=int, default=2, help="Number of admin users.")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per INSERT.")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Students generated per transaction.")
+        parser.add_argument("--domain", default="synthetic.lms", help="Email domain of generated users.")
+        parser.add_argument("--password", default="loadtest123", help="Password of every generated user.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--clear", action="store_true", help="Delete previously generated data first.")
+
+    def handle(self, *args, **options):
+        volumes = {key: options[key] or value for key, value in PRESETS[options["preset"]].items()}
+        if volumes["courses"] < 1 or volumes["instructors"] < 1:
+            raise CommandError("At least one course and one instructor are required.")
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.domain = options["domain"]
+        self.password = make_password(options["password"])
+        started = time.perf_counter()
+
+        if options["clear"]:
+            with transaction.atomic():
+                deleted = purge(CustomUser.objects.filter(email__endswith=f"@{self.domain}"))
+            self.stdout.write(f"Deleted {deleted} previously generated rows.")
+        elif CustomUser.objects.filter(email__endswith=f"@{self.domain}").exists():
+            raise CommandError(f"Users @{self.domain} already exist; pass --clear to regenerate.")
+
+        with transaction.atomic():
+            self.create_users("admin", options["admins"], is_staff=True)
+            instructors = self.create_users("instructor", volumes["instructors"])
+            courses = self.create_courses(instructors, volumes["courses"])
+            assignments = self.create_assignments(courses, volumes["assignments"])
+
+        totals = {"students": 0, "enrollments": 0, "submissions": 0, "grades": 0}
+        course_weights = zipf_weights(len(courses))
+        for start in range(0, volumes["students"], options["chunk_size"]):
+            count = min(options["chunk_size"], volumes["students"] - start)
+            with transaction.atomic():
+                students = self.create_users("student", count, offset=start)
+                chunk = self.create_activity(
+                    students, courses, course_weights, assignments, volumes["enrollments"], options["grade_rate"]
+                )
+            totals["students"] += count
+            for key, value in chunk.items():
+                totals[key] += value
+            self.stdout.write(
+                f"  {totals['students']}/{volumes['students']} students, "
+                f"{totals['submissions']} submissions, {totals['grades']} grades"
+            )
+
+        # bulk_create and purge() skip model signals: bump versions, drop cached responses, rebuild
+        # summaries, counters and the search index
+        bump_versions(CustomUser, Course, Enrollment, Assignment, Submission, Grade)
+        invalidate_all()
+        call_command("rebuild_student_summaries", stdout=self.stdout)
+        call_command("reconcile_counters", stdout=self.stdout)
+        call_command("rebuild_search_index", stdout=self.stdout)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {len(instructors)} instructors, {len(courses)} courses, "
+            f"{sum(len(ids) for ids in assignments.values())} assignments, {totals['students']} students, "
+            f"{totals['enrollments']} enrollments, {totals['submissions']} submissions and "
+            f"{totals['grades']} grades in {time.perf_counter() - started:.1f}s."
+        ))
+
+    def create_users(self, role, count, offset=0, is_staff=False):
+        users = CustomUser.objects.bulk_create(
+            [
+                CustomUser(
+                    email=f"{role}{offset + i}@{self.domain}",
+                    username=f"{role}{offset + i}",
+                    role=role,
+                    is_staff=is_staff,
+                    password=self.password,
+                )
+                for i in range(count)
+            ],
+            batch_size=self.batch_size,
+        )
+        Profile.objects.bulk_create([Profile(user=user) for user in users], batch_size=self.batch_size)
+        return users
+
+    def create_courses(self, instructors, count):
+        # A few instructors teach many courses, most teach one or two
+        owners = self.rng.choices(instructors, weights=zipf_weights(len(instructors)), k=count)
+        return Course.objects.bulk_create(
+            [
+                Course(
+                    title=f"{SUBJECTS[i % len(SUBJECTS)]} {100 + i // len(SUBJECTS)} ({self.domain})",
+                    description=f"Synthetic course #{i}",
+                    instructor=owner,
+                )
+                for i, owner in enumerate(owners)
+            ],
+            batch_size=self.batch_size,
+        )
+
+    def create_assignments(self, courses, mean):
+        now = timezone.now()
+        rows = []
+        for course in courses:
+            for n in range(max(1, round(self.rng.gauss(mean, mean / 3)))):
+                rows.append(Assignment(
+                    course=course,
+                    title=f"Assignment {n + 1}",
+                    due_date=now + datetime.timedelta(days=self.rng.randint(-90, 60)),
+                    created_by_id=course.instructor_id,
+                ))
+        assignments = {}
+        for assignment in Assignment.objects.bulk_create(rows, batch_size=self.batch_size):
+            assignments.setdefault(assignment.course_id, []).append(assignment.pk)
+        return assignments
+
+    def create_activity(self, students, courses, course_weights, assignments, mean_enrollments, grade_rate):
+        instructor_of = {course.pk: course.instructor_id for course in courses}
+        enrollments, submissions, scores = [], [], []
+        for student in students:
+            wanted = min(len(courses), max(1, round(self.rng.lognormvariate(math.log(mean_enrollments), 0.5))))
+            picked = set()
+            while len(picked) < wanted:
+                picked.update(c.pk for c in self.rng.choices(courses, weights=course_weights, k=wanted - len(picked)))
+            engagement = self.rng.betavariate(6, 1.2)
+            ability = self.rng.gauss(76, 9)
+            for course_id in sorted(picked):
+                enrollments.append((student.pk, course_id))
+                for assignment_id in assignments.get(course_id, ()):
+                    if self.rng.random() >= engagement:
+                        continue
+                    graded = self.rng.random() < grade_rate
+                    score = Decimal(str(round(min(100.0, max(0.0, self.rng.gauss(ability, 8))), 2))) if graded else None
+                    submissions.append(Submission(
+                        assignment_id=assignment_id,
+                        student_id=student.pk,
+                        content="Synthetic submission",
+                        grade=score,
+                    ))
+                    scores.append((score, instructor_of[course_id]))
+
+        Enrollment.objects.bulk_create(
+            [Enrollment(student_id=s, course_id=c) for s, c in enrollments], batch_size=self.batch_size
+        )
+        CourseEnrollment.objects.bulk_create(
+            [CourseEnrollment(student_id=s, course_id=c) for s, c in enrollments], batch_size=self.batch_size
+        )
+        created = Submission.objects.bulk_create(submissions, batch_size=self.batch_size)
+        grades = [
+            Grade(submission_id=submission.pk, instructor_id=instructor_id, score=score, letter=letter_for(score))
+            for submission, (score, instructor_id) in zip(created, scores)
+            if score is not None
+        ]
+        Grade.objects.bulk_create(grades, batch_size=self.batch_size)
+        return {"enrollments": len(enrollments), "submissions": len(created), "grades": len(grades)}
@@ -0,0 +1,158 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import CustomUser
+
+# (endpoint path, role whose token is used)
+ENDPOINTS = (
+    ("/dashboard/student/", "student"),
+    ("/dashboard/instructor/", "instructor"),
+    ("/dashboard/admin/", "admin"),
+    ("/analytics/", "student"),
+    ("/analytics/student/", "student"),
+    ("/analytics/instructor/", "instructor"),
+    ("/analytics/admin/", "admin"),
+    ("/api/courses/", "student"),
+    ("/api/enrollments/", "instructor"),
+    ("/api/assignments/", "student"),
+    ("/api/submissions/", "student"),
+    ("/api/grades/", "student"),
+    ("/api/grades/", "instructor"),
+)
+
+
+def percentile(samples, pct):
+    """
+    Nearest-rank percentile of an unsorted list of numbers.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+class Command(BaseCommand):
+    """
+    Drive the dashboard, analytics and list endpoints of a running server under
+    concurrency and report latency percentiles and throughput per endpoint.
+
+    Users are sampled from the synthetic dataset (see generate_dataset) and log in
+    through /accounts/login/ once; every request then uses a random user of the
+    endpoint's role, so per-user caches see a realistic hit rate. Requests that
+    time out or lose their connection are reported as errors with status 0.
+    """
+    help = "HTTP load test of the dashboard, analytics and list endpoints with p50/p95/p99 reporting."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Server under test.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients per endpoint.")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint.")
+        parser.add_argument("--users", type=int, default=20, help="Users logged in per role.")
+        parser.add_argument("--domain", default="synthetic.lms", help="Email domain of the generated users.")
+        parser.add_argument("--password", default="loadtest123", help="Password of the generated users.")
+        parser.add_argument("--endpoint", action="append", help="Only test paths containing this string.")
+        parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+
+    def handle(self, *args, **options):
+        self.base_url = options["base_url"].rstrip("/")
+        self.timeout = options["timeout"]
+        self.rng = random.Random(options["seed"])
+        self.rng_lock = threading.Lock()
+
+        endpoints = [
+            (path, role) for path, role in ENDPOINTS
+            if not options["endpoint"] or any(part in path for part in options["endpoint"])
+        ]
+        tokens = {
+            role: self.login(role, options["users"], options["domain"], options["password"])
+            for role in {role for _, role in endpoints}
+        }
+
+        rows = []
+        for path, role in endpoints:
+            rows.append(self.run_endpoint(path, role, tokens[role], options["requests"], options["concurrency"]))
+
+        if options["json"]:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+        self.stdout.write(
+            f"{'endpoint':<26}{'role':<12}{'reqs':>6}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}"
+        )
+        for row in rows:
+            self.stdout.write(
+                f"{row['endpoint']:<26}{row['role']:<12}{row['requests']:>6}{row['errors']:>8}"
+                f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['throughput']:>10.1f}"
+            )
+
+    def login(self, role, count, domain, password):
+        emails = list(
+            CustomUser.objects.filter(role=role, email__endswith=f"@{domain}")
+            .order_by("pk").values_list("email", flat=True)[:count]
+        )
+        if not emails:
+            raise CommandError(f"No {role} users @{domain}; run generate_dataset first.")
+        tokens = []
+        for email in emails:
+            status, body = self.request("POST", "/accounts/login/", body={"email": email, "password": password})
+            if status == 0:
+                raise CommandError(f"Cannot reach {self.base_url}: {body.decode()}")
+            if status != 200:
+                raise CommandError(f"Login failed for {email}: HTTP {status}")
+            tokens.append(json.loads(body)["access"])
+        return tokens
+
+    def request(self, method, path, token=None, body=None):
+        """
+        (status, body) of one request; status 0 and the reason as body when no response arrived.
+        """
+        headers = {"Accept": "application/json"}
+        data = None
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+            data = json.dumps(body).encode()
+        try:
+            with urlopen(Request(self.base_url + path, data=data, headers=headers, method=method),
+                         timeout=self.timeout) as response:
+                return response.status, response.read()
+        except HTTPError as e:
+            return e.code, e.read()
+        except OSError as e:
+            # Timeouts and refused or reset connections (URLError included) are expected under load
+            return 0, str(getattr(e, "reason", e)).encode()
+
+    def run_endpoint(self, path, role, tokens, total, concurrency):
+        def one(_):
+            with self.rng_lock:
+                token = self.rng.choice(tokens)
+            start = time.perf_counter()
+            status, _ = self.request("GET", path, token=token)
+            return (time.perf_counter() - start) * 1000, status
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(one, range(total)))
+        elapsed = time.perf_counter() - started
+
+        latencies = [ms for ms, _ in results]
+        return {
+            "endpoint": path,
+            "role": role,
+            "requests": total,
+            "errors": sum(1 for _, status in results if status == 0 or status >= 400),
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "throughput": total / elapsed if elapsed else 0.0,
+        }
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import search
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the search documents of every course, module and assignment (see core.search).
+    Needed after writes that bypass model signals, such as bulk_create.
+    """
+    help = "Rebuild the full-text search index from courses, modules and assignments."
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {total} documents in {time.perf_counter() - started:.1f}s."
+        ))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from assignments.models import Assignment, Submission
+from core.counters import assignment_count_expressions, course_count_expressions, find_drift, recount
+from courses.models import Course, Enrollment
+from grades.models import Grade
+
+
+class Command(BaseCommand):
+    """
+    Recompute the denormalized Course and Assignment counters and report drift.
+    """
+    help = "Recompute course and assignment counters from the source tables and report any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report drift, do not rewrite the counters.",
+        )
+
+    def handle(self, *args, **options):
+        targets = (
+            (Course, course_count_expressions(Enrollment, Assignment)),
+            (Assignment, assignment_count_expressions(Submission, Grade)),
+        )
+        for model, expressions in targets:
+            name = model._meta.verbose_name_plural.lower()
+            drift = find_drift(model.objects.all(), expressions)
+            for pk, values in drift.items():
+                self.stdout.write(f"Drift for {model._meta.verbose_name.lower()} #{pk}: "
+                                  f"stored={values['stored']} actual={values['actual']}")
+            self.stdout.write(f"{model.objects.count()} {name} checked: {len(drift)} drifted.")
+
+            if drift and not options["check"]:
+                with transaction.atomic():
+                    fixed = recount(model.objects.filter(pk__in=drift), expressions)
+                self.stdout.write(self.style.SUCCESS(f"Reconciled {fixed} {name}."))
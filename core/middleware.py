@@ -0,0 +1,249 @@
+import json
+import logging
+import os
+import threading
+import time
+import traceback
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+from . import replicas
+
+logger = logging.getLogger("lms.profiler")
+
+_current_profile = ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    """
+    Query count, SQL time, serializer time and render time collected for one request.
+    With detect_duplicates, identical SQL statements are counted and the project
+    stack frames of their first repetition are kept.
+
+    Queries and serializers that run on core.parallel.gather threads are recorded
+    too, so SQL and serializer times are summed over threads and can exceed the
+    request's wall time.
+    """
+
+    def __init__(self, detect_duplicates=False):
+        self.detect_duplicates = detect_duplicates
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.serializer_ms = 0.0
+        self.render_ms = 0.0
+        self.total_ms = 0.0
+        self.statements = {}
+        self._lock = threading.Lock()
+        self._threads = threading.local()  # nesting depth of serializer .data calls
+        self._render_start = None
+
+    @property
+    def _serializer_depth(self):
+        return getattr(self._threads, "serializer_depth", 0)
+
+    @_serializer_depth.setter
+    def _serializer_depth(self, depth):
+        self._threads.serializer_depth = depth
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            with self._lock:
+                self.queries += 1
+                self.sql_ms += (time.perf_counter() - start) * 1000
+                if self.detect_duplicates:
+                    self.track_statement(sql)
+
+    def add_serializer_time(self, ms):
+        with self._lock:
+            self.serializer_ms += ms
+
+    def track_statement(self, sql):
+        entry = self.statements.setdefault(sql, {"count": 0, "stack": None})
+        entry["count"] += 1
+        if entry["count"] == 2:
+            entry["stack"] = project_stack()
+
+    def duplicates(self, threshold):
+        return [
+            {"sql": sql, "count": entry["count"], "stack": entry["stack"]}
+            for sql, entry in self.statements.items()
+            if entry["count"] >= threshold
+        ]
+
+    def server_timing(self):
+        return ", ".join([
+            f'db;dur={self.sql_ms:.1f};desc="{self.queries} queries"',
+            f"serializer;dur={self.serializer_ms:.1f}",
+            f"render;dur={self.render_ms:.1f}",
+            f"total;dur={self.total_ms:.1f}",
+        ])
+
+    def as_dict(self):
+        return {
+            "queries": self.queries,
+            "sql_ms": round(self.sql_ms, 2),
+            "serializer_ms": round(self.serializer_ms, 2),
+            "render_ms": round(self.render_ms, 2),
+            "total_ms": round(self.total_ms, 2),
+        }
+
+
+def project_stack():
+    """
+    Stack frames that belong to this project (views, serializers, stats...), innermost last.
+    """
+    root = str(settings.BASE_DIR)
+    frames = []
+    for frame in traceback.extract_stack():
+        filename = os.path.abspath(frame.filename)
+        if not filename.startswith(root) or "site-packages" in filename or filename == os.path.abspath(__file__):
+            continue
+        frames.append(f"{os.path.relpath(filename, root)}:{frame.lineno} in {frame.name}")
+    return frames
+
+
+@contextmanager
+def profiled_connections():
+    """
+    Record the queries of this thread's connections in the current request
+    profile, if any. The profile is a context variable, which threads started
+    with a copy of the request's context (core.parallel) see as well.
+    """
+    profile = _current_profile.get()
+    with ExitStack() as stack:
+        if profile is not None:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile.record_query))
+        yield profile
+
+
+@contextmanager
+def serializer_timing():
+    """
+    Add the time spent in the block to the current request profile's serializer
+    time. Nested blocks are counted once.
+    """
+    profile = _current_profile.get()
+    if profile is None or profile._serializer_depth:
+        yield
+        return
+    profile._serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile._serializer_depth -= 1
+        profile.add_serializer_time((time.perf_counter() - start) * 1000)
+
+
+def instrument_serializers():
+    """
+    Time BaseSerializer.data, which Serializer.data and ListSerializer.data both go
+    through, with serializer_timing(). Idempotent.
+    """
+    prop = BaseSerializer.data
+    if getattr(prop.fget, "profiled", False):
+        return
+    fget = prop.fget
+
+    def data(self):
+        with serializer_timing():
+            return fget(self)
+
+    data.profiled = True
+    BaseSerializer.data = property(data)
+
+
+class QueryProfilerMiddleware:
+    """
+    Records query count, SQL time, serializer time and render time for every request.
+
+    The figures are sent back in a Server-Timing header and logged as one JSON
+    line on the "lms.profiler" logger. With QUERY_PROFILER_DUPLICATES enabled,
+    SQL statements executed QUERY_PROFILER_DUPLICATE_THRESHOLD times or more in
+    one request (usually an N+1 pattern) are logged as warnings, together with
+    the project frames (view, serializer...) that issued them.
+    Streaming responses are measured up to the point the response is returned.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_PROFILER_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.detect_duplicates = getattr(settings, "QUERY_PROFILER_DUPLICATES", False)
+        self.duplicate_threshold = getattr(settings, "QUERY_PROFILER_DUPLICATE_THRESHOLD", 3)
+        instrument_serializers()
+
+    def __call__(self, request):
+        profile = RequestProfile(detect_duplicates=self.detect_duplicates)
+        token = _current_profile.set(profile)
+        start = time.perf_counter()
+        try:
+            with profiled_connections():
+                response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        profile.total_ms = (time.perf_counter() - start) * 1000
+
+        response["Server-Timing"] = profile.server_timing()
+        logger.info(json.dumps({
+            "event": "request_profile",
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            **profile.as_dict(),
+        }))
+        if self.detect_duplicates:
+            for duplicate in profile.duplicates(self.duplicate_threshold):
+                logger.warning(json.dumps({
+                    "event": "duplicate_query",
+                    "method": request.method,
+                    "path": request.path,
+                    **duplicate,
+                }))
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered right after this hook; time it up to the post-render callback
+        profile = _current_profile.get()
+        if profile is not None:
+            profile._render_start = time.perf_counter()
+            response.add_post_render_callback(lambda rendered: self.finish_render(profile))
+        return response
+
+    @staticmethod
+    def finish_render(profile):
+        if profile._render_start is not None:
+            profile.render_ms += (time.perf_counter() - profile._render_start) * 1000
+            profile._render_start = None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Request scope for core.replicas: views that opt in read from a replica for
+    the rest of the request, and a user whose request wrote to the database
+    reads from the primary for the next REPLICA_STICKY_SECONDS.
+    """
+
+    def __init__(self, get_response):
+        if not replicas.replicas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state, token = replicas.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            replicas.end_request(token)
+        if state.wrote:
+            replicas.mark_sticky(getattr(request, "user", None))
+        return response
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.27 on 2026-10-17 06:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TableVersion',
+            fields=[
+                ('name', models.CharField(help_text='Model label, e.g. grades.grade', max_length=100, primary_key=True, serialize=False)),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Table Version',
+                'verbose_name_plural': 'Table Versions',
+            },
+        ),
+    ]
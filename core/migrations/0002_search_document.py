@@ -0,0 +1,89 @@
+# Generated by Django 4.2.27 on 2026-10-17 08:35
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.utils import OperationalError
+
+from core import search
+
+FTS_SETUP = [
+    f"CREATE VIRTUAL TABLE {search.FTS_TABLE} USING fts5(title, body, content='core_searchdocument', "
+    "content_rowid='id', tokenize='porter unicode61')",
+    f"CREATE TRIGGER core_searchdocument_ai AFTER INSERT ON core_searchdocument BEGIN "
+    f"INSERT INTO {search.FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    f"CREATE TRIGGER core_searchdocument_ad AFTER DELETE ON core_searchdocument BEGIN "
+    f"INSERT INTO {search.FTS_TABLE}({search.FTS_TABLE}, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); END",
+    f"CREATE TRIGGER core_searchdocument_au AFTER UPDATE ON core_searchdocument BEGIN "
+    f"INSERT INTO {search.FTS_TABLE}({search.FTS_TABLE}, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    f"INSERT INTO {search.FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+FTS_TEARDOWN = [
+    "DROP TRIGGER IF EXISTS core_searchdocument_ai",
+    "DROP TRIGGER IF EXISTS core_searchdocument_ad",
+    "DROP TRIGGER IF EXISTS core_searchdocument_au",
+    f"DROP TABLE IF EXISTS {search.FTS_TABLE}",
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("CREATE INDEX core_searchdocument_vector_gin ON core_searchdocument USING gin (vector)")
+    elif vendor == "sqlite":
+        try:
+            for statement in FTS_SETUP:
+                schema_editor.execute(statement)
+        except OperationalError:
+            # SQLite built without FTS5: core.search falls back to icontains
+            for statement in FTS_TEARDOWN:
+                schema_editor.execute(statement)
+    search.rebuild(
+        apps.get_model("core", "SearchDocument"),
+        (apps.get_model("courses", "Course"), apps.get_model("courses", "Module"),
+         apps.get_model("assignments", "Assignment")),
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS core_searchdocument_vector_gin")
+    elif vendor == "sqlite":
+        for statement in FTS_TEARDOWN:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0002_assignment_counters'),
+        ('courses', '0002_course_counters'),
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('course', 'Course'), ('module', 'Module'), ('assignment', 'Assignment')], max_length=20)),
+                ('object_id', models.BigIntegerField(help_text='Primary key of the course, module or assignment')),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField(blank=True, default='')),
+                ('vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('course', models.ForeignKey(help_text='Course the document belongs to, for role scoping', on_delete=django.db.models.deletion.CASCADE, related_name='+', to='courses.course')),
+            ],
+            options={
+                'verbose_name': 'Search Document',
+                'verbose_name_plural': 'Search Documents',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_document'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
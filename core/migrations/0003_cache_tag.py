@@ -0,0 +1,24 @@
+# Generated by Django 4.2.27 on 2026-10-17 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_search_document'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CacheTag',
+            fields=[
+                ('name', models.CharField(help_text='Tag, e.g. "course:12"', max_length=100, primary_key=True, serialize=False)),
+                ('token', models.CharField(max_length=32)),
+            ],
+            options={
+                'verbose_name': 'Cache Tag',
+                'verbose_name_plural': 'Cache Tags',
+            },
+        ),
+    ]
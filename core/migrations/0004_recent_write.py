@@ -0,0 +1,27 @@
+# Generated by Django 4.2.27 on 2026-10-17 10:39
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('core', '0003_cache_tag'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecentWrite',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('written_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Recent Write',
+                'verbose_name_plural': 'Recent Writes',
+            },
+        ),
+    ]
@@ -0,0 +1,239 @@
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from . import cache
+from .compiled import NotCompilable, compile_serializer
+from .middleware import serializer_timing
+from .sparse import SparseSpec, parse_paths, prune_queryset
+from .renderers import FastJSONRenderer
+from .versions import compute_etag
+
+
+class StreamingListMixin:
+    """
+    Adds an opt-in streaming mode to a ModelViewSet's list action.
+
+    With ?stream=true the queryset is walked with a server-side cursor
+    (.iterator(chunk_size=...)) and the JSON array is written out one chunk
+    of rows at a time through a StreamingHttpResponse, so memory stays bounded
+    by stream_chunk_size instead of the size of the table.
+    Without the parameter the regular list() response is returned.
+    """
+    stream_query_param = "stream"
+    stream_chunk_size = 500
+    stream_renderer_class = FastJSONRenderer
+
+    def wants_stream(self, request):
+        return request.query_params.get(self.stream_query_param, "").lower() in ("1", "true", "yes")
+
+    def list(self, request, *args, **kwargs):
+        if not self.wants_stream(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # A single child serializer is reused for every row
+        serializer = self.get_serializer(many=True).child
+        return StreamingHttpResponse(
+            self.stream_json_array(queryset, serializer),
+            content_type="application/json",
+        )
+
+    def stream_json_array(self, queryset, serializer):
+        """
+        Yield a JSON array as bytes, rendering stream_chunk_size rows per chunk.
+        """
+        renderer = self.stream_renderer_class()
+        yield b"["
+        first = True
+        batch = []
+        for instance in queryset.iterator(chunk_size=self.stream_chunk_size):
+            batch.append(serializer.to_representation(instance))
+            if len(batch) >= self.stream_chunk_size:
+                yield (b"" if first else b",") + renderer.render(batch)[1:-1]
+                first = False
+                batch = []
+        if batch:
+            yield (b"" if first else b",") + renderer.render(batch)[1:-1]
+        yield b"]"
+
+
+class CompiledListMixin:
+    """
+    Serves the list action from queryset.values_list() rows through the
+    serializer compiled by core.compiled, instead of building a model instance
+    and calling to_representation() per row. The JSON is identical.
+
+    Applies to paginated, plain and StreamingListMixin's ?stream=true lists;
+    serializers that cannot be compiled are served the regular way. The
+    conversion counts as serializer time in the request profile.
+    """
+
+    def get_compiled_serializer(self, serializer):
+        try:
+            return compile_serializer(serializer)
+        except NotCompilable:
+            return None
+
+    def list(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer(self.get_serializer(many=True).child)
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = compiled.rows(self.filter_queryset(self.get_queryset()))
+        if isinstance(self, StreamingListMixin) and self.wants_stream(request):
+            return StreamingHttpResponse(self.stream_json_array(rows, compiled), content_type="application/json")
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.compiled_data(compiled, page))
+        return Response(self.compiled_data(compiled, list(rows)))
+
+    def compiled_data(self, compiled, rows):
+        # rows are fetched already: the query counts as db time, the conversion as serializer time
+        with serializer_timing():
+            return compiled.to_list(rows)
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+    default_detail = "Not modified."
+    default_code = "not_modified"
+
+
+class ConditionalGetMixin:
+    """
+    Answers GET/HEAD with 304 Not Modified when the client's If-None-Match
+    matches the current ETag.
+
+    The ETag is derived from the change counters of etag_models (see
+    core.versions), the user id and the full request path. It is checked
+    right after authentication, before any queryset is evaluated.
+    """
+    etag_models = ()
+
+    def get_etag(self, request):
+        return compute_etag(self.etag_models, request.user.pk, request.get_full_path())
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = None
+        if request.method not in ("GET", "HEAD") or not self.etag_models:
+            return
+        self.etag = self.get_etag(request)
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            candidates = {tag.removeprefix("W/") for tag in parse_etags(if_none_match)}
+            if "*" in candidates or self.etag in candidates:
+                raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, "etag", None)
+        if etag and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response["ETag"] = etag
+            patch_vary_headers(response, ["Authorization"])
+        return response
+
+
+class CacheHit(Exception):
+    def __init__(self, data):
+        self.data = data
+
+
+class TaggedCacheMixin:
+    """
+    Serves GET responses of cache_actions from the tag-invalidated cache in core.cache.
+
+    Entries are keyed by view, action, path, user and query parameters, and tagged
+    with core.cache.scope_tags() for the requesting user: their own student or
+    instructor tag plus one tag per course they can see, or the table tags of
+    cache_models for admins. Model signals invalidate exactly those tags on write.
+    The lookup runs after authentication and permission checks.
+    """
+    cache_actions = ("list", "retrieve")
+    cache_models = ()
+    cache_timeout = None
+
+    def get_cache_key(self, request):
+        user = request.user
+        return cache.make_key(
+            type(self).__name__,
+            getattr(self, "action", None),
+            request.path,
+            user.pk,
+            getattr(user, "role", None),
+            sorted(request.query_params.lists()),
+        )
+
+    def get_cache_tags(self, request):
+        return cache.scope_tags(request.user, self.cache_models)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.cache_entry = None
+        if (
+            request.method != "GET"
+            or getattr(self, "action", None) not in self.cache_actions
+            or not request.user.is_authenticated
+        ):
+            return
+        key = self.get_cache_key(request)
+        versions = cache.get_tag_versions(self.get_cache_tags(request))
+        data = cache.lookup(key, versions)
+        if data is not cache.MISS:
+            raise CacheHit(data)
+        self.cache_entry = (key, versions)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, CacheHit):
+            return Response(exc.data)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        entry = getattr(self, "cache_entry", None)
+        if entry and response.status_code == status.HTTP_200_OK and isinstance(response, Response):
+            key, versions = entry
+            cache.store(key, response.data, versions, self.cache_timeout)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class SparseFieldsMixin:
+    """
+    Adds ?fields= and ?expand= (see core.sparse) to a ModelViewSet's GET responses.
+
+    The parsed parameters reach the serializers through the "sparse" context entry,
+    and list and retrieve querysets are pruned to the columns and joins the
+    remaining fields read. Writes always use the full serializer.
+    """
+    fields_query_param = "fields"
+    expand_query_param = "expand"
+    sparse_actions = ("list", "retrieve")
+
+    def get_sparse_spec(self):
+        request = self.request
+        if request is None or request.method not in ("GET", "HEAD"):
+            return None
+        fields = request.query_params.get(self.fields_query_param, "")
+        expand = request.query_params.get(self.expand_query_param)
+        if not fields and expand is None:
+            return None
+        return SparseSpec(parse_paths(fields) if fields else None, parse_paths(expand) if expand is not None else None)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["sparse"] = self.get_sparse_spec()
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if getattr(self, "action", None) in self.sparse_actions and self.get_sparse_spec() is not None:
+            queryset = prune_queryset(queryset, self.get_serializer())
+        return queryset
@@ -20,3 +20,92 @@
 #
  #   def __str__(self):
   #      return f"{self.student} enrolled in {self.course}"
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class TableVersion(models.Model):
+    """
+    Monotonic change counter per model, bumped on every save and delete.
+    Views derive ETags from these counters to answer conditional GETs
+    without evaluating any queryset.
+    """
+    name = models.CharField(max_length=100, primary_key=True, help_text="Model label, e.g. grades.grade")
+    version = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Table Version"
+        verbose_name_plural = "Table Versions"
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+class CacheTag(models.Model):
+    """
+    Current token of a tag of the API response cache (core.cache). Kept in the
+    database so every process agrees on it and it changes in the same transaction
+    as the rows the tag covers.
+    """
+    name = models.CharField(max_length=100, primary_key=True, help_text='Tag, e.g. "course:12"')
+    token = models.CharField(max_length=32)
+
+    class Meta:
+        verbose_name = "Cache Tag"
+        verbose_name_plural = "Cache Tags"
+
+    def __str__(self):
+        return f"{self.name} {self.token}"
+
+
+class RecentWrite(models.Model):
+    """
+    When a user last wrote to the database. Their reads stay on the primary for
+    REPLICA_STICKY_SECONDS afterwards (core.replicas), whichever process serves them.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name="+",
+    )
+    written_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Recent Write"
+        verbose_name_plural = "Recent Writes"
+
+    def __str__(self):
+        return f"User #{self.user_id} wrote at {self.written_at}"
+
+
+class SearchDocument(models.Model):
+    """
+    Searchable text of one course, module or assignment, maintained by core.search.
+    vector is only filled on PostgreSQL; SQLite indexes the rows in an FTS5 table.
+    """
+    KIND_CHOICES = (
+        ("course", "Course"),
+        ("module", "Module"),
+        ("assignment", "Assignment"),
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField(help_text="Primary key of the course, module or assignment")
+    course = models.ForeignKey(
+        "courses.Course",
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text="Course the document belongs to, for role scoping"
+    )
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True, default="")
+    vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        verbose_name = "Search Document"
+        verbose_name_plural = "Search Documents"
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="unique_search_document")
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}: {self.title}"
@@ -0,0 +1,114 @@
+"""
+Concurrent database work for async views.
+
+gather() runs independent ORM calls at the same time, each on a thread of a
+bounded pool (ASYNC_QUERY_WORKERS threads per process). Django connections
+are per thread, so every call gets its own connection and the round trips
+overlap: a view's latency approaches its slowest query instead of the sum of
+all of them. After each call the worker's connection is closed once
+CONN_MAX_AGE is reached, as request_finished does for request threads.
+
+When the caller's connection is inside a transaction (ATOMIC_REQUESTS, tests)
+or ASYNC_CONCURRENT_QUERIES is off, the calls run one after another on the
+caller's thread instead, so they see its uncommitted writes.
+
+AsyncDispatchMixin lets a DRF APIView or ViewSet declare coroutine handlers
+(DRF's own dispatch is sync-only): authentication, permissions and the other
+initial() checks run on a thread, then the handler is awaited.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from .middleware import profiled_connections
+
+_lock = threading.Lock()
+_executor = None
+_executor_pid = None
+
+
+def get_executor():
+    """
+    This process's query thread pool, created on first use.
+    """
+    global _executor, _executor_pid
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "ASYNC_QUERY_WORKERS", 8), thread_name_prefix="db-gather",
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def in_transaction():
+    return any(connection.in_atomic_block for connection in connections.all(initialized_only=True))
+
+
+def isolated(call):
+    """
+    call, made to run on a pool thread: with a usable connection, released afterwards,
+    and its queries recorded in the request's profile (core.middleware).
+    """
+    def run():
+        close_old_connections()
+        try:
+            with profiled_connections():
+                return call()
+        finally:
+            close_old_connections()
+    return run
+
+
+async def gather(*calls):
+    """
+    Results of the zero-argument callables, in order. Each call must finish its
+    database work (return lists or dicts, not lazy querysets).
+    """
+    if not calls:
+        return []
+    if not getattr(settings, "ASYNC_CONCURRENT_QUERIES", True) or await sync_to_async(in_transaction)():
+        return [await sync_to_async(call)() for call in calls]
+    executor = get_executor()
+    return list(await asyncio.gather(*(
+        sync_to_async(isolated(call), thread_sensitive=False, executor=executor)() for call in calls
+    )))
+
+
+class AsyncDispatchMixin:
+    """
+    Dispatch for APIViews and ViewSets with coroutine handlers (async def get, ...).
+    Sync handlers keep working; they run on the request's thread.
+    """
+
+    @classmethod
+    def as_view(cls, *args, **kwargs):
+        return markcoroutinefunction(super().as_view(*args, **kwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            if asyncio.iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = await sync_to_async(self.handle_exception)(exc)
+
+        self.response = await sync_to_async(self.finalize_response)(request, response, *args, **kwargs)
+        return self.response
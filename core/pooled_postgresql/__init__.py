@@ -0,0 +1,3 @@
+"""
+PostgreSQL backend with a psycopg_pool connection pool (see base.py).
+"""
@@ -0,0 +1,191 @@
+"""
+PostgreSQL backend that checks connections out of a psycopg_pool pool.
+
+ENGINE "core.pooled_postgresql" with OPTIONS["pool"] set to the ConnectionPool
+arguments (min_size, max_size, max_lifetime, max_idle, timeout...). Django
+opens a "connection" at the start of each request's first query and closes it
+at the end of the request (CONN_MAX_AGE must be 0): here that is a getconn()
+and a putconn(), so the TLS and authentication handshakes with the database
+host are paid once per pooled connection instead of once per request.
+
+- Health checking: with CONN_HEALTH_CHECKS, the pool runs a trivial query on
+  each connection before handing it out and replaces broken ones.
+- max_lifetime / max_idle: connections are recycled after that many seconds
+  in total or idle, so server-side restarts and failovers drain out.
+- One pool per worker process and database alias, created on first use and
+  recreated after a fork; sizes are per process (see DB_POOL_* settings).
+
+pool_metrics() reports the pool's occupancy and waits along with the time
+getconn() took (checkout latency), for /accounts/health/.
+Without OPTIONS["pool"] this is the stock PostgreSQL backend.
+"""
+import os
+import threading
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base
+
+from .creation import DatabaseCreation
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError:  # pragma: no cover - optional dependency
+    ConnectionPool = None
+
+
+class PoolState:
+    """
+    A pool and the checkout timings measured around it.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_ms = 0.0
+        self.max_checkout_ms = 0.0
+
+    def record_checkout(self, elapsed_ms):
+        with self.lock:
+            self.checkouts += 1
+            self.checkout_ms += elapsed_ms
+            self.max_checkout_ms = max(self.max_checkout_ms, elapsed_ms)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    def pool_options(self):
+        options = self.settings_dict["OPTIONS"].get("pool")
+        # The maintenance connection used to create and drop databases is never pooled
+        if not options or self.alias == NO_DB_ALIAS:
+            return None
+        return {} if options is True else dict(options)
+
+    def pool_key(self):
+        settings_dict = self.settings_dict
+        return (
+            self.alias, os.getpid(),
+            settings_dict["NAME"], settings_dict["USER"], settings_dict["HOST"], settings_dict["PORT"],
+        )
+
+    @property
+    def pool_state(self):
+        """
+        This process's PoolState for the alias's current settings, or None without pooling.
+        Keyed on the connection target too, so the test database gets its own pool.
+        """
+        options = self.pool_options()
+        if options is None:
+            return None
+        key = self.pool_key()
+        state = self._pools.get(key)
+        if state is not None:
+            return state
+        if ConnectionPool is None:
+            raise ImproperlyConfigured("OPTIONS['pool'] requires psycopg_pool (pip install psycopg-pool).")
+        if self.settings_dict["CONN_MAX_AGE"] != 0:
+            raise ImproperlyConfigured("A pooled database needs CONN_MAX_AGE = 0: the pool keeps connections open.")
+        connect_kwargs = self.get_connection_params()
+        # Django switches autocommit itself once the connection is checked out
+        connect_kwargs["autocommit"] = True
+        with self._pools_lock:
+            if key not in self._pools:
+                pool = ConnectionPool(
+                    kwargs=connect_kwargs,
+                    open=False,
+                    check=ConnectionPool.check_connection if self.settings_dict["CONN_HEALTH_CHECKS"] else None,
+                    name=f"{self.alias}-{os.getpid()}",
+                    **options,
+                )
+                self._pools[key] = PoolState(pool)
+            return self._pools[key]
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("pool", None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        state = self.pool_state
+        if state is None:
+            return super().get_new_connection(conn_params)
+        options = self.settings_dict["OPTIONS"]
+        try:
+            self.isolation_level = base.IsolationLevel(
+                options.get("isolation_level", base.IsolationLevel.READ_COMMITTED)
+            )
+        except ValueError:
+            raise ImproperlyConfigured(
+                f"Invalid transaction isolation level {options['isolation_level']} specified. "
+                f"Use one of the psycopg.IsolationLevel values."
+            )
+        state.pool.open()
+        start = time.perf_counter()
+        connection = state.pool.getconn()
+        state.record_checkout((time.perf_counter() - start) * 1000)
+        if "isolation_level" in options:
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is None or self.pool_options() is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            # The pool the connection came from, even if settings changed since
+            self.connection._pool.putconn(self.connection)
+            self.connection = None
+
+    def close_pool(self):
+        state = self._pools.pop(self.pool_key(), None) if self.pool_options() is not None else None
+        if state is not None:
+            state.pool.close()
+
+    @classmethod
+    def close_pools(cls, name):
+        """
+        Close this process's pools connected to the database name, whatever their alias.
+        """
+        with cls._pools_lock:
+            keys = [key for key in cls._pools if key[1] == os.getpid() and key[2] == name]
+            states = [cls._pools.pop(key) for key in keys]
+        for state in states:
+            state.pool.close()
+
+    def pool_metrics(self):
+        """
+        Occupancy, queueing and checkout latency of this process's pool, or None without pooling.
+        """
+        state = self.pool_state
+        if state is None:
+            return None
+        stats = state.pool.get_stats()
+        size = stats.get("pool_size", 0)
+        available = stats.get("pool_available", 0)
+        requests = stats.get("requests_num", 0)
+        with state.lock:
+            checkouts, checkout_ms, max_checkout_ms = state.checkouts, state.checkout_ms, state.max_checkout_ms
+        return {
+            "min_size": stats.get("pool_min", state.pool.min_size),
+            "max_size": stats.get("pool_max", state.pool.max_size),
+            "size": size,
+            "in_use": size - available,
+            "available": available,
+            "occupancy": round((size - available) / state.pool.max_size, 3) if state.pool.max_size else 0.0,
+            "waiting": stats.get("requests_waiting", 0),
+            "requests": requests,
+            "requests_queued": stats.get("requests_queued", 0),
+            "requests_errors": stats.get("requests_errors", 0),
+            "wait_ms": stats.get("requests_wait_ms", 0),
+            "avg_wait_ms": round(stats.get("requests_wait_ms", 0) / requests, 3) if requests else 0.0,
+            "checkouts": checkouts,
+            "avg_checkout_ms": round(checkout_ms / checkouts, 3) if checkouts else 0.0,
+            "max_checkout_ms": round(max_checkout_ms, 3),
+            "connections_opened": stats.get("connections_num", 0),
+            "connections_lost": stats.get("connections_lost", 0),
+            "connections_errors": stats.get("connections_errors", 0),
+        }
@@ -0,0 +1,12 @@
+from django.db import connections
+from django.db.backends.postgresql import creation
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Pooled connections (of this alias and of its test mirrors) would block DROP DATABASE
+        for connection in connections.all(initialized_only=True):
+            if connection.settings_dict["NAME"] == test_database_name:
+                connection.close()
+        type(self.connection).close_pools(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
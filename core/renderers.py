@@ -0,0 +1,49 @@
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+LINE_SEPARATOR = "\u2028".encode()
+PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer backed by orjson when it is installed.
+
+    Types orjson does not handle natively (Decimal, lazy translation strings,
+    querysets...) and datetimes are passed to DRF's JSONEncoder.default, so the
+    output is byte-identical to the stock compact renderer. Pretty-printed,
+    ASCII-only or otherwise unsupported payloads fall back to the stdlib encoder.
+    """
+    orjson_options = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+    def __init__(self):
+        self._encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self._encoder.default, option=self.orjson_options)
+        except (TypeError, orjson.JSONEncodeError):
+            # e.g. integers wider than 64 bits; let the stdlib decide
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Match JSONRenderer: always escape U+2028/U+2029 so output is a strict javascript subset
+        if LINE_SEPARATOR in ret or PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(LINE_SEPARATOR, b"\\u2028").replace(PARAGRAPH_SEPARATOR, b"\\u2029")
+        return ret
@@ -0,0 +1,207 @@
+"""
+Read replicas for heavy read-only views.
+
+Views that opt in (ReplicaReadMixin, ReplicaChangeListMixin) send the reads of
+their safe requests to one of DATABASE_REPLICAS; everything else, and every
+write, uses the primary. The choice is held in a per-request ReadState that
+ReplicaRoutingMiddleware installs in a context variable, so the threads
+core.parallel.gather runs queries on (which copy the caller's context) route
+the same way.
+
+Reads stay on the primary when:
+- the request is not a GET/HEAD/OPTIONS, or has already written;
+- the primary connection is inside a transaction (ATOMIC_REQUESTS, tests),
+  whose uncommitted rows a replica cannot see;
+- the user wrote in the last REPLICA_STICKY_SECONDS (read-your-writes, kept
+  in core.RecentWrite on the primary so every worker process honours it);
+- every replica lags more than REPLICA_MAX_LAG_SECONDS behind the primary or
+  is unreachable. Lag is measured at most every REPLICA_LAG_CHECK_INTERVAL
+  seconds per process and replica.
+"""
+import datetime
+import logging
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils import timezone
+
+from .models import RecentWrite
+
+logger = logging.getLogger("lms.replicas")
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Seconds a streaming replica is behind; 0 when it has replayed everything it received
+# (an idle primary would otherwise look lagged) or is not a standby at all
+LAG_QUERIES = {
+    "postgresql": (
+        "SELECT COALESCE(CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END, 0)"
+    ),
+}
+
+_read_state = ContextVar("replica_read_state", default=None)
+_lag_checked = {}
+
+
+class ReadState:
+    """
+    Where the current request reads from, and whether it wrote.
+    """
+
+    def __init__(self):
+        self.alias = None
+        self.wrote = False
+
+
+def replicas():
+    return getattr(settings, "DATABASE_REPLICAS", ())
+
+
+def start_request():
+    state = ReadState()
+    return state, _read_state.set(state)
+
+
+def end_request(token):
+    _read_state.reset(token)
+
+
+def sticky_seconds():
+    return getattr(settings, "REPLICA_STICKY_SECONDS", 15)
+
+
+def mark_sticky(user):
+    """
+    Record that user just wrote. Runs after the response is built, whose writes
+    have committed, so a failure is logged rather than turned into a 500.
+    """
+    if not sticky_seconds() or user is None or not user.is_authenticated:
+        return
+    try:
+        RecentWrite.objects.using(DEFAULT_DB_ALIAS).bulk_create(
+            [RecentWrite(user_id=user.pk, written_at=timezone.now())],
+            update_conflicts=True, unique_fields=["user"], update_fields=["written_at"],
+        )
+    except DatabaseError:
+        logger.warning("Could not mark user %s sticky to the primary.", user.pk, exc_info=True)
+
+
+def is_sticky(user):
+    if not sticky_seconds() or user is None or not user.is_authenticated:
+        return False
+    since = timezone.now() - datetime.timedelta(seconds=sticky_seconds())
+    return RecentWrite.objects.using(DEFAULT_DB_ALIAS).filter(user_id=user.pk, written_at__gte=since).exists()
+
+
+def measure_lag(alias):
+    connection = connections[alias]
+    sql = LAG_QUERIES.get(connection.vendor)
+    if sql is None:
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            return float(cursor.fetchone()[0])
+    except DatabaseError:
+        logger.warning("Replica %s is unreachable, reading from the primary.", alias, exc_info=True)
+        return float("inf")
+
+
+def replica_lag(alias):
+    """
+    Seconds alias is behind the primary (inf when unreachable), re-measured every
+    REPLICA_LAG_CHECK_INTERVAL seconds.
+    """
+    now = time.monotonic()
+    checked = _lag_checked.get(alias)
+    if checked is not None and now - checked[0] < getattr(settings, "REPLICA_LAG_CHECK_INTERVAL", 5):
+        return checked[1]
+    lag = measure_lag(alias)
+    _lag_checked[alias] = (now, lag)
+    return lag
+
+
+def choose_replica():
+    """
+    A random replica within REPLICA_MAX_LAG_SECONDS of the primary, or None.
+    """
+    max_lag = getattr(settings, "REPLICA_MAX_LAG_SECONDS", 5)
+    candidates = [alias for alias in replicas() if replica_lag(alias) <= max_lag]
+    return random.choice(candidates) if candidates else None
+
+
+def route_reads(request):
+    """
+    Send the rest of the request's reads to a replica when that is safe.
+    Returns the replica alias, or None when reads stay on the primary.
+    """
+    state = _read_state.get()
+    if state is None or state.wrote or request.method not in SAFE_METHODS or not replicas():
+        return None
+    if connections[DEFAULT_DB_ALIAS].in_atomic_block or is_sticky(getattr(request, "user", None)):
+        return None
+    state.alias = choose_replica()
+    return state.alias
+
+
+class ReplicaRouter:
+    """
+    Database router: reads go where route_reads() sent the request, writes to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _read_state.get()
+        if state is None or state.wrote:
+            return None
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        state = _read_state.get()
+        if state is not None:
+            state.wrote = True
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db in replicas():
+            # Saving an object that was read from a replica
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema from the primary
+        if db in replicas():
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    Reads of replica_actions (every action when None) go to a replica from
+    authentication on. The ETag (ConditionalGetMixin) and the cache tag
+    versions (TaggedCacheMixin) are then read on the same replica as the body,
+    so a response built from lagging rows is never labelled as current.
+    """
+    replica_actions = None
+
+    def perform_authentication(self, request):
+        super().perform_authentication(request)
+        if self.replica_actions is None or getattr(self, "action", None) in self.replica_actions:
+            route_reads(request)
+
+
+class ReplicaChangeListMixin:
+    """
+    ModelAdmin whose list pages read from a replica.
+    """
+
+    def changelist_view(self, request, extra_context=None):
+        route_reads(request)
+        return super().changelist_view(request, extra_context)
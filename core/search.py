@@ -0,0 +1,175 @@
+"""
+Full-text search over courses, modules and assignments.
+
+Every course, module and assignment has one SearchDocument row holding its
+title and body (description or content), kept in step by model signals
+(core.signals); bulk write paths call rebuild() or the rebuild_search_index
+command. Each document carries its course, so results are scoped with the same
+rules as the viewsets: instructors see their courses, students the courses they
+are enrolled in, admins everything.
+
+The index itself depends on the database:
+- PostgreSQL: SearchDocument.vector, a tsvector with the title weighted above the
+  body, under a GIN index; ranked with ts_rank.
+- SQLite: the core_searchdocument_fts FTS5 table (porter stemming), an external
+  content index over SearchDocument maintained by triggers; ranked with bm25.
+- Anything else, or SQLite without FTS5: title/body icontains, titles first.
+Both indexes are created by migration core.0002.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Q, Value, When
+
+CONFIG = "english"
+FTS_TABLE = "core_searchdocument_fts"
+TITLE_WEIGHT, BODY_WEIGHT = 10.0, 1.0
+KINDS = ("course", "module", "assignment")
+
+
+def document_vector():
+    return SearchVector("title", weight="A", config=CONFIG) + SearchVector("body", weight="B", config=CONFIG)
+
+
+def fts_available():
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def describe(instance):
+    """
+    (kind, course_id, title, body) of a Course, Module or Assignment.
+    """
+    kind = instance._meta.model_name
+    if kind == "course":
+        return kind, instance.pk, instance.title, instance.description or ""
+    if kind == "module":
+        return kind, instance.course_id, instance.title, instance.content or ""
+    return kind, instance.course_id, instance.title, instance.description or ""
+
+
+def index_instance(instance):
+    from .models import SearchDocument
+
+    kind, course_id, title, body = describe(instance)
+    document, _ = SearchDocument.objects.update_or_create(
+        kind=kind, object_id=instance.pk, defaults={"course_id": course_id, "title": title, "body": body},
+    )
+    if connection.vendor == "postgresql":
+        SearchDocument.objects.filter(pk=document.pk).update(vector=document_vector())
+
+
+def remove_instance(instance):
+    from .models import SearchDocument
+
+    SearchDocument.objects.filter(kind=instance._meta.model_name, object_id=instance.pk).delete()
+
+
+def document_rows(course_model, module_model, assignment_model):
+    """
+    (kind, object_id, course_id, title, body) of every indexable row. Model classes
+    are parameters so migrations can pass their historical models.
+    """
+    for pk, title, body in course_model.objects.order_by().values_list("pk", "title", "description").iterator():
+        yield "course", pk, pk, title, body or ""
+    for kind, model, field in (("module", module_model, "content"), ("assignment", assignment_model, "description")):
+        rows = model.objects.order_by().values_list("pk", "course_id", "title", field).iterator()
+        for pk, course_id, title, body in rows:
+            yield kind, pk, course_id, title, body or ""
+
+
+def rebuild(document_model=None, models=None, batch_size=2000):
+    """
+    Replace every SearchDocument from the source tables. Returns the number indexed.
+    """
+    if document_model is None:
+        from assignments.models import Assignment
+        from courses.models import Course, Module
+        from .models import SearchDocument
+
+        document_model, models = SearchDocument, (Course, Module, Assignment)
+    document_model.objects.all().delete()
+    batch, total = [], 0
+    for kind, pk, course_id, title, body in document_rows(*models):
+        batch.append(document_model(kind=kind, object_id=pk, course_id=course_id, title=title, body=body))
+        if len(batch) >= batch_size:
+            total += len(document_model.objects.bulk_create(batch))
+            batch = []
+    total += len(document_model.objects.bulk_create(batch))
+    if connection.vendor == "postgresql":
+        document_model.objects.update(vector=document_vector())
+    return total
+
+
+def scope(documents, user):
+    """
+    Restrict a SearchDocument queryset to the courses the user can see.
+    """
+    role = getattr(user, "role", None)
+    if role == "admin":
+        return documents
+    if role == "instructor":
+        return documents.filter(course__instructor=user)
+    if role == "student":
+        return documents.filter(course__enrollments__student=user)
+    return documents.none()
+
+
+def fts_match(query):
+    """
+    FTS5 expression requiring every word of query, each quoted so user input
+    cannot use FTS5 operators.
+    """
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", query))
+
+
+def search(user, query, kinds=KINDS, limit=20):
+    """
+    Ranked documents matching query that the user may see, best first, each with a rank attribute.
+    """
+    from .models import SearchDocument
+
+    documents = scope(SearchDocument.objects.filter(kind__in=kinds), user)
+    if connection.vendor == "postgresql":
+        terms = SearchQuery(query, search_type="websearch", config=CONFIG)
+        return list(
+            documents.filter(vector=terms)
+            .annotate(rank=SearchRank(F("vector"), terms))
+            .order_by("-rank", "pk")[:limit]
+        )
+
+    if fts_available():
+        match = fts_match(query)
+        if not match:
+            return []
+        sql, params = documents.order_by().values("pk").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, -bm25({FTS_TABLE}, %s, %s) AS rank FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid IN ({sql}) ORDER BY rank DESC, rowid LIMIT %s",
+                [TITLE_WEIGHT, BODY_WEIGHT, match, *params, limit],
+            )
+            ranks = cursor.fetchall()
+        found = SearchDocument.objects.in_bulk([pk for pk, _ in ranks])
+        results = []
+        for pk, rank in ranks:
+            found[pk].rank = rank
+            results.append(found[pk])
+        return results
+
+    words = re.findall(r"\w+", query)
+    if not words:
+        return []
+    title_matches = Q()
+    for word in words:
+        documents = documents.filter(Q(title__icontains=word) | Q(body__icontains=word))
+        title_matches &= Q(title__icontains=word)
+    return list(
+        documents.annotate(
+            rank=Case(When(title_matches, then=Value(2)), default=Value(1), output_field=IntegerField())
+        ).order_by("-rank", "pk")[:limit]
+    )
@@ -0,0 +1,65 @@
+from rest_framework import permissions, serializers, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.models import CustomUser
+from assignments.models import Assignment
+from courses.models import Course, Enrollment, Module
+from . import search
+from .mixins import ConditionalGetMixin
+
+
+class SearchResultSerializer(serializers.Serializer):
+    type = serializers.CharField(source="kind", help_text="course, module or assignment")
+    id = serializers.IntegerField(source="object_id", help_text="ID of the course, module or assignment")
+    course = serializers.IntegerField(source="course_id", help_text="Course the result belongs to")
+    title = serializers.CharField()
+    rank = serializers.FloatField(help_text="Relevance, higher first; only comparable within one response")
+
+    class Meta:
+        ref_name = "SearchResult"
+
+
+class SearchView(ConditionalGetMixin, APIView):
+    """
+    Ranked full-text search over course, module and assignment titles and texts.
+    ?q= is required; ?type= restricts to a comma-separated subset of course,
+    module and assignment; ?limit= caps the results (default 20, at most 100).
+    Results are scoped like the viewsets: own courses for instructors, enrolled
+    courses for students, everything for admins. Responses carry an ETag.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    etag_models = (Course, Module, Assignment, Enrollment, CustomUser)
+    default_limit = 20
+    max_limit = 100
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"q": ["This parameter is required."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        kinds = search.KINDS
+        if request.query_params.get("type"):
+            kinds = [kind.strip() for kind in request.query_params["type"].split(",") if kind.strip()]
+            unknown = sorted(set(kinds) - set(search.KINDS))
+            if unknown:
+                return Response(
+                    {"type": [f"Unknown type: {', '.join(unknown)}. Choose from {', '.join(search.KINDS)}."]},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= self.max_limit:
+            return Response(
+                {"limit": [f"Ensure this value is an integer between 1 and {self.max_limit}."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = search.search(request.user, query, kinds=kinds, limit=limit)
+        return Response({
+            "query": query,
+            "count": len(results),
+            "results": SearchResultSerializer(results, many=True).data,
+        })
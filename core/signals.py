@@ -0,0 +1,110 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from assignments.models import Assignment, Submission
+from courses.models import Course, Enrollment, Module
+from enrollments.models import Enrollment as CourseEnrollment
+from grades.models import Grade
+from .cache import invalidate_instances
+from .counters import add_counts, grade_deltas, lock_grade_targets
+from .search import index_instance, remove_instance
+from .versions import bump_versions
+
+User = get_user_model()
+
+# Models whose changes invalidate ETags derived from core.versions
+VERSIONED_MODELS = (User, Course, Enrollment, Module, Assignment, Submission, Grade)
+
+# Models whose changes invalidate entries of the tagged API cache (core.cache)
+CACHED_MODELS = VERSIONED_MODELS + (CourseEnrollment,)
+
+# Models with a full-text SearchDocument (core.search)
+SEARCHABLE_MODELS = (Course, Module, Assignment)
+
+# Models counted on a parent row (core.counters): model -> (parent model, foreign key, counter)
+COUNTED_MODELS = {
+    Enrollment: (Course, "course_id", "enrollment_count"),
+    Assignment: (Course, "course_id", "assignment_count"),
+    Submission: (Assignment, "assignment_id", "submission_count"),
+}
+
+
+def bump_model_version(sender, **kwargs):
+    bump_versions(sender)
+
+
+def invalidate_cached_responses(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which no cached payload exposes
+    if sender is User and update_fields and set(update_fields) <= {"last_login"}:
+        return
+    invalidate_instances([instance])
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(bump_model_version, sender=model, dispatch_uid=f"bump_version_save_{model._meta.label_lower}")
+    post_delete.connect(bump_model_version, sender=model, dispatch_uid=f"bump_version_delete_{model._meta.label_lower}")
+
+for model in CACHED_MODELS:
+    post_save.connect(
+        invalidate_cached_responses, sender=model, dispatch_uid=f"invalidate_cache_save_{model._meta.label_lower}"
+    )
+    post_delete.connect(
+        invalidate_cached_responses, sender=model, dispatch_uid=f"invalidate_cache_delete_{model._meta.label_lower}"
+    )
+
+
+def count_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        parent, foreign_key, counter = COUNTED_MODELS[sender]
+        add_counts(parent, {getattr(instance, foreign_key): {counter: 1}})
+
+
+def count_deleted(sender, instance, **kwargs):
+    parent, foreign_key, counter = COUNTED_MODELS[sender]
+    add_counts(parent, {getattr(instance, foreign_key): {counter: -1}})
+
+
+def remember_grade_score(sender, instance, raw=False, **kwargs):
+    # Grade.save runs in a transaction: the submission stays locked until the counters moved
+    if not raw:
+        assignment_id, _, score, _ = lock_grade_targets([instance.submission_id]).get(
+            instance.submission_id, (None, None, None, None)
+        )
+        instance._counted_score = (assignment_id, score)
+
+
+def count_grade_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    assignment_id, old_score = instance._counted_score
+    add_counts(Assignment, grade_deltas(
+        assignment_id, None if created else old_score, instance.score, created=created,
+    ))
+
+
+def count_grade_deleted(sender, instance, **kwargs):
+    assignment_id = Submission.objects.filter(pk=instance.submission_id).values_list("assignment_id", flat=True).first()
+    add_counts(Assignment, grade_deltas(assignment_id, instance.score, None, deleted=True))
+
+
+for model in COUNTED_MODELS:
+    post_save.connect(count_created, sender=model, dispatch_uid=f"count_save_{model._meta.label_lower}")
+    post_delete.connect(count_deleted, sender=model, dispatch_uid=f"count_delete_{model._meta.label_lower}")
+
+pre_save.connect(remember_grade_score, sender=Grade, dispatch_uid="count_grade_pre_save")
+post_save.connect(count_grade_saved, sender=Grade, dispatch_uid="count_grade_save")
+post_delete.connect(count_grade_deleted, sender=Grade, dispatch_uid="count_grade_delete")
+
+
+def index_document(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_instance(instance)
+
+
+def remove_document(sender, instance, **kwargs):
+    remove_instance(instance)
+
+
+for model in SEARCHABLE_MODELS:
+    post_save.connect(index_document, sender=model, dispatch_uid=f"search_save_{model._meta.label_lower}")
+    post_delete.connect(remove_document, sender=model, dispatch_uid=f"search_delete_{model._meta.label_lower}")
@@ -0,0 +1,135 @@
+"""
+Sparse fieldsets (?fields=) and controlled expansion (?expand=) for GET responses.
+
+?fields=id,title,course.title keeps only the listed fields; a dotted path selects
+fields of a nested serializer, and naming a nested field alone keeps all of it.
+?expand= lists the expandable fields (Meta.expandable_fields) to render nested;
+once the parameter is present, expandable fields it does not name collapse to
+the related id, or are left out when they only repeat another field. Without
+either parameter the representation is unchanged.
+
+prune_queryset() derives the columns and joins the remaining fields read, so
+the viewsets (core.mixins.SparseFieldsMixin) fetch nothing they do not render:
+unrequested nested serializers lose their select_related join and unrequested
+columns such as Submission.content are deferred with .only().
+SerializerMethodFields declare the ORM paths they read in Meta.method_field_sources;
+a serializer with an undeclared one is left unpruned.
+"""
+from collections import namedtuple
+
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+# fields / expand: {name: subtree or None for "all of it"}, or None when the parameter is absent
+SparseSpec = namedtuple("SparseSpec", ["fields", "expand"])
+
+
+def parse_paths(value):
+    """
+    "id,course.title,course.id" -> {"id": None, "course": {"title": None, "id": None}}.
+    """
+    tree = {}
+    for path in value.split(","):
+        parts = [part.strip() for part in path.split(".")]
+        if not all(parts):
+            continue
+        node = tree
+        for part in parts[:-1]:
+            if part in node and node[part] is None:
+                break  # the whole field is already requested
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = None
+    return tree
+
+
+class SparseSerializerMixin:
+    """
+    Applies the SparseSpec found in the "sparse" context entry (root serializer)
+    or handed down by the parent serializer (nested ones).
+
+    Meta.expandable_fields: {field: source of the related id to render when the
+    field is not expanded, or None to leave it out}.
+    Meta.method_field_sources: {method field: ORM paths it reads}.
+    """
+
+    def get_sparse_spec(self):
+        if hasattr(self, "_sparse_spec"):
+            return self._sparse_spec
+        parent = self.parent
+        if parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None):
+            return self.context.get("sparse")
+        return None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        spec = self.get_sparse_spec()
+        if spec is None:
+            return fields
+
+        expandable = getattr(self.Meta, "expandable_fields", {})
+        if spec.expand is not None:
+            unknown = sorted(name for name in spec.expand if name not in fields)
+            if unknown:
+                raise ValidationError({"expand": [f"Unknown field: {name}." for name in unknown]})
+            for name, source in expandable.items():
+                if name in fields and name not in spec.expand:
+                    if source is None:
+                        del fields[name]
+                    else:
+                        fields[name] = serializers.IntegerField(source=source, read_only=True)
+
+        if spec.fields is not None:
+            unknown = sorted(name for name in spec.fields if name not in fields)
+            if unknown:
+                raise ValidationError({"fields": [f"Unknown field: {name}." for name in unknown]})
+            fields = {name: field for name, field in fields.items() if name in spec.fields}
+
+        for name, field in fields.items():
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if isinstance(nested, serializers.BaseSerializer):
+                nested._sparse_spec = SparseSpec(
+                    spec.fields.get(name) if spec.fields is not None else None,
+                    spec.expand.get(name) if spec.expand is not None else None,
+                )
+        return fields
+
+
+def collect_paths(serializer, prefix, paths, relations):
+    """
+    Add the ORM paths read by serializer's fields to paths and the forward
+    relations they traverse to relations. Returns False when they are unknown.
+    """
+    method_sources = getattr(getattr(serializer, "Meta", None), "method_field_sources", {})
+    for name, field in serializer.fields.items():
+        if isinstance(field, serializers.ListSerializer):
+            return False
+        if isinstance(field, serializers.SerializerMethodField):
+            if name not in method_sources:
+                return False
+            sources = [prefix + source for source in method_sources[name]]
+        elif field.source == "*":
+            return False
+        else:
+            sources = [prefix + field.source.replace(".", "__")]
+        if isinstance(field, serializers.BaseSerializer):
+            relations.add(sources[0])
+            if not collect_paths(field, sources[0] + "__", paths, relations):
+                return False
+            continue
+        for source in sources:
+            parts = source.split("__")
+            relations.update("__".join(parts[:i]) for i in range(1, len(parts)))
+            paths.add(source)
+    return True
+
+
+def prune_queryset(queryset, serializer):
+    """
+    Restrict queryset to the columns and joins serializer renders, or return it
+    unchanged when some field's sources are unknown.
+    """
+    paths, relations = set(), set()
+    if not collect_paths(serializer, "", paths, relations):
+        return queryset
+    return queryset.select_related(None).select_related(*sorted(relations)).only(*sorted(paths | relations))
@@ -0,0 +1,137 @@
+from unittest import mock
+
+from django.core.cache import cache as django_cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from assignments.models import Assignment, Submission
+from core import cache
+from courses.models import Course, Enrollment
+from grades.models import Grade
+
+
+class TaggedCacheTests(TestCase):
+    """
+    Tests for the tag-invalidated response cache on the list and analytics endpoints.
+    """
+
+    def setUp(self):
+        django_cache.clear()
+        self.client = APIClient()
+        self.admin = CustomUser.objects.create_user(
+            email="admin@example.com", password="password123", role="admin"
+        )
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.other_instructor = CustomUser.objects.create_user(
+            email="other@example.com", password="password123", role="instructor"
+        )
+        self.student = CustomUser.objects.create_user(
+            email="student@example.com", password="password123", role="student"
+        )
+        self.other_student = CustomUser.objects.create_user(
+            email="student2@example.com", password="password123", role="student"
+        )
+        self.course = Course.objects.create(title="Math 101", instructor=self.instructor)
+        self.other_course = Course.objects.create(title="History 101", instructor=self.other_instructor)
+        Enrollment.objects.create(course=self.course, student=self.student)
+        Enrollment.objects.create(course=self.other_course, student=self.other_student)
+        self.assignment = Assignment.objects.create(course=self.course, title="Homework", due_date=timezone.now())
+        self.other_assignment = Assignment.objects.create(
+            course=self.other_course, title="Essay", due_date=timezone.now()
+        )
+        self.submission = Submission.objects.create(
+            assignment=self.assignment, student=self.student, content="Answer"
+        )
+
+    def test_repeat_request_is_served_without_queries(self):
+        self.client.force_authenticate(user=self.student)
+        first = self.client.get("/api/courses/")
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        # ETag versions, then the tokens of the student's tag and of their course tags; no table is read
+        with self.assertNumQueries(3):
+            second = self.client.get("/api/courses/")
+        self.assertEqual(second.json(), first.json())
+
+    def test_posting_grade_invalidates_student_and_instructor_lists(self):
+        self.client.force_authenticate(user=self.student)
+        self.assertEqual(self.client.get("/api/grades/").json(), [])
+        self.client.force_authenticate(user=self.instructor)
+        self.assertEqual(self.client.get("/api/grades/").json(), [])
+
+        response = self.client.post(
+            "/api/grades/", {"submission": self.submission.pk, "score": 91, "letter": "A"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(len(self.client.get("/api/grades/").json()), 1)
+        self.client.force_authenticate(user=self.student)
+        self.assertEqual(len(self.client.get("/api/grades/").json()), 1)
+
+    def test_unrelated_write_keeps_other_scopes_cached(self):
+        tags = cache.scope_tags(self.student)
+        before = cache.get_tag_versions(tags)
+
+        other_submission = Submission.objects.create(
+            assignment=self.other_assignment, student=self.other_student, content="Other"
+        )
+        Grade.objects.create(submission=other_submission, instructor=self.other_instructor, score=50)
+        self.assertEqual(cache.get_tag_versions(tags), before)
+
+        Grade.objects.create(submission=self.submission, instructor=self.instructor, score=80)
+        self.assertNotEqual(cache.get_tag_versions(tags), before)
+
+    def test_new_enrollment_extends_student_scope(self):
+        self.assertEqual(cache.scope_tags(self.student), [f"student:{self.student.pk}", f"course:{self.course.pk}"])
+        Enrollment.objects.create(course=self.other_course, student=self.student)
+        self.assertIn(f"course:{self.other_course.pk}", cache.scope_tags(self.student))
+
+    def test_admin_entries_use_table_tags(self):
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(len(self.client.get("/api/submissions/").json()), 1)
+        Submission.objects.create(assignment=self.other_assignment, student=self.other_student, content="Other")
+        self.assertEqual(len(self.client.get("/api/submissions/").json()), 2)
+
+    def test_analytics_invalidated_by_grade(self):
+        self.client.force_authenticate(user=self.student)
+        self.assertEqual(self.client.get("/analytics/student/").json()["grades_count"], 0)
+        Grade.objects.create(submission=self.submission, instructor=self.instructor, score=80)
+        self.assertEqual(self.client.get("/analytics/student/").json()["grades_count"], 1)
+
+    def test_write_in_another_process_invalidates(self):
+        self.client.force_authenticate(user=self.student)
+        self.assertEqual(self.client.get("/analytics/student/").json()["grades_count"], 0)
+        # Another worker or a management command: same database, its own local cache
+        with mock.patch.object(cache, "get_cache", return_value=LocMemCache("other-process", {})):
+            Grade.objects.create(submission=self.submission, instructor=self.instructor, score=80)
+        self.assertEqual(self.client.get("/analytics/student/").json()["grades_count"], 1)
+
+    def test_invalidate_all(self):
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(len(self.client.get("/api/submissions/").json()), 1)
+        Submission.objects.bulk_create([
+            Submission(assignment=self.other_assignment, student=self.other_student, content="Other")
+        ])
+        self.assertEqual(len(self.client.get("/api/submissions/").json()), 1)
+        cache.invalidate_all()
+        self.assertEqual(len(self.client.get("/api/submissions/").json()), 2)
+
+    def test_query_params_are_part_of_the_key(self):
+        self.client.force_authenticate(user=self.admin)
+        self.client.get("/api/courses/")
+        with self.assertNumQueries(2):  # ETag versions and table tag tokens
+            self.client.get("/api/courses/")
+        self.assertGreater(self.count_queries("/api/courses/", {"ordering": "title"}), 1)
+
+    def count_queries(self, url, params):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url, params)
+        return len(ctx.captured_queries)
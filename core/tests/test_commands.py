@@ -0,0 +1,119 @@
+import json
+import random
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models.signals import post_delete
+from django.test import LiveServerTestCase, TestCase
+
+from accounts.models import CustomUser
+from assignments.models import Submission
+from core.management.commands import loadtest
+from core.management.commands.loadtest import percentile
+from courses.models import Course, Enrollment
+from dashboard.models import StudentSummary
+from enrollments.models import Enrollment as CourseEnrollment
+from grades.models import Grade
+
+TINY = ["--students", "30", "--instructors", "3", "--courses", "6", "--assignments", "3", "--enrollments", "2"]
+
+
+def generate(*extra):
+    call_command("generate_dataset", *TINY, "--chunk-size", "10", "--batch-size", "50", *extra, stdout=StringIO())
+
+
+class GenerateDatasetTests(TestCase):
+    """
+    Tests for the synthetic dataset generator.
+    """
+
+    def test_generates_consistent_volumes(self):
+        generate()
+        self.assertEqual(CustomUser.objects.filter(role="student").count(), 30)
+        self.assertEqual(CustomUser.objects.filter(role="instructor").count(), 3)
+        self.assertEqual(Course.objects.count(), 6)
+        self.assertGreater(Submission.objects.count(), 0)
+        self.assertEqual(Enrollment.objects.count(), CourseEnrollment.objects.count())
+        # Every student is enrolled somewhere and only submits to their own courses
+        self.assertEqual(Enrollment.objects.values("student").distinct().count(), 30)
+        enrolled = set(Enrollment.objects.values_list("student", "course"))
+        submitted = set(Submission.objects.values_list("student", "assignment__course"))
+        self.assertLessEqual(submitted, enrolled)
+        for grade in Grade.objects.select_related("submission"):
+            self.assertEqual(grade.submission.grade, grade.score)
+        self.assertEqual(StudentSummary.objects.count(), 30)
+
+    def test_is_deterministic_and_requires_clear(self):
+        generate()
+        first = set(Submission.objects.values_list("student__email", "assignment__course__title", "assignment__title", "grade"))
+        with self.assertRaises(CommandError):
+            generate()
+        outsider = CustomUser.objects.create_user(email="real@example.com", password="password123", role="student")
+        Enrollment.objects.create(student=outsider, course=Course.objects.first())
+        deleted = []
+        receiver = lambda sender, **kwargs: deleted.append(sender)  # noqa: E731
+        post_delete.connect(receiver, weak=False)
+        try:
+            generate("--clear")
+        finally:
+            post_delete.disconnect(receiver)
+        # Set-based deletes: no generated row is loaded or signalled
+        self.assertFalse({CustomUser, Course, Enrollment, Submission, Grade} & set(deleted))
+        second = set(Submission.objects.values_list("student__email", "assignment__course__title", "assignment__title", "grade"))
+        self.assertEqual(first, second)
+        self.assertEqual(CustomUser.objects.filter(role="student", email__endswith="@synthetic.lms").count(), 30)
+        # The generated courses went with their instructors, cascading to the outsider's enrollment
+        self.assertFalse(Enrollment.objects.filter(student=outsider).exists())
+
+
+class PercentileTests(TestCase):
+    def test_nearest_rank(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 95), 95)
+        self.assertEqual(percentile(samples, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertEqual(percentile([], 50), 0.0)
+
+
+class LoadTestRequestTests(TestCase):
+    def setUp(self):
+        self.command = loadtest.Command()
+        self.command.base_url, self.command.timeout = "http://127.0.0.1:9", 1.0
+        self.command.rng, self.command.rng_lock = random.Random(0), threading.Lock()
+
+    def test_timeouts_are_error_samples(self):
+        with mock.patch.object(loadtest, "urlopen", side_effect=TimeoutError("timed out")):
+            row = self.command.run_endpoint("/api/courses/", "student", ["token"], 3, 2)
+        self.assertEqual((row["requests"], row["errors"]), (3, 3))
+
+    def test_unreachable_server_stops_at_login(self):
+        CustomUser.objects.create_user(email="s@synthetic.lms", password="loadtest123", role="student")
+        with mock.patch.object(loadtest, "urlopen", side_effect=ConnectionRefusedError("refused")), \
+                self.assertRaisesMessage(CommandError, "Cannot reach"):
+            self.command.login("student", 1, "synthetic.lms", "loadtest123")
+
+
+class LoadTestCommandTests(LiveServerTestCase):
+    """
+    Runs the load-test harness against a live test server.
+    """
+    databases = {"default", "replica"}
+
+    def test_reports_every_endpoint(self):
+        generate()
+        out = StringIO()
+        call_command(
+            "loadtest", "--base-url", self.live_server_url, "--requests", "4", "--concurrency", "2",
+            "--users", "2", "--json", stdout=out,
+        )
+        rows = json.loads(out.getvalue())
+        self.assertEqual(len(rows), 13)
+        for row in rows:
+            self.assertEqual(row["errors"], 0, row)
+            self.assertLessEqual(row["p50_ms"], row["p95_ms"])
+            self.assertLessEqual(row["p95_ms"], row["p99_ms"])
+            self.assertGreater(row["throughput"], 0)
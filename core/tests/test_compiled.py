@@ -0,0 +1,156 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from accounts.models import CustomUser, Profile
+from assignments.models import Assignment, Submission
+from assignments.serializers import AssignmentSerializer, SubmissionSerializer
+from core.compiled import NotCompilable, compile_serializer
+from core.renderers import FastJSONRenderer
+from core.sparse import SparseSpec, parse_paths
+from courses.models import Course, Module
+from grades.models import Grade
+from grades.serializers import GradeSerializer, SubmissionSerializer as GradeSubmissionSerializer
+from users.serializers import ProfileSerializer, UserSerializer
+
+SPECS = (
+    None,
+    SparseSpec(parse_paths("id,score,submission_detail.id,submission_detail.grade"), None),
+    SparseSpec(None, parse_paths("")),
+    SparseSpec(None, parse_paths("instructor")),
+    SparseSpec(parse_paths("student,letter"), parse_paths("student")),
+)
+
+
+class CompiledSerializerParityTests(TestCase):
+    """
+    The compiled serializers render byte-identical JSON to the DRF serializers.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor", username="teach"
+        )
+        Profile.objects.get_or_create(user=instructor)
+        course = Course.objects.create(title="Math 101", description="Numbers", instructor=instructor)
+        module = Module.objects.create(course=course, title="Algebra")
+        with_module = Assignment.objects.create(
+            course=course, module=module, title="Homework", description="Chapter 1",
+            due_date=timezone.now(), created_by=instructor,
+        )
+        bare = Assignment.objects.create(course=course, title="Quiz", due_date=timezone.now())
+        for index in range(4):
+            student = CustomUser.objects.create_user(
+                email=f"s{index}@example.com", password="password123", role="student"
+            )
+            for assignment in (with_module, bare):
+                submission = Submission.objects.create(
+                    assignment=assignment, student=student, content=f"Essay {index}",
+                    feedback="Good" if index % 2 else None,
+                )
+                if index < 3:
+                    Grade.objects.create(
+                        submission=submission, instructor=instructor,
+                        score=None if index == 2 else 80 + index + 0.25,
+                        letter=None if index == 2 else "B",
+                    )
+
+    def context(self, spec=None):
+        request = APIRequestFactory().get("/")
+        return {"request": request, "sparse": spec}
+
+    def assert_parity(self, serializer_class, queryset, spec=None):
+        serializer = serializer_class(many=True, context=self.context(spec))
+        expected = serializer_class(queryset, many=True, context=self.context(spec)).data
+        compiled = compile_serializer(serializer.child)
+        renderer = FastJSONRenderer()
+        self.assertEqual(renderer.render(compiled.serialize(queryset)), renderer.render(expected), compiled.source)
+        self.assertEqual([list(row) for row in compiled.serialize(queryset)], [list(row) for row in expected])
+
+    def test_grades(self):
+        for spec in SPECS:
+            with self.subTest(spec=spec):
+                self.assert_parity(GradeSerializer, Grade.objects.all(), spec)
+
+    def test_submissions(self):
+        queryset = Submission.objects.order_by("pk")
+        self.assert_parity(SubmissionSerializer, queryset)
+        self.assert_parity(SubmissionSerializer, queryset, SparseSpec(parse_paths("id,assignment_title"), None))
+        self.assert_parity(SubmissionSerializer, queryset, SparseSpec(None, parse_paths("")))
+        self.assert_parity(GradeSubmissionSerializer, queryset)
+
+    def test_missing_relations_keep_key_order(self):
+        # module_title is skipped for the assignment without a module and re-added last
+        self.assert_parity(AssignmentSerializer, Assignment.objects.order_by("pk"))
+        data = compile_serializer(AssignmentSerializer(context=self.context())).serialize(
+            Assignment.objects.filter(module__isnull=True)
+        )
+        self.assertEqual(list(data[0])[-1], "module_title")
+        self.assertIsNone(data[0]["created_by"])
+
+    def test_one_query(self):
+        compiled = compile_serializer(GradeSerializer(context=self.context()))
+        with CaptureQueriesContext(connection) as ctx:
+            compiled.serialize(Grade.objects.all())
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_bench_serializers_command(self):
+        out = StringIO()
+        call_command("bench_serializers", "--iterations", "1", stdout=out)
+        self.assertIn("grades", out.getvalue())
+        self.assertIn("submissions", out.getvalue())
+
+    def test_not_compilable(self):
+        with self.assertRaises(NotCompilable):
+            compile_serializer(UserSerializer(context=self.context()))  # custom to_representation
+        with self.assertRaises(NotCompilable):
+            compile_serializer(ProfileSerializer(context=self.context()))  # avatar renders a URL
+        with self.assertRaises(NotCompilable):
+            compile_serializer(GradeSerializer(many=True, context=self.context()))
+
+
+class CompiledListViewTests(APITestCase):
+    """
+    Tests for CompiledListMixin on /api/grades/ and /api/submissions/.
+    """
+
+    def setUp(self):
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.student = CustomUser.objects.create_user(email="s@example.com", password="password123", role="student")
+        course = Course.objects.create(title="Math 101", instructor=self.instructor)
+        for index in range(3):
+            assignment = Assignment.objects.create(course=course, title=f"Homework {index}", due_date=timezone.now())
+            submission = Submission.objects.create(assignment=assignment, student=self.student, content=f"E{index}")
+            Grade.objects.create(submission=submission, instructor=self.instructor, score=70 + index)
+        self.client.force_authenticate(user=self.instructor)
+
+    def test_list_matches_serializer(self):
+        for url, serializer_class, queryset, table in (
+            ("/api/grades/", GradeSerializer, Grade.objects.all(), "grades_grade"),
+            ("/api/submissions/", SubmissionSerializer, Submission.objects.all(), "assignments_submission"),
+        ):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            expected = serializer_class(queryset, many=True, context={"request": response.wsgi_request}).data
+            self.assertEqual(response.content, FastJSONRenderer().render(expected))
+            # One SELECT for the rows; the other query is the cache scope lookup
+            self.assertEqual(len([query for query in ctx.captured_queries if table in query["sql"]]), 1)
+
+    def test_stream_and_sparse(self):
+        response = self.client.get("/api/grades/", {"stream": "true", "fields": "id,score"})
+        rows = json.loads(b"".join(response.streaming_content))
+        self.assertEqual([row["score"] for row in rows], ["72.00", "71.00", "70.00"])
+        self.assertEqual(set(rows[0]), {"id", "score"})
+        response = self.client.get("/api/grades/", {"fields": "nope"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,174 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from analytics import stats
+from assignments.models import Assignment, Submission
+from courses.models import Course, Enrollment
+from grades.models import Grade
+
+
+class CounterTests(TestCase):
+    """
+    Tests for the denormalized Course and Assignment counters (core.counters).
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.course = Course.objects.create(title="Math 101", instructor=self.instructor)
+        self.assignment = Assignment.objects.create(
+            course=self.course, title="Homework", due_date=timezone.now() + datetime.timedelta(days=7)
+        )
+        self.students = [
+            CustomUser.objects.create_user(email=f"student{i}@example.com", password="password123", role="student")
+            for i in range(3)
+        ]
+
+    def course_counts(self):
+        self.course.refresh_from_db()
+        return self.course.enrollment_count, self.course.assignment_count
+
+    def assignment_counts(self):
+        self.assignment.refresh_from_db()
+        a = self.assignment
+        return a.submission_count, a.graded_count, a.scored_count, a.score_sum
+
+    def test_signals_track_single_row_writes(self):
+        enrollment = Enrollment.objects.create(course=self.course, student=self.students[0])
+        Enrollment.objects.create(course=self.course, student=self.students[1])
+        extra = Assignment.objects.create(course=self.course, title="Quiz", due_date=timezone.now())
+        self.assertEqual(self.course_counts(), (2, 2))
+        enrollment.delete()
+        extra.delete()
+        self.assertEqual(self.course_counts(), (1, 1))
+
+        first = Submission.objects.create(assignment=self.assignment, student=self.students[0], content="A")
+        second = Submission.objects.create(assignment=self.assignment, student=self.students[1], content="B")
+        grade = Grade.objects.create(submission=first, instructor=self.instructor, score=80, letter="B")
+        Grade.objects.create(submission=second, instructor=self.instructor, letter="I")
+        self.assertEqual(self.assignment_counts(), (2, 2, 1, Decimal("80")))
+
+        grade.score = Decimal("92.5")
+        grade.save()
+        self.assertEqual(self.assignment_counts(), (2, 2, 1, Decimal("92.5")))
+        grade.score = None
+        grade.save()
+        self.assertEqual(self.assignment_counts(), (2, 2, 0, Decimal("0")))
+        grade.delete()
+        self.assertEqual(self.assignment_counts(), (2, 1, 0, Decimal("0")))
+
+    def test_cascades(self):
+        submission = Submission.objects.create(assignment=self.assignment, student=self.students[0], content="A")
+        Grade.objects.create(submission=submission, instructor=self.instructor, score=70, letter="C")
+        Enrollment.objects.create(course=self.course, student=self.students[0])
+        self.students[0].delete()
+        self.assertEqual(self.course_counts(), (0, 1))
+        self.assertEqual(self.assignment_counts(), (0, 0, 0, Decimal("0")))
+
+    def test_bulk_paths(self):
+        admin = CustomUser.objects.create_user(email="admin@example.com", password="password123", role="admin")
+        client = APIClient()
+        client.force_authenticate(user=admin)
+        client.post(
+            "/api/enrollments/roster/", {"course": self.course.pk, "students": [s.pk for s in self.students]},
+            format="json",
+        )
+        self.assertEqual(self.course_counts(), (3, 1))
+
+        submissions = [
+            Submission.objects.create(assignment=self.assignment, student=s, content="A") for s in self.students
+        ]
+        Grade.objects.create(submission=submissions[0], instructor=self.instructor, score=50, letter="F")
+        client.force_authenticate(user=self.instructor)
+        client.post("/api/grades/bulk/", {"grades": [
+            {"submission": submissions[0].pk, "score": 60},
+            {"submission": submissions[1].pk, "score": 90},
+        ]}, format="json")
+        self.assertEqual(self.assignment_counts(), (3, 2, 2, Decimal("150")))
+
+        from grades.importer import GradeImporter
+        GradeImporter(self.course, self.instructor).run(StringIO(
+            "email,assignment,score\n"
+            f"{self.students[1].email},Homework,\n"
+            f"{self.students[2].email},Homework,40\n"
+        ))
+        self.assertEqual(self.assignment_counts(), (3, 3, 2, Decimal("100")))
+
+    def test_import_counts_grades_written_after_parsing(self):
+        from grades.importer import GradeImporter
+
+        Enrollment.objects.create(course=self.course, student=self.students[0])
+        submission = Submission.objects.create(assignment=self.assignment, student=self.students[0], content="A")
+        resolve_keys = GradeImporter.resolve_keys
+
+        def resolve_then_grade(importer):
+            keys = resolve_keys(importer)
+            # Another request grades the submission while the file is parsed
+            Grade.objects.create(submission=submission, instructor=self.instructor, score=30, letter="F")
+            return keys
+
+        with mock.patch.object(GradeImporter, "resolve_keys", resolve_then_grade):
+            result = GradeImporter(self.course, self.instructor).run(StringIO(
+                f"email,assignment,score\n{self.students[0].email},Homework,40\n"
+            ))
+        self.assertEqual((result["created"], result["updated"]), (0, 1))
+        self.assertEqual(self.assignment_counts(), (1, 1, 1, Decimal("40")))
+
+    @skipUnless(connection.vendor == "postgresql", "row locks need PostgreSQL")
+    def test_grade_writes_lock_the_submission(self):
+        submission = Submission.objects.create(assignment=self.assignment, student=self.students[0], content="A")
+        with CaptureQueriesContext(connection) as queries:
+            Grade.objects.create(submission=submission, instructor=self.instructor, score=30, letter="F")
+        self.assertTrue(any("FOR UPDATE" in query["sql"] for query in queries))
+        client = APIClient()
+        client.force_authenticate(user=self.instructor)
+        with CaptureQueriesContext(connection) as queries:
+            client.post("/api/grades/bulk/", {"grades": [{"submission": submission.pk, "score": 60}]}, format="json")
+        self.assertTrue(any("FOR UPDATE" in query["sql"] for query in queries))
+        self.assertEqual(self.assignment_counts(), (1, 1, 1, Decimal("60")))
+
+    def test_stats_read_counters(self):
+        Course.objects.filter(pk=self.course.pk).update(enrollment_count=7, assignment_count=4)
+        Assignment.objects.filter(pk=self.assignment.pk).update(
+            submission_count=5, graded_count=3, scored_count=2, score_sum=Decimal("150")
+        )
+        row = stats.instructor_stats(self.instructor)["course_breakdown"][0]
+        self.assertEqual(
+            (row["assignments_count"], row["submissions_count"], row["grades_count"], row["average_score"]),
+            (4, 5, 3, 75.0),
+        )
+        self.assertEqual(stats.enrollment_counts()["Math 101"], 7)
+        self.assertEqual(stats.admin_stats()["total_submissions"], 5)
+
+    def test_reconcile_command(self):
+        Enrollment.objects.create(course=self.course, student=self.students[0])
+        submission = Submission.objects.create(assignment=self.assignment, student=self.students[0], content="A")
+        Grade.objects.create(submission=submission, instructor=self.instructor, score=88, letter="B")
+        expected = (self.course_counts(), self.assignment_counts())
+        Course.objects.update(enrollment_count=9)
+        Assignment.objects.update(score_sum=1)
+
+        out = StringIO()
+        call_command("reconcile_counters", "--check", stdout=out)
+        self.assertIn("1 courses checked: 1 drifted", out.getvalue())
+        self.assertIn("1 assignments checked: 1 drifted", out.getvalue())
+        self.assertEqual(self.course_counts()[0], 9)
+
+        call_command("reconcile_counters", stdout=StringIO())
+        self.assertEqual((self.course_counts(), self.assignment_counts()), expected)
+        out = StringIO()
+        call_command("reconcile_counters", stdout=out)
+        self.assertNotIn("Reconciled", out.getvalue())
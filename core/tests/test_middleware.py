@@ -0,0 +1,82 @@
+import json
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from assignments.models import Assignment, Submission
+from core.middleware import QueryProfilerMiddleware
+from courses.models import Course
+from grades.models import Grade
+
+
+@override_settings(QUERY_PROFILER_ENABLED=True, QUERY_PROFILER_DUPLICATES=False)
+class QueryProfilerMiddlewareTests(TestCase):
+    """
+    Tests for the Server-Timing header, the request log line and duplicate query reports.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = CustomUser.objects.create_user(
+            email="admin@example.com", password="password123", role="admin"
+        )
+        for i in range(3):
+            Course.objects.create(title=f"Course {i}", instructor=self.admin)
+        self.client.force_authenticate(user=self.admin)
+
+    def test_server_timing_header(self):
+        response = self.client.get("/api/courses/")
+        timing = response["Server-Timing"]
+        for metric in ("db;dur=", "serializer;dur=", "render;dur=", "total;dur="):
+            self.assertIn(metric, timing)
+        self.assertRegex(timing, r'desc="[1-9]\d* queries"')
+
+    def test_structured_log_line(self):
+        with self.assertLogs("lms.profiler", level="INFO") as logs:
+            self.client.get("/api/courses/")
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record["event"], "request_profile")
+        self.assertEqual(record["path"], "/api/courses/")
+        self.assertEqual(record["status"], 200)
+        self.assertGreater(record["queries"], 0)
+        self.assertGreater(record["serializer_ms"], 0)
+        for key in ("sql_ms", "render_ms", "total_ms"):
+            self.assertGreaterEqual(record[key], 0)
+
+    def test_compiled_lists_report_serializer_time(self):
+        student = CustomUser.objects.create_user(email="student@example.com", password="password123", role="student")
+        assignment = Assignment.objects.create(
+            course=Course.objects.first(), title="Homework", due_date=timezone.now(), created_by=self.admin
+        )
+        submission = Submission.objects.create(assignment=assignment, student=student, content="A")
+        Grade.objects.create(submission=submission, instructor=self.admin, score=90, letter="A")
+        with self.assertLogs("lms.profiler", level="INFO") as logs:
+            response = self.client.get("/api/grades/")
+        self.assertEqual(len(response.data["results"] if isinstance(response.data, dict) else response.data), 1)
+        self.assertGreater(json.loads(logs.records[-1].getMessage())["serializer_ms"], 0)
+
+    @override_settings(QUERY_PROFILER_DUPLICATES=True, QUERY_PROFILER_DUPLICATE_THRESHOLD=3)
+    def test_duplicate_queries_are_reported_with_stack(self):
+        def n_plus_one(request):
+            for course in Course.objects.all():
+                CustomUser.objects.get(pk=course.instructor_id)
+            return HttpResponse("ok")
+
+        middleware = QueryProfilerMiddleware(n_plus_one)
+        with self.assertLogs("lms.profiler", level="WARNING") as logs:
+            middleware(RequestFactory().get("/n-plus-one/"))
+        warnings = [json.loads(record.getMessage()) for record in logs.records if record.levelname == "WARNING"]
+        self.assertEqual(len(warnings), 1)
+        self.assertEqual(warnings[0]["count"], 3)
+        self.assertIn("accounts_customuser", warnings[0]["sql"])
+        self.assertTrue(any("test_middleware.py" in frame and "n_plus_one" in frame for frame in warnings[0]["stack"]))
+
+    @override_settings(QUERY_PROFILER_ENABLED=False)
+    def test_disabled(self):
+        response = self.client.get("/api/courses/")
+        self.assertFalse(response.has_header("Server-Timing"))
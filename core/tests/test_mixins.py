@@ -0,0 +1,128 @@
+import json
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from assignments.models import Assignment, Submission
+from core.cache import invalidate_instances
+from core.mixins import StreamingListMixin
+from core.versions import bump_versions
+from courses.models import Course, Enrollment
+from grades.models import Grade
+from grades.views import GradeViewSet
+
+
+class StreamingListMixinTests(TestCase):
+    """
+    Tests for the ?stream=true list mode on the submissions, grades and enrollments endpoints.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = CustomUser.objects.create_user(
+            email="admin@example.com", password="password123", role="admin"
+        )
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.course = Course.objects.create(title="Math 101", instructor=self.instructor)
+        assignment = Assignment.objects.create(course=self.course, title="Homework", due_date=timezone.now())
+        for i in range(7):
+            student = CustomUser.objects.create_user(
+                email=f"student{i}@example.com", password="password123", role="student"
+            )
+            Enrollment.objects.create(course=self.course, student=student)
+            submission = Submission.objects.create(assignment=assignment, student=student, content=f"Answer {i}")
+            Grade.objects.create(submission=submission, instructor=self.instructor, score=70 + i, letter="B")
+        self.client.force_authenticate(user=self.admin)
+
+    def streamed(self, url):
+        response = self.client.get(url, {"stream": "true"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return json.loads(b"".join(response.streaming_content))
+
+    def test_stream_matches_regular_list(self):
+        for url in ["/api/submissions/", "/api/grades/", "/api/enrollments/"]:
+            regular = self.client.get(url).json()
+            self.assertEqual(self.streamed(url), regular, url)
+            self.assertEqual(len(regular), 7)
+
+    def test_stream_across_several_chunks(self):
+        original = GradeViewSet.stream_chunk_size
+        GradeViewSet.stream_chunk_size = 3
+        try:
+            self.assertEqual(len(self.streamed("/api/grades/")), 7)
+        finally:
+            GradeViewSet.stream_chunk_size = original
+
+    def test_stream_empty_queryset(self):
+        Grade.objects.all().delete()
+        self.assertEqual(self.streamed("/api/grades/"), [])
+
+    def test_without_param_is_not_streamed(self):
+        response = self.client.get("/api/grades/")
+        self.assertFalse(response.streaming)
+        self.assertTrue(issubclass(GradeViewSet, StreamingListMixin))
+
+
+class ConditionalGetMixinTests(TestCase):
+    """
+    Tests for ETag / If-None-Match handling driven by core.versions.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.student = CustomUser.objects.create_user(
+            email="student@example.com", password="password123", role="student"
+        )
+        self.course = Course.objects.create(title="Math 101", instructor=self.instructor)
+        Enrollment.objects.create(course=self.course, student=self.student)
+        self.assignment = Assignment.objects.create(course=self.course, title="Homework", due_date=timezone.now())
+        self.client.force_authenticate(user=self.student)
+
+    def test_not_modified_without_querying_tables(self):
+        for url in ["/api/courses/", "/api/assignments/", "/dashboard/student/"]:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+            etag = response["ETag"]
+            # auth is forced, so the only query left is the version lookup
+            with self.assertNumQueries(1):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED, url)
+            self.assertEqual(response["ETag"], etag)
+            self.assertEqual(response.content, b"")
+
+    def test_write_changes_etag(self):
+        etag = self.client.get("/dashboard/student/")["ETag"]
+        submission = Submission.objects.create(assignment=self.assignment, student=self.student, content="A")
+        response = self.client.get("/dashboard/student/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+        etag = response["ETag"]
+        Grade.objects.create(submission=submission, instructor=self.instructor, score=90)
+        response = self.client.get("/dashboard/student/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["grades_count"], 1)
+
+    def test_etag_is_per_user_and_query(self):
+        etag = self.client.get("/api/courses/")["ETag"]
+        self.assertNotEqual(self.client.get("/api/courses/", {"ordering": "x"})["ETag"], etag)
+        self.client.force_authenticate(user=self.instructor)
+        self.assertNotEqual(self.client.get("/api/courses/")["ETag"], etag)
+
+    def test_bump_versions_for_bulk_writes(self):
+        etag = self.client.get("/api/assignments/")["ETag"]
+        Assignment.objects.filter(pk=self.assignment.pk).update(title="Renamed")
+        bump_versions(Assignment)
+        invalidate_instances([self.assignment])
+        response = self.client.get("/api/assignments/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["title"], "Renamed")
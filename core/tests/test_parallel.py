@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from analytics import stats
+from analytics.views import AnalyticsLogViewSet
+from core.middleware import RequestProfile, _current_profile
+from core.parallel import gather
+from courses.models import Course
+from dashboard.views import InstructorDashboardView
+
+
+def slow_count(delay=0.3):
+    time.sleep(delay)
+    return threading.get_ident(), Course.objects.count()
+
+
+class GatherTests(TransactionTestCase):
+    """
+    Tests for core.parallel.gather outside a transaction: calls overlap on pool threads.
+    """
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        Course.objects.create(title="Math 101", instructor=self.instructor)
+
+    def test_calls_run_concurrently(self):
+        start = time.perf_counter()
+        results = async_to_sync(gather)(slow_count, slow_count, slow_count)
+        elapsed = time.perf_counter() - start
+        self.assertEqual([count for _, count in results], [1, 1, 1])
+        self.assertEqual(len({ident for ident, _ in results}), 3)
+        self.assertLess(elapsed, 0.8)  # 0.9s when run one after another
+
+    def test_pool_queries_reach_the_request_profile(self):
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        try:
+            async_to_sync(gather)(slow_count, slow_count, slow_count)
+        finally:
+            _current_profile.reset(token)
+        self.assertEqual(profile.queries, 3)
+        self.assertGreater(profile.sql_ms, 0)
+
+    @override_settings(ASYNC_CONCURRENT_QUERIES=False)
+    def test_disabled(self):
+        results = async_to_sync(gather)(slow_count, slow_count)
+        self.assertEqual(len({ident for ident, _ in results}), 1)
+
+    def test_admin_analytics_match_sync_stats(self):
+        admin = CustomUser.objects.create_user(email="admin@example.com", password="password123", role="admin")
+        client = APIClient()
+        client.force_authenticate(user=admin)
+        response = client.get("/analytics/admin/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = stats.admin_stats(enrollment_relation="course_enrollments")
+        self.assertEqual(response.data["total_courses"], expected["total_courses"])
+        self.assertEqual(response.data["total_instructors"], 1)
+
+
+class GatherInTransactionTests(TestCase):
+    def test_inline_on_caller_thread(self):
+        instructor = CustomUser.objects.create_user(email="i@example.com", password="password123", role="instructor")
+        Course.objects.create(title="Uncommitted", instructor=instructor)
+        results = async_to_sync(gather)(slow_count, lambda: "done")
+        # The caller's uncommitted row is visible: the calls ran on its connection
+        self.assertEqual(results, [(threading.get_ident(), 1), "done"])
+        self.assertEqual(async_to_sync(gather)(), [])
+
+
+class AsyncViewTests(SimpleTestCase):
+    def test_views_are_async(self):
+        self.assertTrue(asyncio.iscoroutinefunction(InstructorDashboardView.as_view()))
+        self.assertTrue(asyncio.iscoroutinefunction(AnalyticsLogViewSet.as_view({"get": "admin"})))
+
+    def test_asgi_application(self):
+        from lms_backend.asgi import application
+
+        self.assertIsInstance(application, ASGIHandler)
+
+
+class AsyncDashboardTests(TestCase):
+    def test_instructor_dashboard(self):
+        instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        Course.objects.create(title="Math 101", instructor=instructor)
+        self.client = APIClient()
+        self.client.force_authenticate(user=instructor)
+        response = self.client.get("/dashboard/instructor/", {"include": "courses"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["courses_taught"], 1)
+        self.assertEqual(response.data["courses"]["results"][0]["title"], "Math 101")
+        response = self.client.get("/dashboard/instructor/", {"include": "nope"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
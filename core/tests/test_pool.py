@@ -0,0 +1,145 @@
+import runpy
+from pathlib import Path
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.test import SimpleTestCase, TestCase
+
+from core.pooled_postgresql import base
+
+
+class FakePool:
+    """
+    The part of psycopg_pool.ConnectionPool the backend uses.
+    """
+
+    def __init__(self, kwargs, open, check, name, min_size=1, max_size=4, **options):
+        self.kwargs, self.check, self.name = kwargs, check, name
+        self.min_size, self.max_size = min_size, max_size
+        self.opened, self.out = False, []
+
+    @staticmethod
+    def check_connection(conn):
+        pass
+
+    def open(self):
+        self.opened = True
+
+    def getconn(self):
+        connection = mock.Mock(_pool=self)
+        self.out.append(connection)
+        return connection
+
+    def putconn(self, connection):
+        self.out.remove(connection)
+
+    def close(self):
+        self.opened = False
+
+    def get_stats(self):
+        return {
+            "pool_min": self.min_size, "pool_max": self.max_size, "pool_size": 2,
+            "pool_available": 2 - len(self.out), "requests_num": 4, "requests_wait_ms": 10,
+        }
+
+
+def wrapper(alias="default", **overrides):
+    settings_dict = {
+        "ENGINE": "core.pooled_postgresql", "NAME": "lms", "USER": "lms", "PASSWORD": "", "HOST": "db",
+        "PORT": "5432", "OPTIONS": {"pool": {"min_size": 1, "max_size": 4}}, "CONN_MAX_AGE": 0,
+        "CONN_HEALTH_CHECKS": True, "TIME_ZONE": None, "AUTOCOMMIT": True, "ATOMIC_REQUESTS": False, "TEST": {},
+    }
+    settings_dict.update(overrides)
+    return base.DatabaseWrapper(settings_dict, alias)
+
+
+@mock.patch.object(base, "ConnectionPool", FakePool)
+class PooledBackendTests(SimpleTestCase):
+    def tearDown(self):
+        base.DatabaseWrapper._pools.clear()
+
+    def test_pool_created_once_per_alias(self):
+        connection = wrapper()
+        state = connection.pool_state
+        self.assertIs(wrapper().pool_state, state)
+        self.assertIsNot(wrapper(alias="replica").pool_state, state)
+        self.assertEqual(state.pool.max_size, 4)
+        self.assertIsNotNone(state.pool.check)
+        self.assertNotIn("pool", state.pool.kwargs)
+        self.assertTrue(state.pool.kwargs["autocommit"])
+
+    def test_checkout_and_return(self):
+        connection = wrapper()
+        connection.connection = connection.get_new_connection(connection.get_connection_params())
+        pool = connection.pool_state.pool
+        self.assertTrue(pool.opened)
+        metrics = connection.pool_metrics()
+        self.assertEqual(metrics["in_use"], 1)
+        self.assertEqual(metrics["occupancy"], 0.25)
+        self.assertEqual(metrics["checkouts"], 1)
+        self.assertEqual(metrics["avg_wait_ms"], 2.5)
+        connection._close()
+        self.assertIsNone(connection.connection)
+        self.assertEqual(pool.out, [])
+        self.assertEqual(connection.pool_metrics()["in_use"], 0)
+
+    def test_not_pooled(self):
+        self.assertIsNone(wrapper(OPTIONS={}).pool_state)
+        self.assertIsNone(wrapper(OPTIONS={}).pool_metrics())
+        self.assertIsNone(wrapper(alias=NO_DB_ALIAS).pool_state)
+
+    def test_requires_conn_max_age_zero(self):
+        with self.assertRaises(ImproperlyConfigured):
+            wrapper(CONN_MAX_AGE=60).pool_state
+
+    def test_requires_psycopg_pool(self):
+        with mock.patch.object(base, "ConnectionPool", None), self.assertRaises(ImproperlyConfigured):
+            wrapper().pool_state
+
+
+class PoolBudgetSettingsTests(SimpleTestCase):
+    """
+    The per-process connection budget is split between the aliases on one database server.
+    """
+
+    def load_settings(self, **env):
+        env = {"USE_LOCAL_DB": "True", "DB_MAX_CONNECTIONS": "80", "WEB_CONCURRENCY": "4", **env}
+        settings_path = Path(__file__).resolve().parents[2] / "lms_backend" / "settings.py"
+        with mock.patch.dict("os.environ", env, clear=True):
+            return runpy.run_path(str(settings_path))["DATABASES"]
+
+    def test_primary_alone_takes_the_whole_share(self):
+        databases = self.load_settings()
+        self.assertEqual(databases["default"]["OPTIONS"]["pool"]["max_size"], 20)
+
+    def test_replica_on_the_same_server_splits_the_share(self):
+        databases = self.load_settings(DB_REPLICA_NAME="lms_local_replica")
+        self.assertEqual(databases["default"]["OPTIONS"]["pool"]["max_size"], 10)
+        self.assertEqual(databases["replica"]["OPTIONS"]["pool"]["max_size"], 10)
+
+    def test_replica_on_another_server_has_its_own_share(self):
+        databases = self.load_settings(DB_REPLICA_HOSTS="replica-1.internal")
+        self.assertEqual(databases["default"]["OPTIONS"]["pool"]["max_size"], 20)
+        self.assertEqual(databases["replica"]["OPTIONS"]["pool"]["max_size"], 20)
+
+    def test_explicit_max_size_is_kept(self):
+        databases = self.load_settings(DB_REPLICA_NAME="lms_local_replica", DB_POOL_MAX_SIZE="15")
+        self.assertEqual(databases["default"]["OPTIONS"]["pool"]["max_size"], 15)
+        self.assertEqual(databases["replica"]["OPTIONS"]["pool"]["max_size"], 15)
+
+
+class HealthCheckTests(TestCase):
+    def test_reports_databases(self):
+        response = self.client.get("/accounts/health/")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["status"], "ok")
+        default = data["databases"]["default"]
+        self.assertEqual(default["vendor"], connection.vendor)
+        if getattr(connection, "pool_state", None) is None:
+            self.assertIsNone(default["pool"])
+        else:
+            self.assertGreaterEqual(default["pool"]["checkouts"], 1)
+            self.assertLessEqual(default["pool"]["occupancy"], 1)
@@ -0,0 +1,90 @@
+import datetime
+import io
+import json
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import CustomUser
+from assignments.models import Assignment, Submission
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+from courses.models import Course, Enrollment
+from grades.models import Grade
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    """
+    FastJSONRenderer must produce the same bytes as DRF's JSONRenderer.
+    """
+
+    def assertSameRender(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_decimal_datetime_and_lazy_strings(self):
+        self.assertSameRender({
+            "score": Decimal("92.50"),
+            "grade": Decimal("0.10"),
+            "graded_at": datetime.datetime(2026, 1, 31, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            "naive": datetime.datetime(2026, 1, 31, 12, 30),
+            "due": datetime.date(2026, 1, 31),
+            "detail": gettext_lazy("Not found."),
+            "nested": [{"letter": "A-", "unicode": "Übung ✓"}],
+        })
+
+    def test_non_string_keys_and_separators(self):
+        self.assertSameRender({1: "one", None: "none", "text": "line\u2028break\u2029"})
+
+    def test_none_renders_empty(self):
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_big_integers_fall_back_to_stdlib(self):
+        self.assertSameRender({"big": 2 ** 70})
+
+    def test_indent_falls_back_to_stdlib(self):
+        data = {"a": [1, 2]}
+        self.assertEqual(
+            FastJSONRenderer().render(data, "application/json; indent=4"),
+            JSONRenderer().render(data, "application/json; indent=4"),
+        )
+
+
+class FastJSONParserTests(SimpleTestCase):
+    def test_parses_like_stdlib(self):
+        body = json.dumps({"score": 85.5, "letter": "B", "feedback": "Gut ✓"}).encode()
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+
+    def test_invalid_json_raises_parse_error(self):
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b"{not json"))
+
+
+class BenchRenderersCommandTests(TestCase):
+    def test_command_reports_every_dashboard(self):
+        instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        student = CustomUser.objects.create_user(
+            email="student@example.com", password="password123", role="student"
+        )
+        CustomUser.objects.create_user(email="admin@example.com", password="password123", role="admin")
+        course = Course.objects.create(title="Math 101", instructor=instructor)
+        Enrollment.objects.create(course=course, student=student)
+        assignment = Assignment.objects.create(course=course, title="Homework", due_date=timezone.now())
+        submission = Submission.objects.create(assignment=assignment, student=student, content="A")
+        Grade.objects.create(submission=submission, instructor=instructor, score=Decimal("88.25"), letter="B")
+
+        out = StringIO()
+        call_command("bench_renderers", "--iterations", "2", stdout=out)
+        for role in ["student", "instructor", "admin"]:
+            self.assertIn(role, out.getvalue())
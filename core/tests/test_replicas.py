@@ -0,0 +1,131 @@
+import datetime
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from core import replicas
+from core.models import RecentWrite
+from core.parallel import gather
+from courses.models import Course
+
+
+@override_settings(ASYNC_CONCURRENT_QUERIES=False)  # keep the queries on the captured connections
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Reads of the designated views go to the "replica" alias (a second connection
+    to the test database) unless the user just wrote or the replica lags.
+    """
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        replicas._lag_checked.clear()
+        cache.clear()
+        self.admin = CustomUser.objects.create_user(
+            email="admin@example.com", password="password123", role="admin", is_staff=True, is_superuser=True
+        )
+        Course.objects.create(title="Math 101", instructor=self.admin)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def replica_queries(self, path):
+        with CaptureQueriesContext(connections["replica"]) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def queries_sql(self, path, alias="default"):
+        with CaptureQueriesContext(connections[alias]) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return " ".join(query["sql"] for query in queries)
+
+    def test_dashboard_reads_from_replica(self):
+        self.assertGreater(self.replica_queries("/dashboard/admin/"), 0)
+
+    def test_undesignated_views_read_from_primary(self):
+        self.assertEqual(self.replica_queries("/api/courses/"), 0)
+
+    def test_read_your_writes(self):
+        response = self.client.post("/api/courses/", {"title": "Physics 101"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        cache.clear()  # another worker process, with its own local cache
+        self.assertEqual(self.replica_queries("/dashboard/admin/"), 0)
+        # The sticky window has passed
+        RecentWrite.objects.update(written_at=timezone.now() - datetime.timedelta(minutes=1))
+        self.assertGreater(self.replica_queries("/dashboard/admin/"), 0)
+
+    def test_failed_sticky_mark_keeps_the_write(self):
+        recent_write = mock.Mock(**{"objects.using.return_value.bulk_create.side_effect": DatabaseError})
+        with mock.patch.object(replicas, "RecentWrite", recent_write), self.assertLogs("lms.replicas", "WARNING"):
+            response = self.client.post("/api/courses/", {"title": "Physics 101"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Course.objects.filter(title="Physics 101").exists())
+
+    def test_etag_and_cache_tags_read_with_the_body(self):
+        student = CustomUser.objects.create_user(email="student@example.com", password="password123", role="student")
+        self.client.force_authenticate(user=student)
+        self.assertNotIn("core_tableversion", self.queries_sql("/dashboard/student/"))
+        self.assertNotIn("core_cachetag", self.queries_sql("/analytics/student/"))
+
+    def test_student_summary_computed_on_primary(self):
+        student = CustomUser.objects.create_user(email="student@example.com", password="password123", role="student")
+        self.client.force_authenticate(user=student)
+        # A summary built from lagging replica rows would be stored as current
+        self.assertNotIn("dashboard_studentsummary", self.queries_sql("/dashboard/student/", "replica"))
+        self.assertNotIn("dashboard_studentsummary", self.queries_sql("/dashboard/student/", "replica"))
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        with mock.patch.object(replicas, "measure_lag", return_value=60.0) as measure_lag:
+            self.assertEqual(self.replica_queries("/dashboard/admin/"), 0)
+            self.assertEqual(self.replica_queries("/dashboard/admin/"), 0)
+        measure_lag.assert_called_once_with("replica")  # cached for REPLICA_LAG_CHECK_INTERVAL
+
+    def test_admin_list_page(self):
+        self.client.force_login(self.admin)
+        self.assertGreater(self.replica_queries("/admin/courses/course/"), 0)
+
+    @override_settings(ASYNC_CONCURRENT_QUERIES=True)
+    def test_gather_threads_follow_the_request(self):
+        state, token = replicas.start_request()
+        try:
+            state.alias = "replica"
+            results = async_to_sync(gather)(
+                lambda: Course.objects.get(title="Math 101")._state.db,
+                lambda: Course.objects.get(title="Math 101")._state.db,
+            )
+        finally:
+            replicas.end_request(token)
+        self.assertEqual(results, ["replica", "replica"])
+
+    def test_writes_go_to_primary(self):
+        state, token = replicas.start_request()
+        try:
+            state.alias = "replica"
+            course = Course.objects.get(title="Math 101")
+            self.assertEqual(course._state.db, "replica")
+            course.title = "Math 102"
+            course.save()
+            self.assertTrue(state.wrote)
+            # Later reads in the request see the write
+            self.assertEqual(Course.objects.get(pk=course.pk)._state.db, "default")
+        finally:
+            replicas.end_request(token)
+
+
+class ReplicaInTransactionTests(TestCase):
+    def test_primary_inside_transaction(self):
+        request = RequestFactory().get("/dashboard/admin/")
+        state, token = replicas.start_request()
+        try:
+            self.assertIsNone(replicas.route_reads(request))
+            self.assertIsNone(state.alias)
+        finally:
+            replicas.end_request(token)
@@ -0,0 +1,105 @@
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import CustomUser
+from assignments.models import Assignment
+from core import search
+from core.models import SearchDocument
+from courses.models import Course, Enrollment, Module
+
+
+class SearchIndexTests(TestCase):
+    """
+    Tests for core.search: documents follow saves and deletes, and rebuild() matches them.
+    """
+
+    def setUp(self):
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.admin = CustomUser.objects.create_user(email="admin@example.com", password="password123", role="admin")
+        self.course = Course.objects.create(
+            title="Astronomy", description="Stars and galaxies", instructor=self.instructor
+        )
+
+    def titles(self, query):
+        return [document.title for document in search.search(self.admin, query)]
+
+    def test_kept_in_sync(self):
+        module = Module.objects.create(course=self.course, title="Telescopes", content="Refracting lenses")
+        self.assertEqual(self.titles("lenses"), ["Telescopes"])
+        module.content = "Mirrors"
+        module.save()
+        self.assertEqual(self.titles("lenses"), [])
+        self.assertEqual(self.titles("mirrors"), ["Telescopes"])
+        module.delete()
+        self.assertEqual(self.titles("mirrors"), [])
+
+    def test_course_delete_removes_documents(self):
+        Assignment.objects.create(course=self.course, title="Star chart", due_date=timezone.now())
+        self.course.delete()
+        self.assertFalse(SearchDocument.objects.exists())
+
+    def test_rebuild(self):
+        Assignment.objects.create(course=self.course, title="Star chart", due_date=timezone.now())
+        before = set(SearchDocument.objects.values_list("kind", "object_id", "title", "body"))
+        self.assertEqual(search.rebuild(), 2)
+        self.assertEqual(set(SearchDocument.objects.values_list("kind", "object_id", "title", "body")), before)
+        self.assertEqual(self.titles("chart"), ["Star chart"])
+
+    def test_query_syntax_is_escaped(self):
+        self.assertEqual(self.titles('stars*" (^'), ["Astronomy"])
+        self.assertEqual(self.titles("***"), [])
+
+    def test_stemming_and_ranking(self):
+        Module.objects.create(course=self.course, title="Reading list", content="A galaxy catalogue")
+        Assignment.objects.create(course=self.course, title="Galaxy survey", due_date=timezone.now())
+        # Title matches rank above body matches
+        self.assertEqual(self.titles("galaxy")[0], "Galaxy survey")
+        self.assertEqual(set(self.titles("galaxy")), {"Galaxy survey", "Reading list", "Astronomy"})
+
+
+class SearchViewTests(APITestCase):
+    """
+    Tests for GET /api/search/: role scoping and parameter validation.
+    """
+
+    def setUp(self):
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.other_instructor = CustomUser.objects.create_user(
+            email="other@example.com", password="password123", role="instructor"
+        )
+        self.student = CustomUser.objects.create_user(email="s@example.com", password="password123", role="student")
+        self.admin = CustomUser.objects.create_user(email="admin@example.com", password="password123", role="admin")
+        self.mine = Course.objects.create(title="Biology", description="Cells", instructor=self.instructor)
+        self.theirs = Course.objects.create(title="Cell chemistry", instructor=self.other_instructor)
+        Module.objects.create(course=self.theirs, title="Membranes", content="Cell walls")
+        Enrollment.objects.create(course=self.mine, student=self.student)
+
+    def found(self, user, **params):
+        self.client.force_authenticate(user=user)
+        response = self.client.get("/api/search/", {"q": "cell", **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {(row["type"], row["title"]) for row in response.data["results"]}
+
+    def test_scoping(self):
+        self.assertEqual(self.found(self.instructor), {("course", "Biology")})
+        self.assertEqual(self.found(self.student), {("course", "Biology")})
+        self.assertEqual(self.found(self.other_instructor), {("course", "Cell chemistry"), ("module", "Membranes")})
+        self.assertEqual(len(self.found(self.admin)), 3)
+
+    def test_type_and_limit(self):
+        self.assertEqual(self.found(self.admin, type="module"), {("module", "Membranes")})
+        self.assertEqual(len(self.found(self.admin, limit=1)), 1)
+
+    def test_validation(self):
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self.client.get("/api/search/").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get("/api/search/", {"q": "x", "type": "grade"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/search/", {"q": "x", "limit": "500"}).status_code, 400)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get("/api/search/", {"q": "x"}).status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,119 @@
+import json
+
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.models import CustomUser
+from assignments.models import Assignment, Submission
+from core.sparse import parse_paths
+from courses.models import Course, Enrollment
+from grades.models import Grade
+
+
+class ParsePathsTests(SimpleTestCase):
+    def test_parse(self):
+        self.assertEqual(
+            parse_paths("id, course.title,course.id,,student"),
+            {"id": None, "course": {"title": None, "id": None}, "student": None},
+        )
+        self.assertEqual(parse_paths("course.title,course"), {"course": None})
+        self.assertEqual(parse_paths("course,course.title"), {"course": None})
+
+
+class SparseFieldsTests(APITestCase):
+    """
+    Tests for ?fields= and ?expand= on the viewsets (core.sparse).
+    """
+
+    def setUp(self):
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.student = CustomUser.objects.create_user(email="s@example.com", password="password123", role="student")
+        self.admin = CustomUser.objects.create_user(email="admin@example.com", password="password123", role="admin")
+        self.course = Course.objects.create(title="Math 101", description="Numbers", instructor=self.instructor)
+        self.enrollment = Enrollment.objects.create(course=self.course, student=self.student)
+        assignment = Assignment.objects.create(course=self.course, title="Homework", due_date=timezone.now())
+        self.submission = Submission.objects.create(assignment=assignment, student=self.student, content="Long essay")
+        self.grade = Grade.objects.create(submission=self.submission, instructor=self.instructor, score=90, letter="A")
+        self.client.force_authenticate(user=self.admin)
+
+    def rows(self, response):
+        data = response.data
+        return data["results"] if isinstance(data, dict) and "results" in data else data
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        sql = " ".join(query["sql"] for query in ctx.captured_queries if "grades_grade" in query["sql"]
+                       or "courses_enrollment" in query["sql"])
+        return self.rows(response), sql
+
+    def test_default_is_unchanged(self):
+        rows, _ = self.get("/api/grades/")
+        self.assertEqual(rows[0]["submission_detail"]["content"], "Long essay")
+        self.assertEqual(rows[0]["instructor"]["email"], "instructor@example.com")
+
+    def test_fields_prune_columns(self):
+        rows, sql = self.get("/api/grades/", fields="id,score,submission_detail.id,submission_detail.grade")
+        self.assertEqual(rows, [{"id": self.grade.pk, "score": "90.00",
+                                 "submission_detail": {"id": self.submission.pk, "grade": "90.00"}}])
+        self.assertNotIn('"content"', sql)
+        self.assertNotIn("accounts_customuser", sql)
+
+    def test_expand_collapses_to_ids(self):
+        rows, sql = self.get("/api/grades/", expand="instructor")
+        row = rows[0]
+        self.assertNotIn("submission_detail", row)
+        self.assertEqual(row["student"], self.student.pk)
+        self.assertEqual(row["instructor"]["email"], "instructor@example.com")
+        self.assertNotIn('"content"', sql)
+
+    def test_method_field_sources(self):
+        rows, sql = self.get("/api/enrollments/", fields="id,course_detail")
+        self.assertEqual(rows, [{"id": self.enrollment.pk, "course_detail": {
+            "id": self.course.pk, "title": "Math 101", "description": "Numbers"}}])
+        self.assertNotIn("accounts_customuser", sql)
+        rows, _ = self.get("/api/enrollments/", expand="")
+        self.assertEqual(rows[0]["student"], self.student.pk)
+        self.assertNotIn("course_detail", rows[0])
+
+    def test_other_viewsets(self):
+        rows, _ = self.get("/api/courses/", fields="title,instructor.email")
+        self.assertEqual(rows, [{"title": "Math 101", "instructor": {"email": "instructor@example.com"}}])
+        rows, _ = self.get("/api/assignments/", fields="title,course_title")
+        self.assertEqual(rows, [{"title": "Homework", "course_title": "Math 101"}])
+        response = self.client.get("/api/submissions/", {"fields": "id,assignment_title", "stream": "true"})
+        rows = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(rows, [{"id": self.submission.pk, "assignment_title": "Homework"}])
+        rows, _ = self.get("/api/users/", fields="email", expand="")
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(set(rows[0]), {"email"})
+        rows, _ = self.get("/api/users/", fields="email,profile.location")
+        self.assertEqual(set(rows[0]), {"email", "profile"})
+        response = self.client.get(f"/api/grades/{self.grade.pk}/", {"fields": "letter"})
+        self.assertEqual(response.data, {"letter": "A"})
+        rows, _ = self.get("/accounts/users/", fields="email", expand="")
+        self.assertEqual(set(rows[0]), {"email"})
+        rows, _ = self.get("/accounts/users/", fields="role,profile.location")
+        self.assertEqual(set(rows[0]), {"role", "profile"})
+        rows, _ = self.get("/accounts/profile/", fields="location")
+        self.assertEqual(set(rows[0]), {"location"})
+
+    def test_unknown_fields(self):
+        response = self.client.get("/api/grades/", {"fields": "id,secret"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.data)
+        response = self.client.get("/api/grades/", {"expand": "nothing"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_writes_use_full_serializer(self):
+        self.client.force_authenticate(user=self.instructor)
+        response = self.client.patch(f"/api/grades/{self.grade.pk}/?fields=id", {"letter": "B"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("submission_detail", response.data)
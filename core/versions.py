@@ -0,0 +1,49 @@
+import hashlib
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import TableVersion
+
+
+def version_key(model):
+    return model._meta.label_lower
+
+
+def bump_versions(*models):
+    """
+    Increment the change counter of each model.
+    Call this from bulk write paths that bypass model signals (bulk_create, queryset.update),
+    together with core.cache.invalidate_instances for the tagged response cache.
+    """
+    for model in models:
+        name = version_key(model)
+        if TableVersion.objects.filter(name=name).update(version=F("version") + 1):
+            continue
+        try:
+            with transaction.atomic():
+                TableVersion.objects.create(name=name, version=1)
+        except IntegrityError:
+            # Created concurrently; increment the row that won
+            TableVersion.objects.filter(name=name).update(version=F("version") + 1)
+
+
+def get_versions(models):
+    """
+    Return {label: version} for the given models in one query. Unknown tables are at version 0.
+    """
+    names = [version_key(model) for model in models]
+    versions = dict.fromkeys(names, 0)
+    versions.update(TableVersion.objects.filter(name__in=names).values_list("name", "version"))
+    return versions
+
+
+def compute_etag(models, *parts):
+    """
+    Strong ETag derived from the models' change counters plus any extra parts (user id, path...).
+    """
+    versions = get_versions(models)
+    payload = ";".join(
+        [f"{name}={version}" for name, version in sorted(versions.items())] + [str(part) for part in parts]
+    )
+    return '"%s"' % hashlib.sha1(payload.encode()).hexdigest()
@@ -0,0 +1,102 @@
+import csv
+import io
+import math
+from array import array
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+from rest_framework.renderers import BaseRenderer
+
+from assignments.models import Assignment
+from grades.models import Grade
+from .models import Enrollment
+
+
+def build_gradebook(course):
+    """
+    Students x assignments score matrix for a course.
+
+    Rows are the enrolled students ordered by id, columns the course assignments
+    ordered by due date. All scores come from one query over grades and are
+    pivoted into a dense array (NumPy when installed, array('d') otherwise);
+    missing grades are None.
+    """
+    students = list(
+        Enrollment.objects.filter(course=course).order_by("student_id")
+        .values_list("student_id", flat=True).distinct()
+    )
+    assignments = list(
+        Assignment.objects.filter(course=course).order_by("due_date", "pk").values_list("pk", flat=True)
+    )
+    cells = (
+        Grade.objects.filter(submission__assignment__course=course, score__isnull=False)
+        .order_by()
+        .annotate(value=Cast("score", FloatField()))
+        .values_list("submission__student_id", "submission__assignment_id", "value")
+    )
+    pivot = pivot_numpy if numpy is not None else pivot_array
+    return {
+        "course": course.pk,
+        "students": students,
+        "assignments": assignments,
+        "scores": pivot(students, assignments, cells),
+    }
+
+
+def pivot_numpy(students, assignments, cells):
+    matrix = numpy.full((len(students), len(assignments)), numpy.nan)
+    data = numpy.array(list(cells), dtype=float).reshape(-1, 3)
+    if len(data) and len(students) and len(assignments):
+        student_ids = numpy.array(students, dtype=float)  # already sorted
+        rows = numpy.searchsorted(student_ids, data[:, 0]).clip(0, len(students) - 1)
+        assignment_ids = numpy.array(assignments, dtype=float)
+        order = numpy.argsort(assignment_ids)
+        cols = order[numpy.searchsorted(assignment_ids[order], data[:, 1]).clip(0, len(assignments) - 1)]
+        # Grades of students who are no longer enrolled are dropped
+        known = (student_ids[rows] == data[:, 0]) & (assignment_ids[cols] == data[:, 1])
+        matrix[rows[known], cols[known]] = data[known, 2]
+    return numpy.where(numpy.isnan(matrix), None, matrix).tolist()
+
+
+def pivot_array(students, assignments, cells):
+    width = len(assignments)
+    matrix = array("d", [math.nan]) * (len(students) * width)
+    row_of = {pk: i * width for i, pk in enumerate(students)}
+    col_of = {pk: j for j, pk in enumerate(assignments)}
+    for student_id, assignment_id, value in cells:
+        row = row_of.get(student_id)
+        col = col_of.get(assignment_id)
+        if row is not None and col is not None:
+            matrix[row + col] = value
+    return [
+        [None if value != value else value for value in matrix[start:start + width]]
+        for start in range(0, len(matrix), width or 1)
+    ] if width else [[] for _ in students]
+
+
+class GradebookCSVRenderer(BaseRenderer):
+    """
+    Renders a gradebook as CSV: one row per student, one column per assignment id.
+    """
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not isinstance(data, dict) or "scores" not in data:
+            # Error responses (403, 404...) still go through this renderer
+            writer.writerow(["detail"])
+            writer.writerow([data.get("detail", "") if isinstance(data, dict) else data])
+            return buffer.getvalue().encode(self.charset)
+
+        writer.writerow(["student_id", *data["assignments"]])
+        for student_id, scores in zip(data["students"], data["scores"]):
+            writer.writerow([student_id, *("" if score is None else score for score in scores)])
+        return buffer.getvalue().encode(self.charset)
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.27 on 2026-10-17 07:58
+
+from django.db import migrations, models
+
+from core.counters import course_count_expressions, recount
+
+
+def backfill_counters(apps, schema_editor):
+    Course = apps.get_model("courses", "Course")
+    recount(
+        Course.objects.all(),
+        course_count_expressions(apps.get_model("courses", "Enrollment"), apps.get_model("assignments", "Assignment")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        ('assignments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='assignment_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='enrollment_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
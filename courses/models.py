@@ -15,6 +15,9 @@ class Course(models.Model):
         help_text="Instructor responsible for this course"
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # ✅ denormalized counters, maintained by core.counters
+    enrollment_count = models.IntegerField(default=0, editable=False)
+    assignment_count = models.IntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["title"]
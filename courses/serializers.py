@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from accounts.models import CustomUser
+from core.sparse import SparseSerializerMixin
 from .models import Course, Enrollment
 
 
-class UserNestedSerializer(serializers.ModelSerializer):
+class UserNestedSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     """
     Nested serializer to show basic user info.
     Used in Course and Enrollment serializers to avoid duplication.
@@ -14,7 +15,7 @@ class UserNestedSerializer(serializers.ModelSerializer):
         ref_name = "CoursesUserNested"   # ✅ unique schema name to avoid conflicts
 
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for Course model.
     Includes instructor details via nested serializer.
@@ -26,18 +27,19 @@ class CourseSerializer(serializers.ModelSerializer):
         fields = ("id", "title", "description", "instructor", "created_at")
         read_only_fields = ("instructor", "created_at")
         ref_name = "CoursesCourse"   # ✅ unique schema name
+        expandable_fields = {"instructor": "instructor_id"}
 
     def to_representation(self, instance):
         """
         Ensure null safety for nested instructor fields.
         """
         representation = super().to_representation(instance)
-        if not getattr(instance, "instructor", None):
+        if "instructor" in self.fields and instance.instructor_id is None:
             representation["instructor"] = None
         return representation
 
 
-class EnrollmentSerializer(serializers.ModelSerializer):
+class EnrollmentSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for Enrollment model.
     Student is set automatically, course is passed as a PK.
@@ -51,6 +53,8 @@ class EnrollmentSerializer(serializers.ModelSerializer):
         fields = ("id", "student", "course", "course_detail", "date_enrolled")
         read_only_fields = ("student", "date_enrolled")
         ref_name = "CoursesEnrollment"   # ✅ unique schema name
+        expandable_fields = {"student": "student_id", "course_detail": None}
+        method_field_sources = {"course_detail": ["course__id", "course__title", "course__description"]}
 
     def get_course_detail(self, obj):
         """
@@ -98,3 +102,12 @@ class EnrollmentSerializer(serializers.ModelSerializer):
         if not getattr(instance, "student", None):
             representation["student"] = None
         return representation
+
+
+class RosterSerializer(serializers.Serializer):
+    """
+    One course roster of a bulk enrollment request: students are ids or emails.
+    Students and courses are resolved set-wise by EnrollmentViewSet.roster.
+    """
+    course = serializers.IntegerField(min_value=1)
+    students = serializers.ListField(child=serializers.CharField(max_length=254), allow_empty=False)
@@ -0,0 +1,121 @@
+import datetime
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from assignments.models import Assignment, Submission
+from courses import gradebook
+from courses.models import Course, Enrollment
+from grades.models import Grade
+
+
+class GradebookTests(TestCase):
+    """
+    Tests for GET /api/courses/{id}/gradebook/.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.other_instructor = CustomUser.objects.create_user(
+            email="other@example.com", password="password123", role="instructor"
+        )
+        self.course = Course.objects.create(title="Math 101", instructor=self.instructor)
+        now = timezone.now()
+        # Created out of due-date order: columns follow the due date
+        self.late = Assignment.objects.create(course=self.course, title="Final", due_date=now + datetime.timedelta(days=9))
+        self.early = Assignment.objects.create(course=self.course, title="Quiz", due_date=now + datetime.timedelta(days=1))
+        self.students = []
+        for i in range(3):
+            student = CustomUser.objects.create_user(
+                email=f"student{i}@example.com", password="password123", role="student"
+            )
+            Enrollment.objects.create(course=self.course, student=student)
+            self.students.append(student)
+        self.grade(self.students[0], self.early, 90)
+        self.grade(self.students[0], self.late, 75.5)
+        self.grade(self.students[2], self.late, 60)
+        Submission.objects.create(assignment=self.early, student=self.students[1], content="ungraded")
+        self.url = f"/api/courses/{self.course.pk}/gradebook/"
+
+    def grade(self, student, assignment, score):
+        submission = Submission.objects.create(assignment=assignment, student=student, content="A")
+        return Grade.objects.create(submission=submission, instructor=self.instructor, score=score, letter="B")
+
+    def expected(self):
+        return {
+            "course": self.course.pk,
+            "students": [s.pk for s in self.students],
+            "assignments": [self.early.pk, self.late.pk],
+            "scores": [[90.0, 75.5], [None, None], [None, 60.0]],
+        }
+
+    def test_matrix(self):
+        self.client.force_authenticate(user=self.instructor)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), self.expected())
+
+    def test_constant_queries(self):
+        self.client.force_authenticate(user=self.instructor)
+        self.client.get(self.url)  # creates the table version rows
+        cache.clear()
+        with self.assertNumQueries(8):
+            # ETag versions, instructor tag token, cache scope, scope tag tokens, course, students, assignments, scores
+            self.client.get(self.url, HTTP_IF_NONE_MATCH="stale")
+
+    def test_csv(self):
+        self.client.force_authenticate(user=self.instructor)
+        response = self.client.get(self.url, {"format": "csv"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        self.assertIn("gradebook.csv", response["Content-Disposition"])
+        lines = response.content.decode().splitlines()
+        s0, s1, s2 = (s.pk for s in self.students)
+        self.assertEqual(lines, [
+            f"student_id,{self.early.pk},{self.late.pk}",
+            f"{s0},90.0,75.5",
+            f"{s1},,",
+            f"{s2},,60.0",
+        ])
+
+    def test_grade_changes_invalidate_cached_matrix(self):
+        self.client.force_authenticate(user=self.instructor)
+        self.client.get(self.url)
+        self.grade(self.students[1], self.late, 88)
+        self.assertEqual(self.client.get(self.url).json()["scores"][1], [None, 88.0])
+
+    def test_access(self):
+        self.client.force_authenticate(user=self.students[0])
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=self.other_instructor)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+        admin = CustomUser.objects.create_user(email="admin@example.com", password="password123", role="admin")
+        self.client.force_authenticate(user=admin)
+        self.assertEqual(self.client.get(self.url).json(), self.expected())
+
+    def test_array_pivot_drops_unknown_cells(self):
+        cells = [(1, 10, 5.0), (3, 20, 7.0), (2, 99, 1.0), (9, 10, 1.0)]
+        self.assertEqual(
+            gradebook.pivot_array([1, 2, 3], [20, 10], cells),
+            [[None, 5.0], [None, None], [7.0, None]],
+        )
+        self.assertEqual(gradebook.pivot_array([1, 2], [], cells), [[], []])
+        self.assertEqual(gradebook.pivot_array([], [10], cells), [])
+
+    @skipUnless(gradebook.numpy, "numpy is not installed")
+    def test_numpy_pivot_matches_array_pivot(self):
+        cells = [(1, 10, 5.0), (3, 20, 7.0), (2, 99, 1.0), (9, 10, 1.0)]
+        for students, assignments in (([1, 2, 3], [20, 10]), ([1, 2], []), ([], [10])):
+            self.assertEqual(
+                gradebook.pivot_numpy(students, assignments, cells),
+                gradebook.pivot_array(students, assignments, cells),
+            )
@@ -0,0 +1,112 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from assignments.models import Assignment
+from courses.models import Course, Enrollment
+from dashboard.models import StudentSummary
+
+
+class RosterEnrollmentTests(TestCase):
+    """
+    Tests for POST /api/enrollments/roster/.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = CustomUser.objects.create_user(email="admin@example.com", password="password123", role="admin")
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.math = Course.objects.create(title="Math 101", instructor=self.instructor)
+        self.history = Course.objects.create(title="History 101", instructor=self.instructor)
+        self.students = [
+            CustomUser.objects.create_user(email=f"student{i}@example.com", password="password123", role="student")
+            for i in range(4)
+        ]
+        self.client.force_authenticate(user=self.admin)
+
+    def post(self, data):
+        return self.client.post("/api/enrollments/roster/", data, format="json")
+
+    def test_reports_created_existing_and_invalid(self):
+        Enrollment.objects.create(course=self.math, student=self.students[0])
+        Assignment.objects.create(course=self.history, title="Essay", due_date=timezone.now())
+        s0, s1, s2, s3 = self.students
+        response = self.post({"rosters": [
+            {"course": self.math.pk, "students": [
+                s0.pk, s1.pk, "student2@example.com", "nobody@example.com", self.instructor.pk, "student1@example.com",
+            ]},
+            {"course": self.history.pk, "students": [s3.email, str(s0.pk)]},
+            {"course": 999999, "students": [s1.pk]},
+        ]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            (response.data["created"], response.data["already_enrolled"], response.data["invalid"]), (4, 1, 4)
+        )
+        math, history, missing = response.data["rosters"]
+        self.assertEqual(math["created"], [s1.pk, s2.pk])
+        self.assertEqual(math["already_enrolled"], [s0.pk])
+        self.assertEqual(
+            [error["reason"] for error in math["invalid"]],
+            ["Student not found.", "User is not a student.", "Listed more than once."],
+        )
+        self.assertEqual(history["created"], [s3.pk, s0.pk])
+        self.assertEqual(missing["invalid"], [{"student": str(s1.pk), "reason": "Course not found."}])
+
+        self.assertEqual(
+            set(Enrollment.objects.values_list("course_id", "student_id")),
+            {(self.math.pk, s0.pk), (self.math.pk, s1.pk), (self.math.pk, s2.pk),
+             (self.history.pk, s3.pk), (self.history.pk, s0.pk)},
+        )
+        self.assertEqual(StudentSummary.objects.get(pk=s0.pk).assignments_count, 1)
+
+    def test_unicode_digits_and_email_case(self):
+        s0, s1 = self.students[:2]
+        CustomUser.objects.filter(pk=s1.pk).update(email="Student1@Example.com")
+        response = self.post({"course": self.math.pk, "students": ["\u00b2", "STUDENT0@example.com", "student1@EXAMPLE.com"]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        roster = response.data["rosters"][0]
+        self.assertEqual(roster["created"], [s0.pk, s1.pk])
+        self.assertEqual(roster["invalid"], [{"student": "\u00b2", "reason": "Not a student ID or email."}])
+
+    def test_single_roster_and_constant_queries(self):
+        self.post({"course": self.math.pk, "students": [self.students[0].pk]})  # creates the table version rows
+        Enrollment.objects.all().delete()
+        with CaptureQueriesContext(connection) as one:
+            self.post({"course": self.math.pk, "students": [self.students[0].pk]})
+        Enrollment.objects.all().delete()
+        with CaptureQueriesContext(connection) as many:
+            response = self.post({"course": self.math.pk, "students": [s.email for s in self.students]})
+        self.assertEqual(response.data["created"], 4)
+        self.assertEqual(len(one.captured_queries), len(many.captured_queries))
+
+    def test_cached_enrollment_list_sees_roster(self):
+        self.client.force_authenticate(user=self.students[1])
+        self.assertEqual(self.client.get("/api/enrollments/").json(), [])
+        self.client.force_authenticate(user=self.admin)
+        self.post({"course": self.math.pk, "students": [self.students[1].pk]})
+        self.client.force_authenticate(user=self.students[1])
+        self.assertEqual(len(self.client.get("/api/enrollments/").json()), 1)
+
+    def test_validation_and_access(self):
+        self.assertEqual(self.post({"course": self.math.pk, "students": []}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post({"students": [1]}).status_code, status.HTTP_400_BAD_REQUEST)
+        from courses.views import EnrollmentViewSet
+        original = EnrollmentViewSet.roster_max_students
+        EnrollmentViewSet.roster_max_students = 2
+        try:
+            response = self.post({"course": self.math.pk, "students": [s.pk for s in self.students]})
+        finally:
+            EnrollmentViewSet.roster_max_students = original
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        for user in (self.instructor, self.students[0]):
+            self.client.force_authenticate(user=user)
+            response = self.post({"course": self.math.pk, "students": [self.students[0].pk]})
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
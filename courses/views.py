@@ -1,21 +1,54 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
 from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.settings import api_settings
+from core.cache import invalidate_tags, table_tag
+from core.counters import add_counts
+from core.mixins import ConditionalGetMixin, SparseFieldsMixin, StreamingListMixin, TaggedCacheMixin
+from core.versions import bump_versions
+from dashboard.models import StudentSummary
+from .gradebook import GradebookCSVRenderer, build_gradebook
 from .models import Course, Enrollment
-from .serializers import CourseSerializer, EnrollmentSerializer
+from .serializers import CourseSerializer, EnrollmentSerializer, RosterSerializer
 from accounts.models import CustomUser
+from assignments.models import Assignment, Submission
+from grades.models import Grade
+
+GRADEBOOK_MODELS = (Course, Enrollment, Assignment, Submission, Grade, CustomUser)
+
+
+def parse_roster_key(key):
+    """
+    ("id", pk) or ("email", lower-cased email) for a roster entry, or None when it is neither.
+    Emails match case-insensitively, as in grades.importer.
+    """
+    if key.isascii() and key.isdigit():
+        return "id", int(key)
+    if "@" in key:
+        return "email", key.lower()
+    return None
 
 
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(SparseFieldsMixin, TaggedCacheMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing courses.
     Role-based isolation:
     - Instructors: can create/update/delete courses they teach.
     - Students: can list/retrieve courses they are enrolled in.
     - Admins: can view/manage all courses.
+    GET responses carry an ETag and honour If-None-Match, and are served from the tagged cache.
     """
     serializer_class = CourseSerializer
     permission_classes = [permissions.IsAuthenticated]
+    etag_models = (Course, Enrollment, CustomUser)
+    cache_models = (Course, Enrollment, CustomUser)
+    cache_actions = ("list", "retrieve", "gradebook")
 
     def get_queryset(self):
         user = self.request.user
@@ -46,17 +79,48 @@ class CourseViewSet(viewsets.ModelViewSet):
         """
         serializer.save(instructor=self.request.user)
 
+    @action(
+        detail=True,
+        methods=["get"],
+        renderer_classes=[*api_settings.DEFAULT_RENDERER_CLASSES, GradebookCSVRenderer],
+        etag_models=GRADEBOOK_MODELS,
+        cache_models=GRADEBOOK_MODELS,
+    )
+    def gradebook(self, request, pk=None):
+        """
+        Students x assignments score matrix of a course (instructor of the course or admin).
+        Returns {"course", "students", "assignments", "scores"} where scores[i][j] is the
+        grade of students[i] on assignments[j] or null; ?format=csv downloads it as CSV.
+        """
+        course = self.get_object()
+        if getattr(request.user, "role", None) not in ("instructor", "admin"):
+            raise PermissionDenied("Only the course instructor or admins can view the gradebook.")
+        return Response(build_gradebook(course))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        renderer = getattr(request, "accepted_renderer", None)
+        if self.action == "gradebook" and response.status_code == status.HTTP_200_OK and isinstance(
+            renderer, GradebookCSVRenderer
+        ):
+            response["Content-Disposition"] = f'attachment; filename="course-{self.kwargs["pk"]}-gradebook.csv"'
+        return response
 
-class EnrollmentViewSet(viewsets.ModelViewSet):
+
+class EnrollmentViewSet(SparseFieldsMixin, StreamingListMixin, TaggedCacheMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing enrollments.
     Role-based isolation:
     - Students: can enroll themselves in courses.
     - Instructors: can view enrollments for their courses.
     - Admins: can view/manage all enrollments.
+    List and retrieve responses are served from the tagged cache.
     """
     serializer_class = EnrollmentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_models = (Enrollment, Course, CustomUser)
+    roster_max_students = 50000
+    roster_batch_size = 2000
 
     def get_queryset(self):
         user = self.request.user
@@ -116,3 +180,105 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
         """
         if getattr(self.request.user, "role", None) == "student":
             serializer.save(student=self.request.user)
+
+    @action(detail=False, methods=["post"], url_path="roster")
+    def roster(self, request):
+        """
+        Enroll many students at once (admins only).
+
+        Accepts {"rosters": [{"course": id, "students": [id or email, ...]}, ...]} or a
+        single roster object. Students of all rosters are resolved with one query,
+        existing enrollments of the courses with another, and new pairs are inserted
+        with bulk_create(ignore_conflicts=True) in chunks, so a pair enrolled
+        concurrently is skipped rather than failing the request (reconcile_counters
+        corrects enrollment_count after such a race). Reports per roster
+        which students were created, already enrolled or invalid.
+        """
+        user = request.user
+        if getattr(user, "role", None) != "admin":
+            raise PermissionDenied("Only admins can enroll rosters.")
+
+        data = request.data.get("rosters", request.data) if isinstance(request.data, dict) else request.data
+        serializer = RosterSerializer(data=data if isinstance(data, list) else [data], many=True)
+        serializer.is_valid(raise_exception=True)
+        rosters = serializer.validated_data
+        if sum(len(roster["students"]) for roster in rosters) > self.roster_max_students:
+            raise ValidationError({"students": [f"At most {self.roster_max_students} students per request."]})
+
+        ids, emails = set(), set()
+        for roster in rosters:
+            for key in roster["students"]:
+                parsed = parse_roster_key(key.strip())
+                if parsed is not None:
+                    (ids if parsed[0] == "id" else emails).add(parsed[1])
+        by_key = {}
+        for pk, email, role in (
+            CustomUser.objects.annotate(email_lower=Lower("email"))
+            .filter(Q(pk__in=ids) | Q(email_lower__in=emails)).order_by()
+            .values_list("pk", "email_lower", "role")
+        ):
+            by_key["id", pk] = by_key["email", email] = (pk, role)
+
+        course_ids = {roster["course"] for roster in rosters}
+        courses = set(Course.objects.filter(pk__in=course_ids).values_list("pk", flat=True))
+        existing = set(
+            Enrollment.objects.filter(course_id__in=courses).order_by().values_list("course_id", "student_id")
+        )
+
+        results, new_pairs = [], []
+        for roster in rosters:
+            course_id = roster["course"]
+            result = {"course": course_id, "created": [], "already_enrolled": [], "invalid": []}
+            results.append(result)
+            if course_id not in courses:
+                result["invalid"] = [{"student": key, "reason": "Course not found."} for key in roster["students"]]
+                continue
+            seen = set()
+            for key in roster["students"]:
+                key = key.strip()
+                parsed = parse_roster_key(key)
+                student = by_key.get(parsed)
+                if parsed is None:
+                    result["invalid"].append({"student": key, "reason": "Not a student ID or email."})
+                elif student is None:
+                    result["invalid"].append({"student": key, "reason": "Student not found."})
+                elif student[1] != "student":
+                    result["invalid"].append({"student": key, "reason": "User is not a student."})
+                elif student[0] in seen:
+                    result["invalid"].append({"student": key, "reason": "Listed more than once."})
+                elif (course_id, student[0]) in existing:
+                    result["already_enrolled"].append(student[0])
+                else:
+                    existing.add((course_id, student[0]))
+                    new_pairs.append((course_id, student[0]))
+                    result["created"].append(student[0])
+                if student is not None:
+                    seen.add(student[0])
+
+        if new_pairs:
+            with transaction.atomic():
+                for start in range(0, len(new_pairs), self.roster_batch_size):
+                    Enrollment.objects.bulk_create(
+                        [Enrollment(course_id=c, student_id=s) for c, s in new_pairs[start:start + self.roster_batch_size]],
+                        ignore_conflicts=True,
+                    )
+                # bulk_create bypasses model signals
+                add_counts(Course, {
+                    course_id: {"enrollment_count": count}
+                    for course_id, count in Counter(c for c, _ in new_pairs).items()
+                })
+                student_ids = {s for _, s in new_pairs}
+                bump_versions(Enrollment)
+                invalidate_tags(
+                    table_tag(Enrollment),
+                    *{f"course:{c}" for c, _ in new_pairs},
+                    *(f"student:{pk}" for pk in student_ids),
+                )
+                StudentSummary.objects.refresh(student_ids)
+
+        return Response({
+            "created": sum(len(r["created"]) for r in results),
+            "already_enrolled": sum(len(r["already_enrolled"]) for r in results),
+            "invalid": sum(len(r["invalid"]) for r in results),
+            "rosters": results,
+        })
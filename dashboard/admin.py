@@ -1,3 +1,10 @@
 from django.contrib import admin
+from core.replicas import ReplicaChangeListMixin
+from .models import StudentSummary
 
-# Register your models here.
+
+@admin.register(StudentSummary)
+class StudentSummaryAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
+    list_display = ("student", "grades_count", "assignments_count", "submissions_count", "updated_at")
+    search_fields = ("student__email", "student__username")
+    readonly_fields = ("updated_at",)
@@ -2,4 +2,11 @@ from django.apps import AppConfig
 
 
 class DashboardConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
     name = 'dashboard'
+
+    def ready(self):
+        """
+        Import signals so the student summaries stay in sync.
+        """
+        import dashboard.signals  # noqa
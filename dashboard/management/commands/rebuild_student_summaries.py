@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import CustomUser
+from dashboard.models import StudentSummary
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the StudentSummary table from the source tables and report drift.
+    """
+    help = "Rebuild dashboard student summaries from scratch and report any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report drift, do not rewrite the table.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of students recomputed per query.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        student_ids = list(
+            CustomUser.objects.filter(role="student").order_by("pk").values_list("pk", flat=True)
+        )
+        stored = {summary.pk: summary.as_counters() for summary in StudentSummary.objects.all()}
+
+        fresh = {}
+        for start in range(0, len(student_ids), batch_size):
+            fresh.update(StudentSummary.objects.compute(student_ids[start:start + batch_size]))
+
+        missing = [pk for pk in fresh if pk not in stored]
+        stale = [pk for pk, values in fresh.items() if pk in stored and stored[pk] != values]
+        orphaned = [pk for pk in stored if pk not in fresh]
+
+        for pk in stale:
+            self.stdout.write(f"Drift for student #{pk}: stored={stored[pk]} actual={fresh[pk]}")
+        self.stdout.write(
+            f"{len(fresh)} students checked: {len(missing)} missing, "
+            f"{len(stale)} stale, {len(orphaned)} orphaned."
+        )
+
+        if options["check"]:
+            return
+
+        with transaction.atomic():
+            StudentSummary.objects.all().delete()
+            StudentSummary.objects.bulk_create(
+                [StudentSummary(student_id=pk, **values) for pk, values in fresh.items()],
+                batch_size=batch_size,
+            )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(fresh)} student summaries."))
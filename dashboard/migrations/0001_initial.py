@@ -0,0 +1,34 @@
+# Generated by Django 4.2.27 on 2026-10-17 06:29
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentSummary',
+            fields=[
+                ('student', models.OneToOneField(help_text='Student this summary belongs to', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='dashboard_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('grades_count', models.PositiveIntegerField(default=0)),
+                ('assignments_count', models.PositiveIntegerField(default=0)),
+                ('submissions_count', models.PositiveIntegerField(default=0)),
+                ('score_total', models.DecimalField(decimal_places=2, default=Decimal('0'), help_text='Sum of all non-null grade scores', max_digits=12)),
+                ('scored_count', models.PositiveIntegerField(default=0, help_text='Number of grades with a non-null score')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Student Summary',
+                'verbose_name_plural': 'Student Summaries',
+            },
+        ),
+    ]
@@ -1,3 +1,142 @@
-from django.db import models
+from decimal import Decimal
 
-# Create your models here.
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, models
+from django.db.models import Count, IntegerField, OuterRef, Sum
+
+from analytics.stats import subquery_aggregate
+
+
+class StudentSummaryManager(models.Manager):
+    """
+    Manager that recomputes summaries for a set of students in one grouped query.
+    """
+
+    def compute(self, student_ids):
+        """
+        Return fresh summary values keyed by student id, straight from the source tables
+        of the primary database: they are written back, so they must not come from a replica.
+        """
+        from accounts.models import CustomUser
+        from assignments.models import Assignment, Submission
+        from grades.models import Grade
+
+        student = OuterRef("pk")
+        decimal_field = models.DecimalField(max_digits=12, decimal_places=2)
+        rows = (
+            CustomUser.objects.using(DEFAULT_DB_ALIAS).filter(pk__in=list(student_ids))
+            .annotate(
+                grades_count=subquery_aggregate(
+                    Grade.objects.filter(submission__student=student),
+                    "submission__student", Count("pk"), IntegerField(),
+                ),
+                assignments_count=subquery_aggregate(
+                    Assignment.objects.filter(course__enrollments__student=student),
+                    "course__enrollments__student", Count("pk"), IntegerField(),
+                ),
+                submissions_count=subquery_aggregate(
+                    Submission.objects.filter(student=student),
+                    "student", Count("pk"), IntegerField(),
+                ),
+                score_total=subquery_aggregate(
+                    Grade.objects.filter(submission__student=student),
+                    "submission__student", Sum("score"), decimal_field,
+                ),
+                scored_count=subquery_aggregate(
+                    Grade.objects.filter(submission__student=student),
+                    "submission__student", Count("score"), IntegerField(),
+                ),
+            )
+            .values("pk", *StudentSummary.COUNTER_FIELDS)
+        )
+        return {row.pop("pk"): row for row in rows}
+
+    def refresh(self, student_ids):
+        """
+        Recompute and upsert the summaries for the given students.
+        Students that no longer exist are skipped.
+        """
+        student_ids = {pk for pk in student_ids if pk is not None}
+        if not student_ids:
+            return []
+        fresh = self.compute(student_ids)
+        summaries = [self.model(student_id=pk, **values) for pk, values in fresh.items()]
+        return self.db_manager(DEFAULT_DB_ALIAS).bulk_create(
+            summaries,
+            update_conflicts=True,
+            unique_fields=["student"],
+            update_fields=[*StudentSummary.COUNTER_FIELDS, "updated_at"],
+        )
+
+    def for_student(self, student):
+        """
+        Primary-key read of a student's summary, building it on first access.
+        Read from the primary, like the rows refresh() builds it from.
+        """
+        primary = self.db_manager(DEFAULT_DB_ALIAS)
+        summary = primary.filter(pk=student.pk).first()
+        if summary is None:
+            self.refresh([student.pk])
+            summary = primary.get(pk=student.pk)
+        return summary
+
+
+class StudentSummary(models.Model):
+    """
+    Denormalized dashboard header for a student.
+    Kept in sync by dashboard.signals whenever submissions, grades,
+    enrollments or assignments change.
+    """
+    COUNTER_FIELDS = (
+        "grades_count",
+        "assignments_count",
+        "submissions_count",
+        "score_total",
+        "scored_count",
+    )
+
+    student = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="dashboard_summary",
+        help_text="Student this summary belongs to"
+    )
+    grades_count = models.PositiveIntegerField(default=0)
+    assignments_count = models.PositiveIntegerField(default=0)
+    submissions_count = models.PositiveIntegerField(default=0)
+    score_total = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal("0"),
+        help_text="Sum of all non-null grade scores"
+    )
+    scored_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of grades with a non-null score"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = StudentSummaryManager()
+
+    class Meta:
+        verbose_name = "Student Summary"
+        verbose_name_plural = "Student Summaries"
+
+    def __str__(self):
+        return f"Summary for student #{self.student_id}"
+
+    @property
+    def gpa(self):
+        if not self.scored_count:
+            return 0.0
+        return float(self.score_total) / self.scored_count
+
+    @property
+    def completion_rate(self):
+        if not self.assignments_count:
+            return 0.0
+        return self.submissions_count / self.assignments_count * 100.0
+
+    def as_counters(self):
+        return {field: getattr(self, field) for field in self.COUNTER_FIELDS}
@@ -0,0 +1,60 @@
+from functools import partial
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination
+
+
+class SectionCursorPagination(CursorPagination):
+    """
+    Keyset pagination for one dashboard section.
+    Each section gets its own cursor parameter (e.g. ?grades_cursor=...) so
+    several sections can be paged independently within the same request.
+    """
+    ordering = "-id"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def __init__(self, section):
+        self.section = section
+        self.cursor_query_param = f"{section}_cursor"
+
+
+def parse_include(request, allowed):
+    """
+    Parse ?include=a,b,c into a set of section names, rejecting unknown ones.
+    """
+    raw = request.query_params.get("include", "")
+    include = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = include - set(allowed)
+    if unknown:
+        raise ValidationError(
+            {"include": [f"Unknown section(s): {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}."]}
+        )
+    return include
+
+
+def paginate_section(request, name, queryset, serializer_class):
+    """
+    Serialize one cursor-paginated page of a section.
+    """
+    paginator = SectionCursorPagination(name)
+    page = paginator.paginate_queryset(queryset, request)
+    return {
+        "next": paginator.get_next_link(),
+        "results": serializer_class(page, many=True).data,
+    }
+
+
+def section_pages(request, sections, include):
+    """
+    {name: zero-argument callable serializing its page} for every included section.
+    sections maps a section name to a (queryset, serializer_class) pair; the
+    querysets are lazy, so sections that were not requested never hit the database.
+    The callables are independent, so views run them concurrently (core.parallel.gather).
+    """
+    return {
+        name: partial(paginate_section, request, name, queryset, serializer_class)
+        for name, (queryset, serializer_class) in sections.items()
+        if name in include
+    }
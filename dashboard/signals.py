@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from assignments.models import Assignment, Submission
+from courses.models import Enrollment
+from grades.models import Grade
+from .models import StudentSummary
+
+
+def _students_being_deleted(origin, student_ids):
+    """
+    Return the subset of student_ids whose own user row is the origin of a cascade delete.
+    Re-creating their summary mid-cascade would violate the foreign key on commit.
+    """
+    user_model = get_user_model()
+    if isinstance(origin, user_model):
+        return {origin.pk} & student_ids
+    if isinstance(origin, QuerySet) and origin.model is user_model:
+        return set(origin.filter(pk__in=student_ids).values_list("pk", flat=True))
+    return set()
+
+
+def refresh_summaries(student_ids, origin=None):
+    """
+    Recompute the dashboard summary for the affected students.
+    """
+    student_ids = {pk for pk in student_ids if pk is not None}
+    if origin is not None:
+        student_ids -= _students_being_deleted(origin, student_ids)
+    StudentSummary.objects.refresh(student_ids)
+
+
+@receiver(post_save, sender=Submission)
+def submission_saved(sender, instance, update_fields=None, **kwargs):
+    # Grade.save() mirrors the score onto Submission.grade; the summary doesn't read it.
+    if update_fields is not None and set(update_fields) <= {"grade"}:
+        return
+    refresh_summaries([instance.student_id])
+
+
+@receiver(post_delete, sender=Submission)
+def submission_deleted(sender, instance, origin=None, **kwargs):
+    refresh_summaries([instance.student_id], origin)
+
+
+@receiver(post_save, sender=Grade)
+@receiver(post_delete, sender=Grade)
+def grade_changed(sender, instance, origin=None, **kwargs):
+    # The submission may already be gone in a cascade; its own signal covers that case.
+    student_ids = Submission.objects.filter(pk=instance.submission_id).values_list("student_id", flat=True)
+    refresh_summaries(student_ids, origin)
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def enrollment_changed(sender, instance, origin=None, **kwargs):
+    refresh_summaries([instance.student_id], origin)
+
+
+@receiver(post_save, sender=Assignment)
+def assignment_created(sender, instance, created, **kwargs):
+    if created:
+        refresh_summaries(
+            Enrollment.objects.filter(course_id=instance.course_id).values_list("student_id", flat=True)
+        )
+
+
+@receiver(post_delete, sender=Assignment)
+def assignment_deleted(sender, instance, origin=None, **kwargs):
+    refresh_summaries(
+        Enrollment.objects.filter(course_id=instance.course_id).values_list("student_id", flat=True),
+        origin,
+    )
@@ -0,0 +1,94 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from assignments.models import Assignment, Submission
+from courses.models import Course, Enrollment
+from dashboard.models import StudentSummary
+from grades.models import Grade
+
+
+class StudentSummaryTests(TestCase):
+    """
+    Tests for the incrementally maintained StudentSummary table.
+    """
+
+    def setUp(self):
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.student = CustomUser.objects.create_user(
+            email="student@example.com", password="password123", role="student"
+        )
+        self.course = Course.objects.create(title="Math 101", instructor=self.instructor)
+        Enrollment.objects.create(course=self.course, student=self.student)
+        self.assignment = Assignment.objects.create(
+            course=self.course, title="Homework 1", due_date=timezone.now()
+        )
+
+    def summary(self):
+        return StudentSummary.objects.get(pk=self.student.pk)
+
+    def test_enrollment_and_assignment_update_summary(self):
+        self.assertEqual(self.summary().assignments_count, 1)
+        Assignment.objects.create(course=self.course, title="Homework 2", due_date=timezone.now())
+        self.assertEqual(self.summary().assignments_count, 2)
+
+    def test_submission_and_grade_update_summary(self):
+        submission = Submission.objects.create(assignment=self.assignment, student=self.student, content="A")
+        grade = Grade.objects.create(submission=submission, instructor=self.instructor, score=80)
+        summary = self.summary()
+        self.assertEqual(summary.submissions_count, 1)
+        self.assertEqual(summary.grades_count, 1)
+        self.assertEqual(summary.gpa, 80.0)
+        self.assertEqual(summary.completion_rate, 100.0)
+
+        grade.score = 60
+        grade.save()
+        self.assertEqual(self.summary().gpa, 60.0)
+
+        grade.delete()
+        summary = self.summary()
+        self.assertEqual(summary.grades_count, 0)
+        self.assertEqual(summary.gpa, 0.0)
+
+    def test_course_delete_cascades_into_summary(self):
+        submission = Submission.objects.create(assignment=self.assignment, student=self.student, content="A")
+        Grade.objects.create(submission=submission, instructor=self.instructor, score=70)
+        self.course.delete()
+        self.assertEqual(
+            self.summary().as_counters(),
+            StudentSummary.objects.compute([self.student.pk])[self.student.pk],
+        )
+        self.assertEqual(self.summary().assignments_count, 0)
+
+    def test_student_delete_does_not_recreate_summary(self):
+        Submission.objects.create(assignment=self.assignment, student=self.student, content="A")
+        self.student.delete()
+        self.assertFalse(StudentSummary.objects.exists())
+
+    def test_rebuild_command_reports_and_fixes_drift(self):
+        StudentSummary.objects.filter(pk=self.student.pk).update(assignments_count=42)
+        out = StringIO()
+        call_command("rebuild_student_summaries", "--check", stdout=out)
+        self.assertIn("1 stale", out.getvalue())
+        self.assertEqual(self.summary().assignments_count, 42)
+
+        call_command("rebuild_student_summaries", stdout=StringIO())
+        self.assertEqual(self.summary().assignments_count, 1)
+
+    def test_student_dashboard_reads_summary(self):
+        client = APIClient()
+        client.force_authenticate(user=self.student)
+        with self.assertNumQueries(2):
+            # ETag version lookup + summary read
+            response = client.get(reverse("student-dashboard"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["assignments_count"], 1)
+        self.assertEqual(response.data["completion_rate"], 0.0)
@@ -0,0 +1,74 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from assignments.models import Assignment, Submission
+from courses.models import Course, Enrollment
+from grades.models import Grade
+
+
+class DashboardSectionsTests(TestCase):
+    """
+    Tests for the opt-in, cursor-paginated ?include= sections on the dashboards.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = CustomUser.objects.create_user(
+            email="admin@example.com", password="password123", role="admin"
+        )
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.student = CustomUser.objects.create_user(
+            email="student@example.com", password="password123", role="student"
+        )
+        self.course = Course.objects.create(title="Math 101", instructor=self.instructor)
+        Enrollment.objects.create(course=self.course, student=self.student)
+        for i in range(5):
+            assignment = Assignment.objects.create(
+                course=self.course, title=f"Homework {i}", due_date=timezone.now()
+            )
+            submission = Submission.objects.create(assignment=assignment, student=self.student, content="A")
+            Grade.objects.create(submission=submission, instructor=self.instructor, score=70 + i, letter="B")
+
+    def test_default_response_has_no_arrays(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse("admin-dashboard"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for section in ["courses", "assignments", "submissions", "grades"]:
+            self.assertNotIn(section, response.data)
+        self.assertEqual(response.data["total_grades"], 5)
+
+    def test_include_selects_sections(self):
+        self.client.force_authenticate(user=self.instructor)
+        response = self.client.get(reverse("instructor-dashboard"), {"include": "courses,grades"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["courses"]["results"]), 1)
+        self.assertEqual(len(response.data["grades"]["results"]), 5)
+        self.assertIsNone(response.data["grades"]["next"])
+        self.assertNotIn("assignments", response.data)
+
+    def test_sections_follow_next_cursor(self):
+        self.client.force_authenticate(user=self.student)
+        url = reverse("student-dashboard")
+        response = self.client.get(url, {"include": "submissions", "page_size": 2})
+        seen = []
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            page = response.data["submissions"]
+            self.assertLessEqual(len(page["results"]), 2)
+            seen.extend(item["id"] for item in page["results"])
+            if not page["next"]:
+                break
+            response = self.client.get(page["next"])
+        self.assertEqual(sorted(seen), sorted(Submission.objects.values_list("id", flat=True)))
+        self.assertEqual(response.data["grades_count"], 5)
+
+    def test_unknown_section_rejected(self):
+        self.client.force_authenticate(user=self.student)
+        response = self.client.get(reverse("student-dashboard"), {"include": "grades,secrets"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,135 +1,148 @@
-from django.db.models import Avg, Count
+import asyncio
+from functools import partial
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions
 from accounts.models import CustomUser
-from courses.models import Course, Enrollment
+from analytics import stats
+from core.mixins import ConditionalGetMixin
+from core.parallel import AsyncDispatchMixin, gather
+from core.replicas import ReplicaReadMixin
+from courses.models import Course, Enrollment, Module
 from assignments.models import Assignment, Submission
 from grades.models import Grade
 from assignments.serializers import AssignmentSerializer, SubmissionSerializer
 from grades.serializers import GradeSerializer
 from courses.serializers import CourseSerializer
+from .models import StudentSummary
+from .pagination import parse_include, section_pages
 
 
-class StudentDashboardView(APIView):
+class StudentDashboardView(AsyncDispatchMixin, ReplicaReadMixin, ConditionalGetMixin, APIView):
     """
     Dashboard view for students.
-    Shows GPA, assignments count, grades count, completion rate, plus arrays of assignments, submissions, grades.
+    Shows GPA, assignments count, grades count and completion rate.
+    The header counters are read from StudentSummary instead of being aggregated per request.
+    Arrays are opt-in via ?include=courses,assignments,submissions,grades and are cursor-paginated.
+    Responses carry an ETag and honour If-None-Match.
+    The summary read and the included sections are queried concurrently, on a read replica when one is available.
     """
     permission_classes = [permissions.IsAuthenticated]
+    sections = ("courses", "assignments", "submissions", "grades")
+    etag_models = (Course, Enrollment, Module, Assignment, Submission, Grade, CustomUser)
 
-    def get(self, request):
+    async def get(self, request):
         user = request.user
         if getattr(user, "role", None) != "student":
             return Response({"detail": "Access denied. Only students can view this dashboard."}, status=403)
-
-        assignments = Assignment.objects.filter(course__enrollments__student=user).select_related("course")
-        submissions = Submission.objects.filter(student=user).select_related("assignment")
-        grades = Grade.objects.filter(submission__student=user)
-
-        grades_count = grades.count()
-        assignments_count = assignments.count()
-        gpa = grades.aggregate(avg=Avg("grade"))["avg"] or 0.0
-        completion_rate = (submissions.count() / assignments_count * 100.0) if assignments_count > 0 else 0.0
+        include = parse_include(request, self.sections)
+
+        sections = {
+            "courses": (Course.objects.filter(enrollments__student=user).select_related("instructor"), CourseSerializer),
+            "assignments": (
+                Assignment.objects.filter(course__enrollments__student=user).select_related("course", "module", "created_by"),
+                AssignmentSerializer,
+            ),
+            "submissions": (
+                Submission.objects.filter(student=user).select_related("assignment", "student"),
+                SubmissionSerializer,
+            ),
+            "grades": (
+                Grade.objects.filter(submission__student=user).select_related(
+                    "submission__student", "submission__assignment", "instructor"
+                ),
+                GradeSerializer,
+            ),
+        }
+        pages = section_pages(request, sections, include)
+        # Header counters come from the incrementally maintained summary row
+        summary, *results = await gather(partial(StudentSummary.objects.for_student, user), *pages.values())
 
         return Response({
-            "grades_count": grades_count,
-            "assignments_count": assignments_count,
-            "gpa": round(float(gpa), 2),
-            "completion_rate": round(completion_rate, 2),
-            "assignments": AssignmentSerializer(assignments, many=True).data,
-            "submissions": SubmissionSerializer(submissions, many=True).data,
-            "grades": GradeSerializer(grades, many=True).data,
+            "grades_count": summary.grades_count,
+            "assignments_count": summary.assignments_count,
+            "gpa": round(summary.gpa, 2),
+            "completion_rate": round(summary.completion_rate, 2),
+            **dict(zip(pages, results)),
         })
 
 
-class InstructorDashboardView(APIView):
+class InstructorDashboardView(AsyncDispatchMixin, ReplicaReadMixin, APIView):
     """
     Dashboard view for instructors.
-    Shows courses taught, assignments created, submissions received, grades given, course performance, plus arrays.
+    Shows courses taught, assignments created, submissions received, grades given and course performance.
+    Arrays are opt-in via ?include=courses,assignments,submissions,grades and are cursor-paginated.
+    The teaching stats and the included sections are queried concurrently, on a read replica when one is available.
     """
     permission_classes = [permissions.IsAuthenticated]
+    sections = ("courses", "assignments", "submissions", "grades")
 
-    def get(self, request):
+    async def get(self, request):
         user = request.user
         if getattr(user, "role", None) != "instructor":
             return Response({"detail": "Access denied. Only instructors can view this dashboard."}, status=403)
+        include = parse_include(request, self.sections)
 
         courses = Course.objects.filter(instructor=user)
-        assignments = Assignment.objects.filter(course__instructor=user).select_related("course")
-        submissions = Submission.objects.filter(assignment__course__instructor=user).select_related("assignment", "student")
+        assignments = Assignment.objects.filter(course__instructor=user)
+        submissions = Submission.objects.filter(assignment__course__instructor=user)
         grades = Grade.objects.filter(submission__assignment__course__instructor=user)
 
-        courses_taught = courses.count()
-        assignments_created = assignments.count()
-        submissions_received = submissions.count()
-        grades_given = grades.count()
-
-        course_performance = {
-            course.title: round(
-                grades.filter(submission__assignment__course=course).aggregate(avg=Avg("grade"))["avg"] or 0.0, 2
-            )
-            for course in courses
+        sections = {
+            "courses": (courses.select_related("instructor"), CourseSerializer),
+            "assignments": (assignments.select_related("course", "module", "created_by"), AssignmentSerializer),
+            "submissions": (submissions.select_related("assignment", "student"), SubmissionSerializer),
+            "grades": (
+                grades.select_related("submission__student", "submission__assignment", "instructor"),
+                GradeSerializer,
+            ),
         }
+        pages = section_pages(request, sections, include)
+        teaching, *results = await gather(partial(stats.instructor_stats, user), *pages.values())
+        course_performance = {row["title"]: row["average_score"] for row in teaching["course_breakdown"]}
 
         return Response({
-            "courses_taught": courses_taught,
-            "assignments_created": assignments_created,
-            "submissions_received": submissions_received,
-            "grades_given": grades_given,
+            "courses_taught": teaching["courses_taught"],
+            "assignments_created": teaching["assignments_created"],
+            "submissions_received": teaching["submissions_received"],
+            "grades_given": teaching["grades_given"],
             "course_performance": course_performance,
-            "courses": CourseSerializer(courses, many=True).data,
-            "assignments": AssignmentSerializer(assignments, many=True).data,
-            "submissions": SubmissionSerializer(submissions, many=True).data,
-            "grades": GradeSerializer(grades, many=True).data,
+            **dict(zip(pages, results)),
         })
 
 
-class AdminDashboardView(APIView):
+class AdminDashboardView(AsyncDispatchMixin, ReplicaReadMixin, APIView):
     """
     Dashboard view for admins.
-    Shows global stats plus arrays of courses, assignments, submissions, grades.
+    Shows global stats across courses, users, submissions and grades.
+    Arrays are opt-in via ?include=courses,assignments,submissions,grades and are cursor-paginated.
+    The global stats and the included sections are queried concurrently, on a read replica when one is available.
     """
     permission_classes = [permissions.IsAuthenticated]
+    sections = ("courses", "assignments", "submissions", "grades")
 
-    def get(self, request):
+    async def get(self, request):
         user = request.user
         if getattr(user, "role", None) != "admin":
             return Response({"detail": "Access denied. Only admins can view this dashboard."}, status=403)
-
-        courses = Course.objects.all()
-        students = CustomUser.objects.filter(role="student")
-        instructors = CustomUser.objects.filter(role="instructor")
-        submissions = Submission.objects.all()
-        grades = Grade.objects.all()
-
-        total_courses = courses.count()
-        total_students = students.count()
-        total_instructors = instructors.count()
-        total_submissions = submissions.count()
-        total_grades = grades.count()
-        global_gpa = grades.aggregate(avg=Avg("grade"))["avg"] or 0.0
-
-        grade_distribution = {
-            g["letter"]: g["count"] for g in grades.values("letter").annotate(count=Count("id"))
-        }
-
-        course_enrollment_stats = {
-            course.title: Enrollment.objects.filter(course=course).values("student").distinct().count()
-            for course in courses
+        include = parse_include(request, self.sections)
+
+        sections = {
+            "courses": (Course.objects.select_related("instructor"), CourseSerializer),
+            "assignments": (Assignment.objects.select_related("course", "module", "created_by"), AssignmentSerializer),
+            "submissions": (Submission.objects.select_related("assignment", "student"), SubmissionSerializer),
+            "grades": (
+                Grade.objects.select_related("submission__student", "submission__assignment", "instructor"),
+                GradeSerializer,
+            ),
         }
+        pages = section_pages(request, sections, include)
+        global_stats, results = await asyncio.gather(
+            stats.admin_stats_async(), gather(*pages.values()),
+        )
 
         return Response({
-            "total_courses": total_courses,
-            "total_students": total_students,
-            "total_instructors": total_instructors,
-            "total_submissions": total_submissions,
-            "total_grades": total_grades,
-            "global_gpa": round(float(global_gpa), 2),
-            "grade_distribution": grade_distribution,
-            "course_enrollment_stats": course_enrollment_stats,
-            "courses": CourseSerializer(courses, many=True).data,
-            "assignments": AssignmentSerializer(Assignment.objects.all(), many=True).data,
-            "submissions": SubmissionSerializer(submissions, many=True).data,
-            "grades": GradeSerializer(grades, many=True).data,
+            **global_stats,
+            **dict(zip(pages, results)),
         })
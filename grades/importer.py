@@ -0,0 +1,227 @@
+import csv
+import io
+from decimal import Decimal, InvalidOperation
+
+from django.db import connection, transaction
+from django.db.models import OuterRef, Subquery
+
+from analytics.rollups import mark_dirty
+from assignments.models import Assignment, Submission
+from core.cache import invalidate_tags, table_tag
+from core.counters import add_counts, grade_deltas, lock_grade_targets, merge_deltas
+from core.versions import bump_versions
+from courses.models import Enrollment
+from dashboard.models import StudentSummary
+from .models import Grade
+
+REQUIRED_COLUMNS = ("email", "assignment", "score")
+MAX_SCORE = Decimal("999.99")  # Grade.score is max_digits=5, decimal_places=2
+AMBIGUOUS = object()  # assignment title shared by several assignments of the course
+
+
+class GradeImportError(Exception):
+    """
+    The file as a whole cannot be imported (unreadable or missing columns).
+    """
+
+
+class GradeImporter:
+    """
+    Imports a CSV of grades into one course, keyed by student email and assignment title.
+
+    Columns: email, assignment, score and optionally letter and feedback. All keys are
+    resolved up front with three queries (enrolled students, assignments, submissions)
+    into dictionaries, so parsing is a pure in-memory pass.
+    Rows that fail are reported with their line number and skipped; the valid rows are
+    loaded in one transaction: through COPY into a temporary table on PostgreSQL, with
+    batched INSERT ... ON CONFLICT elsewhere. Submission.grade and the assignment
+    counters (core.counters) are synced in the same transaction with set-based UPDATEs,
+    from the existing grades re-read under the submissions' row locks.
+    """
+    batch_size = 2000
+
+    def __init__(self, course, instructor):
+        self.course = course
+        self.instructor = instructor
+
+    def run(self, stream):
+        """
+        Import a text stream of CSV data; returns {rows, created, updated, errors}.
+        """
+        reader = csv.DictReader(stream)
+        header = [name.strip().lower() for name in reader.fieldnames or ()]
+        missing = [name for name in REQUIRED_COLUMNS if name not in header]
+        if missing:
+            raise GradeImportError(f"Missing required columns: {', '.join(missing)}.")
+        reader.fieldnames = header
+
+        students, assignments, submissions = self.resolve_keys()
+        entries, errors = {}, []
+        rows = 0
+        for rows, row in enumerate(reader, start=1):
+            line = reader.line_num
+            problems = {}
+            student_id = students.get((row.get("email") or "").strip().lower())
+            if student_id is None:
+                problems["email"] = ["No student with this email is enrolled in the course."]
+            assignment_id = assignments.get((row.get("assignment") or "").strip())
+            if assignment_id is None:
+                problems["assignment"] = ["No assignment with this title in the course."]
+            elif assignment_id is AMBIGUOUS:
+                problems["assignment"] = ["Several assignments of the course have this title."]
+            score = self.parse_score(row.get("score"), problems)
+            letter = (row.get("letter") or "").strip() or None
+            if letter and len(letter) > 2:
+                problems["letter"] = ["Ensure this field has no more than 2 characters."]
+
+            if not problems:
+                target = submissions.get((student_id, assignment_id))
+                if target is None:
+                    problems["submission"] = ["The student has no submission for this assignment."]
+                elif target in entries:
+                    problems["submission"] = [f"Duplicate of line {entries[target]['line']}."]
+            if problems:
+                errors.append({"line": line, "errors": problems})
+                continue
+
+            entries[target] = {
+                "line": line,
+                "student": student_id,
+                "assignment": assignment_id,
+                "exists": False,
+                "old_score": None,
+                "graded_at": None,
+                "score": score,
+                "letter": letter,
+                "feedback": (row.get("feedback") or "").strip() or None,
+            }
+
+        if entries:
+            with transaction.atomic():
+                # The existing grades the counter deltas start from, unchanged until commit
+                for submission_id, (_, grade_id, score, graded_at) in lock_grade_targets(entries).items():
+                    entries[submission_id].update(exists=grade_id is not None, old_score=score, graded_at=graded_at)
+                if connection.vendor == "postgresql":
+                    self.load_copy(entries)
+                else:
+                    self.load_batches(entries)
+                # Bulk writes bypass model signals
+                add_counts(Assignment, merge_deltas(*(
+                    grade_deltas(entry["assignment"], entry["old_score"], entry["score"], created=not entry["exists"])
+                    for entry in entries.values()
+                )))
+                mark_dirty([entry["graded_at"] for entry in entries.values()])
+                student_ids = {entry["student"] for entry in entries.values()}
+                bump_versions(Grade, Submission)
+                invalidate_tags(
+                    table_tag(Grade), table_tag(Submission), f"course:{self.course.pk}",
+                    *(f"student:{pk}" for pk in student_ids),
+                )
+                StudentSummary.objects.refresh(student_ids)
+
+        updated = sum(1 for entry in entries.values() if entry["exists"])
+        return {"rows": rows, "created": len(entries) - updated, "updated": updated, "errors": errors}
+
+    def resolve_keys(self):
+        students = {
+            email.lower(): pk
+            for email, pk in Enrollment.objects.filter(course=self.course).order_by()
+            .values_list("student__email", "student_id")
+        }
+        assignments = {}
+        for title, pk in Assignment.objects.filter(course=self.course).order_by().values_list("title", "pk"):
+            assignments[title.strip()] = AMBIGUOUS if title.strip() in assignments else pk
+        submissions = {
+            (student_id, assignment_id): pk
+            for student_id, assignment_id, pk in Submission.objects.filter(
+                assignment__course=self.course
+            ).order_by().values_list("student_id", "assignment_id", "pk")
+        }
+        return students, assignments, submissions
+
+    @staticmethod
+    def parse_score(value, problems):
+        value = (value or "").strip()
+        if not value:
+            return None
+        try:
+            score = Decimal(value)
+        except InvalidOperation:
+            problems["score"] = ["A valid number is required."]
+            return None
+        if not score.is_finite() or not -MAX_SCORE <= score <= MAX_SCORE:
+            problems["score"] = ["Ensure that there are no more than 5 digits in total."]
+            return None
+        return score.quantize(Decimal("0.01"))
+
+    def load_batches(self, entries):
+        items = list(entries.items())
+        for start in range(0, len(items), self.batch_size):
+            batch = items[start:start + self.batch_size]
+            Grade.objects.bulk_create(
+                [
+                    Grade(
+                        submission_id=submission_id,
+                        instructor_id=self.instructor.pk,
+                        score=entry["score"],
+                        letter=entry["letter"],
+                        feedback=entry["feedback"],
+                    )
+                    for submission_id, entry in batch
+                ],
+                update_conflicts=True,
+                unique_fields=["submission"],
+                update_fields=["instructor", "score", "letter", "feedback"],
+            )
+            # Same rule as Grade.save: only scored grades are copied onto the submission
+            scored = [submission_id for submission_id, entry in batch if entry["score"] is not None]
+            if scored:
+                Submission.objects.filter(pk__in=scored).update(
+                    grade=Subquery(Grade.objects.filter(submission=OuterRef("pk")).order_by().values("score")[:1])
+                )
+
+    def load_copy(self, entries):
+        grades = Grade._meta.db_table
+        submissions = Submission._meta.db_table
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for submission_id, entry in entries.items():
+            writer.writerow([submission_id, entry["score"], entry["letter"], entry["feedback"]])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TEMPORARY TABLE grade_import (submission_id bigint PRIMARY KEY, score numeric(5, 2), "
+                "letter varchar(2), feedback text) ON COMMIT DROP"
+            )
+            copy_sql = "COPY grade_import FROM STDIN WITH (FORMAT csv)"
+            raw = cursor.cursor
+            if hasattr(raw, "copy"):  # psycopg 3
+                with raw.copy(copy_sql) as copy:
+                    copy.write(buffer.getvalue())
+            else:  # psycopg2
+                buffer.seek(0)
+                raw.copy_expert(copy_sql, buffer)
+            cursor.execute(
+                f'INSERT INTO "{grades}" (submission_id, instructor_id, score, letter, feedback, graded_at) '
+                "SELECT submission_id, %s, score, letter, feedback, now() FROM grade_import "
+                "ON CONFLICT (submission_id) DO UPDATE SET instructor_id = EXCLUDED.instructor_id, "
+                "score = EXCLUDED.score, letter = EXCLUDED.letter, feedback = EXCLUDED.feedback",
+                [self.instructor.pk],
+            )
+            cursor.execute(
+                f'UPDATE "{submissions}" SET grade = grade_import.score FROM grade_import '
+                f'WHERE "{submissions}".id = grade_import.submission_id AND grade_import.score IS NOT NULL'
+            )
+            cursor.execute("DROP TABLE grade_import")
+
+
+def import_grades(course, instructor, file):
+    """
+    Import an uploaded or opened binary CSV file; see GradeImporter.
+    """
+    stream = file if isinstance(file, io.TextIOBase) else io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        return GradeImporter(course, instructor).run(stream)
+    except UnicodeDecodeError:
+        raise GradeImportError("The file is not valid UTF-8.")
+    except csv.Error as e:
+        raise GradeImportError(f"Malformed CSV: {e}.")
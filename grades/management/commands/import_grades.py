@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import CustomUser
+from courses.models import Course
+from grades.importer import GradeImportError, import_grades
+
+
+class Command(BaseCommand):
+    """
+    Import a CSV gradebook into a course, keyed by student email and assignment title.
+    """
+    help = "Import grades from a CSV file (email, assignment, score[, letter, feedback]) into a course."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to import.")
+        parser.add_argument("--course", type=int, required=True, help="Id of the course to grade.")
+        parser.add_argument(
+            "--instructor",
+            help="Email of the grading instructor (defaults to the course instructor).",
+        )
+        parser.add_argument("--max-errors", type=int, default=20, help="Number of row errors printed.")
+
+    def handle(self, *args, **options):
+        try:
+            course = Course.objects.select_related("instructor").get(pk=options["course"])
+        except Course.DoesNotExist:
+            raise CommandError(f"Course #{options['course']} does not exist.")
+        instructor = course.instructor
+        if options["instructor"]:
+            try:
+                instructor = CustomUser.objects.get(email=options["instructor"])
+            except CustomUser.DoesNotExist:
+                raise CommandError(f"No user with email {options['instructor']}.")
+
+        try:
+            with open(options["path"], "rb") as file:
+                report = import_grades(course, instructor, file)
+        except OSError as e:
+            raise CommandError(f"Cannot read {options['path']}: {e}")
+        except GradeImportError as e:
+            raise CommandError(str(e))
+
+        for error in report["errors"][:options["max_errors"]]:
+            reasons = "; ".join(f"{field}: {' '.join(messages)}" for field, messages in error["errors"].items())
+            self.stdout.write(f"Line {error['line']}: {reasons}")
+        hidden = len(report["errors"]) - options["max_errors"]
+        if hidden > 0:
+            self.stdout.write(f"... and {hidden} more errors.")
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['rows']} rows: {report['created']} created, {report['updated']} updated, "
+            f"{len(report['errors'])} skipped."
+        ))
@@ -1,5 +1,5 @@
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from assignments.models import Submission
 
 
@@ -58,10 +58,12 @@ class Grade(models.Model):
     def save(self, *args, **kwargs):
         """
         Override save to also update the Submission.grade field
-        for quick analytics access.
+        for quick analytics access. Runs in a transaction, which the counter
+        signals (core.counters) hold the submission's row lock in.
         """
-        super().save(*args, **kwargs)
-        if self.score is not None:
-            # ✅ keep Submission.grade in sync
-            self.submission.grade = self.score
-            self.submission.save(update_fields=["grade"])
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+            if self.score is not None:
+                # ✅ keep Submission.grade in sync
+                self.submission.grade = self.score
+                self.submission.save(update_fields=["grade"])
@@ -1,10 +1,12 @@
 from rest_framework import serializers
 from accounts.models import CustomUser
+from core.compiled import CompilableSerializerMixin
+from core.sparse import SparseSerializerMixin
 from assignments.models import Submission, Assignment
 from .models import Grade
 
 
-class UserNestedSerializer(serializers.ModelSerializer):
+class UserNestedSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     """
     Nested serializer for basic user info.
     Used in Grade and Submission serializers to avoid duplication.
@@ -15,7 +17,7 @@ class UserNestedSerializer(serializers.ModelSerializer):
         ref_name = "GradesUserNested"   # ✅ unique schema name to avoid conflicts
 
 
-class AssignmentNestedSerializer(serializers.ModelSerializer):
+class AssignmentNestedSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     """
     Nested serializer for basic assignment info.
     """
@@ -25,7 +27,7 @@ class AssignmentNestedSerializer(serializers.ModelSerializer):
         ref_name = "GradesAssignmentNested"   # ✅ unique schema name to avoid conflicts
 
 
-class SubmissionNestedSerializer(serializers.ModelSerializer):
+class SubmissionNestedSerializer(CompilableSerializerMixin, SparseSerializerMixin, serializers.ModelSerializer):
     """
     Nested serializer for submission info, including student and assignment.
     """
@@ -36,20 +38,19 @@ class SubmissionNestedSerializer(serializers.ModelSerializer):
         model = Submission
         fields = ("id", "student", "assignment", "content", "submitted_at", "grade")
         ref_name = "GradesSubmissionNested"   # ✅ unique schema name to avoid conflicts
+        expandable_fields = {"student": "student_id", "assignment": "assignment_id"}
 
-    def to_representation(self, instance):
+    def finish_representation(self, representation):
         """
         Ensure null safety for nested fields.
         """
-        representation = super().to_representation(instance)
-        if not getattr(instance, "student", None):
-            representation["student"] = None
-        if not getattr(instance, "assignment", None):
-            representation["assignment"] = None
+        for name in ("student", "assignment"):
+            if name in self.fields:
+                representation.setdefault(name, None)
         return representation
 
 
-class SubmissionSerializer(serializers.ModelSerializer):
+class SubmissionSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     """
     Full serializer for submissions, allowing instructors to grade.
     """
@@ -68,9 +69,10 @@ class SubmissionSerializer(serializers.ModelSerializer):
             "grade",   # ✅ matches Submission model field
         ]
         read_only_fields = ["id", "student", "assignment", "submitted_at"]
+        expandable_fields = {"student": "student_id", "assignment": "assignment_id"}
 
 
-class GradeSerializer(serializers.ModelSerializer):
+class GradeSerializer(CompilableSerializerMixin, SparseSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for grades.
     Includes nested instructor, submission details, and student info.
@@ -94,6 +96,13 @@ class GradeSerializer(serializers.ModelSerializer):
             "graded_at",
         )
         read_only_fields = ("instructor", "graded_at")
+        expandable_fields = {"submission_detail": None, "student": "submission.student_id", "instructor": "instructor_id"}
+        method_field_sources = {
+            "student": [
+                "submission__student__id", "submission__student__email",
+                "submission__student__username", "submission__student__role",
+            ],
+        }
 
     def get_student(self, obj):
         """
@@ -137,15 +146,24 @@ class GradeSerializer(serializers.ModelSerializer):
             validated_data["instructor"] = request.user
         return super().update(instance, validated_data)
 
-    def to_representation(self, instance):
+    def finish_representation(self, representation):
         """
         Ensure null safety for nested fields.
         """
-        representation = super().to_representation(instance)
-        if not getattr(instance, "submission", None):
-            representation["submission_detail"] = None
-        if not getattr(instance, "instructor", None):
-            representation["instructor"] = None
-        if not representation.get("student"):
+        for name in ("submission_detail", "instructor"):
+            if name in self.fields:
+                representation.setdefault(name, None)
+        if "student" in self.fields and not representation.get("student"):
             representation["student"] = None
         return representation
+
+
+class BulkGradeEntrySerializer(serializers.Serializer):
+    """
+    One row of a bulk grading request. Ownership of the submission is checked
+    set-wise by GradeViewSet.bulk, not per row.
+    """
+    submission = serializers.IntegerField(min_value=1)
+    score = serializers.DecimalField(max_digits=5, decimal_places=2, required=False, allow_null=True)
+    letter = serializers.CharField(max_length=2, required=False, allow_blank=True, allow_null=True)
+    feedback = serializers.CharField(required=False, allow_blank=True, allow_null=True)
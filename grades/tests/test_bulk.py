@@ -0,0 +1,143 @@
+import datetime
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from assignments.models import Assignment, Submission
+from core import replicas
+from courses.models import Course, Enrollment
+from dashboard.models import StudentSummary
+from grades.models import Grade
+
+
+class BulkGradeTests(TestCase):
+    """
+    Tests for POST /api/grades/bulk/.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.other_instructor = CustomUser.objects.create_user(
+            email="other@example.com", password="password123", role="instructor"
+        )
+        course = Course.objects.create(title="Math 101", instructor=self.instructor)
+        other_course = Course.objects.create(title="History 101", instructor=self.other_instructor)
+        due = timezone.now() + datetime.timedelta(days=7)
+        assignment = Assignment.objects.create(course=course, title="Homework", due_date=due)
+        other_assignment = Assignment.objects.create(course=other_course, title="Essay", due_date=due)
+        self.students = []
+        self.submissions = []
+        for i in range(5):
+            student = CustomUser.objects.create_user(
+                email=f"student{i}@example.com", password="password123", role="student"
+            )
+            Enrollment.objects.create(course=course, student=student)
+            self.students.append(student)
+            self.submissions.append(Submission.objects.create(assignment=assignment, student=student, content="A"))
+        self.foreign_submission = Submission.objects.create(
+            assignment=other_assignment, student=self.students[0], content="B"
+        )
+        self.client.force_authenticate(user=self.instructor)
+
+    def post(self, rows):
+        return self.client.post("/api/grades/bulk/", {"grades": rows}, format="json")
+
+    def test_creates_and_updates_with_constant_queries(self):
+        Grade.objects.create(submission=self.submissions[0], instructor=self.instructor, score=50, letter="F")
+        rows = [
+            {"submission": submission.pk, "score": 80 + i, "letter": "B", "feedback": "Good"}
+            for i, submission in enumerate(self.submissions)
+        ]
+        # With replicas, a RecentWrite upsert keeps the instructor's reads on the primary
+        with self.assertNumQueries(13 + bool(replicas.replicas())):
+            response = self.post(rows)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["created"], response.data["updated"], response.data["errors"]), (4, 1, 0))
+        self.assertEqual([r["status"] for r in response.data["results"]], ["updated"] + ["created"] * 4)
+
+        self.assertEqual(Grade.objects.count(), 5)
+        for i, submission in enumerate(self.submissions):
+            submission.refresh_from_db()
+            self.assertEqual(submission.grade, Decimal(80 + i))
+            self.assertEqual(submission.grade_record.letter, "B")
+        self.assertEqual(StudentSummary.objects.get(pk=self.students[4].pk).score_total, Decimal("84"))
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.post([{"submission": self.submissions[0].pk, "score": 70}])  # creates the table version rows
+        Grade.objects.all().delete()
+        with CaptureQueriesContext(connection) as one_row:
+            self.post([{"submission": self.submissions[0].pk, "score": 70}])
+        Grade.objects.all().delete()
+        with CaptureQueriesContext(connection) as five_rows:
+            self.post([{"submission": s.pk, "score": 70} for s in self.submissions])
+        self.assertEqual(len(one_row.captured_queries), len(five_rows.captured_queries))
+
+    def test_per_row_errors(self):
+        response = self.post([
+            {"submission": self.submissions[0].pk, "score": 90, "letter": "A"},
+            {"submission": self.foreign_submission.pk, "score": 90},
+            {"submission": 999999, "score": 90},
+            {"submission": self.submissions[1].pk, "score": "not a number"},
+            {"submission": self.submissions[0].pk, "score": 10},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        statuses = [r["status"] for r in response.data["results"]]
+        self.assertEqual(statuses, ["created", "error", "error", "error", "error"])
+        self.assertIn("own courses", response.data["results"][1]["errors"]["submission"][0])
+        self.assertIn("score", response.data["results"][3]["errors"])
+        self.assertEqual(Grade.objects.count(), 1)
+        self.assertFalse(Grade.objects.filter(submission=self.foreign_submission).exists())
+
+    def test_omitted_fields_are_kept(self):
+        Grade.objects.create(
+            submission=self.submissions[0], instructor=self.instructor, score=50, letter="F", feedback="Redo it"
+        )
+        Grade.objects.create(submission=self.submissions[1], instructor=self.instructor, score=70, letter="C")
+        response = self.post([
+            {"submission": self.submissions[0].pk, "score": 95},
+            {"submission": self.submissions[1].pk, "feedback": "Better"},
+            {"submission": self.submissions[2].pk, "letter": "B"},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        grades = {g.submission_id: g for g in Grade.objects.all()}
+        first, second, third = (grades[s.pk] for s in self.submissions[:3])
+        self.assertEqual((first.score, first.letter, first.feedback), (Decimal(95), "F", "Redo it"))
+        self.assertEqual((second.score, second.letter, second.feedback), (Decimal(70), "C", "Better"))
+        self.assertEqual((third.score, third.letter, third.feedback), (None, "B", None))
+        counters = Assignment.objects.values_list("graded_count", "scored_count", "score_sum")
+        self.assertEqual(counters.get(pk=self.submissions[0].assignment_id), (3, 2, Decimal(165)))
+
+    def test_students_cannot_bulk_grade(self):
+        self.client.force_authenticate(user=self.students[0])
+        response = self.post([{"submission": self.submissions[0].pk, "score": 100}])
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_rejects_empty_and_oversized_payloads(self):
+        self.assertEqual(self.post([]).status_code, status.HTTP_400_BAD_REQUEST)
+        from grades.views import GradeViewSet
+        original = GradeViewSet.bulk_max_rows
+        GradeViewSet.bulk_max_rows = 2
+        try:
+            response = self.post([{"submission": s.pk, "score": 1} for s in self.submissions[:3]])
+        finally:
+            GradeViewSet.bulk_max_rows = original
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cached_lists_see_bulk_grades(self):
+        self.client.force_authenticate(user=self.students[2])
+        self.assertEqual(self.client.get("/api/grades/").json(), [])
+        self.client.force_authenticate(user=self.instructor)
+        self.post([{"submission": self.submissions[2].pk, "score": 77}])
+        self.client.force_authenticate(user=self.students[2])
+        self.assertEqual(len(self.client.get("/api/grades/").json()), 1)
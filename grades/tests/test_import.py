@@ -0,0 +1,139 @@
+import datetime
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from assignments.models import Assignment, Submission
+from courses.models import Course, Enrollment
+from dashboard.models import StudentSummary
+from grades.models import Grade
+
+
+class GradeImportTests(TestCase):
+    """
+    Tests for POST /api/grades/import/ and the import_grades command.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.instructor = CustomUser.objects.create_user(
+            email="instructor@example.com", password="password123", role="instructor"
+        )
+        self.other_instructor = CustomUser.objects.create_user(
+            email="other@example.com", password="password123", role="instructor"
+        )
+        self.course = Course.objects.create(title="Math 101", instructor=self.instructor)
+        due = timezone.now() + datetime.timedelta(days=7)
+        self.homework = Assignment.objects.create(course=self.course, title="Homework", due_date=due)
+        self.quiz = Assignment.objects.create(course=self.course, title="Quiz", due_date=due)
+        self.students = []
+        for i in range(3):
+            student = CustomUser.objects.create_user(
+                email=f"student{i}@example.com", password="password123", role="student"
+            )
+            Enrollment.objects.create(course=self.course, student=student)
+            self.students.append(student)
+            for assignment in (self.homework, self.quiz):
+                Submission.objects.create(assignment=assignment, student=student, content="A")
+        self.outsider = CustomUser.objects.create_user(
+            email="outsider@example.com", password="password123", role="student"
+        )
+        self.client.force_authenticate(user=self.instructor)
+
+    def submission(self, student, assignment):
+        return Submission.objects.get(student=student, assignment=assignment)
+
+    def upload(self, text, course=None):
+        return self.client.post(
+            "/api/grades/import/",
+            {"course": course or self.course.pk, "file": SimpleUploadedFile("grades.csv", text.encode(), "text/csv")},
+            format="multipart",
+        )
+
+    def test_imports_and_reports_row_errors(self):
+        Grade.objects.create(
+            submission=self.submission(self.students[0], self.homework), instructor=self.instructor, score=10, letter="F"
+        )
+        response = self.upload(
+            "Email,Assignment,Score,Letter,Feedback\n"
+            "STUDENT0@example.com,Homework,91.5,A,Great\n"
+            "student0@example.com,Quiz,80,B,\n"
+            "student1@example.com,Homework,,,Ungraded note\n"
+            "outsider@example.com,Homework,50,F,\n"
+            "student2@example.com,Essay,50,F,\n"
+            "student2@example.com,Quiz,abc,F,\n"
+            "student0@example.com,Quiz,70,C,\n"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            (response.data["rows"], response.data["created"], response.data["updated"]), (7, 2, 1)
+        )
+        errors = {error["line"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(sorted(errors), [5, 6, 7, 8])
+        self.assertIn("email", errors[5])
+        self.assertIn("assignment", errors[6])
+        self.assertIn("score", errors[7])
+        self.assertIn("Duplicate of line 3", errors[8]["submission"][0])
+
+        homework = self.submission(self.students[0], self.homework)
+        self.assertEqual(homework.grade, Decimal("91.50"))
+        self.assertEqual((homework.grade_record.letter, homework.grade_record.feedback), ("A", "Great"))
+        self.assertEqual(self.submission(self.students[0], self.quiz).grade, Decimal("80"))
+        ungraded = self.submission(self.students[1], self.homework)
+        self.assertIsNone(ungraded.grade)
+        self.assertEqual(ungraded.grade_record.feedback, "Ungraded note")
+        self.assertEqual(Grade.objects.count(), 3)
+        self.assertEqual(StudentSummary.objects.get(pk=self.students[0].pk).score_total, Decimal("171.50"))
+
+    def test_query_count_does_not_grow_with_rows(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.upload("email,assignment,score\nstudent0@example.com,Quiz,1\n")  # creates the table version rows
+        Grade.objects.all().delete()
+        with CaptureQueriesContext(connection) as one_row:
+            self.upload("email,assignment,score\nstudent0@example.com,Quiz,1\n")
+        Grade.objects.all().delete()
+        rows = "".join(f"{s.email},{a.title},5\n" for s in self.students for a in (self.homework, self.quiz))
+        with CaptureQueriesContext(connection) as six_rows:
+            self.upload("email,assignment,score\n" + rows)
+        self.assertEqual(len(one_row.captured_queries), len(six_rows.captured_queries))
+        self.assertEqual(Grade.objects.count(), 6)
+
+    def test_rejects_bad_files(self):
+        response = self.upload("email,score\nstudent0@example.com,1\n")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("assignment", response.data["file"][0])
+        response = self.client.post("/api/grades/import/", {"course": self.course.pk}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_access(self):
+        self.client.force_authenticate(user=self.students[0])
+        self.assertEqual(self.upload("email,assignment,score\n").status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=self.other_instructor)
+        self.assertEqual(self.upload("email,assignment,score\n").status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+            file.write("email,assignment,score\nstudent1@example.com,Quiz,66\nnobody@example.com,Quiz,1\n")
+        self.addCleanup(os.remove, file.name)
+        out = StringIO()
+        call_command("import_grades", file.name, "--course", str(self.course.pk), stdout=out)
+        self.assertIn("2 rows: 1 created, 0 updated, 1 skipped", out.getvalue())
+        self.assertIn("Line 3: email", out.getvalue())
+        grade = self.submission(self.students[1], self.quiz).grade_record
+        self.assertEqual((grade.score, grade.instructor), (Decimal("66"), self.instructor))
+        with self.assertRaises(CommandError):
+            call_command("import_grades", file.name, "--course", "999999", stdout=StringIO())
@@ -1,21 +1,40 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
 from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.exceptions import PermissionDenied
-from assignments.models import Submission
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from accounts.models import CustomUser
+from analytics.rollups import mark_dirty
+from core.cache import invalidate_tags, table_tag
+from core.counters import add_counts, grade_deltas, lock_grade_targets, merge_deltas
+from core.mixins import CompiledListMixin, SparseFieldsMixin, StreamingListMixin, TaggedCacheMixin
+from core.versions import bump_versions
+from assignments.models import Assignment, Submission
+from courses.models import Course
+from dashboard.models import StudentSummary
+from .importer import GradeImportError, import_grades
 from .models import Grade
-from .serializers import GradeSerializer, SubmissionSerializer
+from .serializers import BulkGradeEntrySerializer, GradeSerializer, SubmissionSerializer
 
 
-class GradeViewSet(viewsets.ModelViewSet):
+class GradeViewSet(CompiledListMixin, SparseFieldsMixin, StreamingListMixin, TaggedCacheMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing grades.
     Role-based isolation:
     - Students: can view only their own grades.
     - Instructors: can view grades for their courses and create/update/delete grades.
     - Admins: can view/manage all grades.
+    List and retrieve responses are served from the tagged cache; lists are
+    rendered from values_list() rows by the compiled serializer.
     """
     serializer_class = GradeSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cache_models = (Grade, Submission, Assignment, CustomUser)
+    bulk_max_rows = 1000
+    bulk_grade_fields = ("score", "letter", "feedback")
 
     def get_queryset(self):
         user = self.request.user
@@ -58,8 +77,162 @@ class GradeViewSet(viewsets.ModelViewSet):
         """
         serializer.save(instructor=self.request.user)
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Create or update up to bulk_max_rows grades in one request.
+
+        Accepts a list of {submission, score, letter, feedback} rows (or {"grades": [...]}).
+        score, letter and feedback are optional: an existing grade keeps the ones a row
+        leaves out. Rows are validated individually and ownership is checked for all
+        submissions in one query; valid rows are upserted with one INSERT ... ON CONFLICT
+        per set of supplied fields (at most eight) and Submission.grade is synced with a
+        single UPDATE, in one transaction that holds the submissions' row locks from
+        reading the old scores to moving the counters.
+        Returns one result per input row, in input order.
+        """
+        user = request.user
+        if getattr(user, "role", None) not in ["instructor", "admin"]:
+            return Response(
+                {"detail": "Access denied. Only instructors or admins can create grades."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        rows = request.data.get("grades") if isinstance(request.data, dict) else request.data
+        if not isinstance(rows, list) or not rows:
+            raise ValidationError({"grades": ["Expected a non-empty list of grades."]})
+        if len(rows) > self.bulk_max_rows:
+            raise ValidationError({"grades": [f"At most {self.bulk_max_rows} grades per request."]})
+
+        results = [None] * len(rows)
+        entries = {}
+        for index, row in enumerate(rows):
+            entry = BulkGradeEntrySerializer(data=row)
+            if not entry.is_valid():
+                results[index] = {"submission": row.get("submission") if isinstance(row, dict) else None,
+                                  "status": "error", "errors": entry.errors}
+            elif entry.validated_data["submission"] in entries:
+                results[index] = {"submission": entry.validated_data["submission"], "status": "error",
+                                  "errors": {"submission": ["Duplicate submission in this request."]}}
+            else:
+                entries[entry.validated_data["submission"]] = (index, entry.validated_data)
+
+        # One query answers existence, ownership, the cache tags to invalidate and the counters to move
+        targets = {
+            pk: (student_id, course_id, instructor_id, assignment_id)
+            for pk, student_id, course_id, instructor_id, assignment_id in Submission.objects.filter(
+                pk__in=entries
+            ).order_by().values_list(
+                "pk", "student_id", "assignment__course_id", "assignment__course__instructor_id", "assignment_id"
+            )
+        }
+        for submission_id, (index, _) in list(entries.items()):
+            target = targets.get(submission_id)
+            error = None
+            if target is None:
+                error = "Submission not found."
+            elif user.role == "instructor" and target[2] != user.pk:
+                error = "You can only grade submissions for your own courses."
+            if error:
+                results[index] = {"submission": submission_id, "status": "error", "errors": {"submission": [error]}}
+                del entries[submission_id]
+
+        if entries:
+            with transaction.atomic():
+                existing, graded_at = {}, []
+                for pk, (_, grade_id, score, moment) in lock_grade_targets(entries).items():
+                    if grade_id is not None:
+                        existing[pk] = score
+                        graded_at.append(moment)
+                groups = defaultdict(list)
+                for submission_id, (_, data) in entries.items():
+                    supplied = tuple(field for field in self.bulk_grade_fields if field in data)
+                    groups[supplied].append(Grade(
+                        submission_id=submission_id, instructor_id=user.pk, **{field: data[field] for field in supplied}
+                    ))
+                for supplied, grades in groups.items():
+                    Grade.objects.bulk_create(
+                        grades,
+                        update_conflicts=True,
+                        unique_fields=["submission"],
+                        update_fields=["instructor", *supplied],
+                    )
+                # Same rule as Grade.save: only scored grades are copied onto the submission
+                scored = [pk for pk, (_, data) in entries.items() if data.get("score") is not None]
+                if scored:
+                    Submission.objects.filter(pk__in=scored).update(
+                        grade=Subquery(Grade.objects.filter(submission=OuterRef("pk")).order_by().values("score")[:1])
+                    )
+                grade_ids = dict(
+                    Grade.objects.filter(submission_id__in=entries).order_by().values_list("submission_id", "pk")
+                )
+
+                # bulk_create and update() bypass model signals
+                add_counts(Assignment, merge_deltas(*(
+                    grade_deltas(
+                        targets[pk][3], existing.get(pk), data["score"] if "score" in data else existing.get(pk),
+                        created=pk not in existing,
+                    )
+                    for pk, (_, data) in entries.items()
+                )))
+                mark_dirty(graded_at)
+                student_ids = {targets[pk][0] for pk in entries}
+                bump_versions(Grade, Submission)
+                invalidate_tags(
+                    table_tag(Grade), table_tag(Submission),
+                    *(f"student:{pk}" for pk in student_ids),
+                    *{f"course:{targets[pk][1]}" for pk in entries},
+                )
+                StudentSummary.objects.refresh(student_ids)
+
+            for submission_id, (index, _) in entries.items():
+                results[index] = {
+                    "submission": submission_id,
+                    "status": "updated" if submission_id in existing else "created",
+                    "id": grade_ids[submission_id],
+                }
+
+        return Response({
+            "created": sum(1 for r in results if r["status"] == "created"),
+            "updated": sum(1 for r in results if r["status"] == "updated"),
+            "errors": sum(1 for r in results if r["status"] == "error"),
+            "results": results,
+        })
+
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_csv(self, request):
+        """
+        Import a CSV gradebook (multipart "file") into the course given as "course".
+
+        Rows are keyed by student email and assignment title; see grades.importer.
+        Returns {rows, created, updated, errors} where errors lists the skipped
+        lines with their reasons. Only the course instructor or admins may import.
+        """
+        user = request.user
+        if getattr(user, "role", None) not in ["instructor", "admin"]:
+            return Response(
+                {"detail": "Access denied. Only instructors or admins can import grades."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": ["A CSV file is required."]})
+        courses = Course.objects.all() if user.role == "admin" else Course.objects.filter(instructor=user)
+        try:
+            course = courses.get(pk=int(request.data.get("course")))
+        except (TypeError, ValueError):
+            raise ValidationError({"course": ["A valid course id is required."]})
+        except Course.DoesNotExist:
+            raise NotFound("Course not found.")
+
+        try:
+            report = import_grades(course, user, upload)
+        except GradeImportError as e:
+            raise ValidationError({"file": [str(e)]})
+        return Response(report)
+
 
-class SubmissionViewSet(viewsets.ModelViewSet):
+class SubmissionViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing submissions.
     Role-based isolation:
@@ -1,22 +1,19 @@
-#!/usr/bin/env python
-"""Django's command-line utility for administrative tasks."""
-import os
-import sys
+"""
+ASGI config for lms_backend project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server (e.g. ``uvicorn lms_backend.asgi:application``) so
+the async dashboard and analytics views run their aggregates concurrently
+(core.parallel); sync views run on a thread as usual.
 
+For more information on this file, see
+https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
+"""
 
-def main():
-    """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'lms_backend.settings')
-    try:
-        from django.core.management import execute_from_command_line
-    except ImportError as exc:
-        raise ImportError(
-            "Couldn't import Django. Are you sure it's installed and "
-            "available on your PYTHONPATH environment variable? Did you "
-            "forget to activate a virtual environment?"
-        ) from exc
-    execute_from_command_line(sys.argv)
+import os
+from django.core.asgi import get_asgi_application
 
+# Set the default settings module for the 'lms_backend' project
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'lms_backend.settings')
 
-if __name__ == '__main__':
-    main()
+application = get_asgi_application()
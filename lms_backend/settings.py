@@ -1,4 +1,5 @@
 import os
+import sys
 from pathlib import Path
 from datetime import timedelta
 
@@ -37,10 +38,13 @@ INSTALLED_APPS = [
     "grades",
     "analytics",
     "enrollments",
+    "dashboard",
+    "core",
     "django_extensions",
 ]
 
 MIDDLEWARE = [
+    "core.middleware.QueryProfilerMiddleware",  # outermost, so it times the whole request
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",  # must be high in the list
@@ -49,8 +53,31 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
 ]
 
+# ✅ Per-request query profiler (Server-Timing header + JSON log line on "lms.profiler")
+QUERY_PROFILER_ENABLED = os.environ.get("QUERY_PROFILER_ENABLED", str(DEBUG)) == "True"
+# Log SQL statements repeated within one request (N+1) with the stack that issued them
+QUERY_PROFILER_DUPLICATES = os.environ.get("QUERY_PROFILER_DUPLICATES", "False") == "True"
+QUERY_PROFILER_DUPLICATE_THRESHOLD = int(os.environ.get("QUERY_PROFILER_DUPLICATE_THRESHOLD", "3"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        # INFO logs one JSON line per request; WARNING keeps only duplicate-query reports
+        "lms.profiler": {
+            "handlers": ["console"],
+            "level": os.environ.get("QUERY_PROFILER_LOG_LEVEL", "WARNING"),
+            "propagate": False,
+        },
+    },
+}
+
 ROOT_URLCONF = "lms_backend.urls"
 
 TEMPLATES = [
@@ -71,6 +98,30 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "lms_backend.wsgi.application"
+ASGI_APPLICATION = "lms_backend.asgi.application"
+
+# ✅ Async views (core.parallel) run independent queries concurrently, one connection per pool thread
+ASYNC_CONCURRENT_QUERIES = os.environ.get("ASYNC_CONCURRENT_QUERIES", "True") == "True"
+ASYNC_QUERY_WORKERS = int(os.environ.get("ASYNC_QUERY_WORKERS", "8"))  # per process, bounds extra connections
+
+# ✅ PostgreSQL connections come from a per-process psycopg pool (core.pooled_postgresql)
+DB_POOL_ENABLED = os.environ.get("DB_POOL_ENABLED", "True") == "True"
+DB_MAX_CONNECTIONS = int(os.environ.get("DB_MAX_CONNECTIONS", "80"))  # server-side budget for this app
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", "4"))  # worker processes sharing that budget
+DB_POOL_OPTIONS = {
+    "min_size": int(os.environ.get("DB_POOL_MIN_SIZE", "2")),
+    # Per process and database server; split between the aliases on one server below
+    "max_size": int(os.environ.get("DB_POOL_MAX_SIZE", str(max(2, DB_MAX_CONNECTIONS // WEB_CONCURRENCY)))),
+    "max_lifetime": float(os.environ.get("DB_POOL_MAX_LIFETIME", "1800")),  # seconds before a connection is recycled
+    "max_idle": float(os.environ.get("DB_POOL_MAX_IDLE", "300")),
+    "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "10")),  # seconds a checkout waits before failing
+}
+POSTGRESQL_ENGINE = "core.pooled_postgresql" if DB_POOL_ENABLED else "django.db.backends.postgresql"
+POSTGRESQL_POOL = {
+    "OPTIONS": {"pool": DB_POOL_OPTIONS},
+    "CONN_MAX_AGE": 0,
+    "CONN_HEALTH_CHECKS": True,
+} if DB_POOL_ENABLED else {}
 
 # ✅ Database configuration
 if os.environ.get("USE_SQLITE", "False") == "True":
@@ -83,26 +134,72 @@ if os.environ.get("USE_SQLITE", "False") == "True":
 elif os.environ.get("USE_LOCAL_DB", "False") == "True":
     DATABASES = {
         "default": {
-            "ENGINE": "django.db.backends.postgresql",
+            "ENGINE": POSTGRESQL_ENGINE,
             "NAME": os.environ.get("DB_NAME", "lms_local"),
             "USER": os.environ.get("DB_USER", "lms_user"),
             "PASSWORD": os.environ.get("DB_PASSWORD", "Felicia@2025"),
             "HOST": os.environ.get("DB_HOST", "localhost"),
             "PORT": os.environ.get("DB_PORT", "5432"),
+            **POSTGRESQL_POOL,
         }
     }
 else:
     DATABASES = {
         "default": {
-            "ENGINE": "django.db.backends.postgresql",
+            "ENGINE": POSTGRESQL_ENGINE,
             "NAME": "atomict2_primary",
             "USER": "atomict2_primary_1",
             "PASSWORD": os.environ.get("DB_PASSWORD", "r00t435200"),
             "HOST": "atomic-technology.com",
             "PORT": "5432",
+            **POSTGRESQL_POOL,
         }
     }
 
+# ✅ Read replicas (core.replicas): analytics, dashboards and admin list pages read from these.
+# DB_REPLICA_HOSTS="host1,host2" and/or DB_REPLICA_NAME add replica, replica_2... copying the
+# primary's settings (two local PostgreSQL databases: DB_REPLICA_NAME=lms_local_replica).
+# Under SQLite the replica is a second connection to SQLITE_REPLICA_PATH, the primary file
+# unless pointed at a copy of it.
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.environ.get("SQLITE_REPLICA_PATH", DATABASES["default"]["NAME"]),
+        "TEST": {"MIRROR": "default"},
+    }
+elif os.environ.get("DB_REPLICA_HOSTS") or os.environ.get("DB_REPLICA_NAME"):
+    replica_hosts = os.environ.get("DB_REPLICA_HOSTS", DATABASES["default"]["HOST"]).split(",")
+    for index, host in enumerate(replica_hosts, start=1):
+        DATABASES["replica" if index == 1 else f"replica_{index}"] = {
+            **DATABASES["default"],
+            "HOST": host.strip(),
+            "NAME": os.environ.get("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+            "TEST": {"MIRROR": "default"},
+        }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+
+# ✅ Pool sizes: each alias gets its own pool in every process, so the aliases on one database
+# server (the primary and a DB_REPLICA_NAME database beside it) share that server's
+# DB_MAX_CONNECTIONS // WEB_CONCURRENCY instead of each taking all of it. The gather threads
+# (ASYNC_QUERY_WORKERS) check out of these same pools: they count toward max_size rather than
+# adding to it, and a gather wider than what is left waits up to DB_POOL_TIMEOUT for a connection.
+if DB_POOL_ENABLED and "DB_POOL_MAX_SIZE" not in os.environ:
+    pooled_aliases_by_server = {}
+    for alias, database in DATABASES.items():
+        if "pool" in database.get("OPTIONS", {}):
+            pooled_aliases_by_server.setdefault((database["HOST"], database["PORT"]), []).append(alias)
+    for aliases in pooled_aliases_by_server.values():
+        max_size = max(2, DB_MAX_CONNECTIONS // WEB_CONCURRENCY // len(aliases))
+        for alias in aliases:
+            DATABASES[alias]["OPTIONS"] = {
+                **DATABASES[alias]["OPTIONS"],
+                "pool": {**DB_POOL_OPTIONS, "max_size": max_size, "min_size": min(DB_POOL_OPTIONS["min_size"], max_size)},
+            }
+DATABASE_ROUTERS = ["core.replicas.ReplicaRouter"]
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", "15"))  # primary-only reads after a write
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_LAG_CHECK_INTERVAL = float(os.environ.get("REPLICA_LAG_CHECK_INTERVAL", "5"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -132,13 +229,58 @@ AUTHENTICATION_BACKENDS = [
     "django.contrib.auth.backends.ModelBackend",  # keep default for admin login
 ]
 
+# ✅ Cache used by the tagged API response cache (core.cache).
+# Local memory is per process: deployments running several workers must point
+# REDIS_URL at a shared Redis (needs the redis package) so invalidations reach every worker.
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "lms-api",
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+API_CACHE_ALIAS = "default"
+API_CACHE_TIMEOUT = int(os.environ.get("API_CACHE_TIMEOUT", "300"))
+
+# ✅ Per-process LRU of users for ClaimsJWTAuthentication
+AUTH_USER_CACHE_SIZE = 1024
+AUTH_USER_CACHE_TTL = 60  # seconds
+
+# ✅ AnalyticsLog events are queued in-process and bulk-inserted off the request path
+ANALYTICS_LOG_BATCH_SIZE = 500
+ANALYTICS_LOG_FLUSH_INTERVAL = 2.0  # seconds
+ANALYTICS_LOG_QUEUE_SIZE = 10000  # events beyond this are dropped and counted
+ANALYTICS_LOG_RETENTION_DAYS = 90  # older events are compacted into daily counts
+# One event per report served. Off under `manage.py test`: the shared writer's flush thread would
+# insert into the test database behind the tests' backs.
+ANALYTICS_LOG_REPORTS = os.environ.get("ANALYTICS_LOG_REPORTS", str(sys.argv[1:2] != ["test"])) == "True"
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # ✅ role/staff flags come from token claims, no user SELECT per request
+        "accounts.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.AllowAny",
     ),
+    # ✅ orjson-backed JSON (falls back to the stdlib encoder when orjson is missing)
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 
 SIMPLE_JWT = {
@@ -12,6 +12,7 @@ from courses.views import CourseViewSet, EnrollmentViewSet
 from assignments.views import AssignmentViewSet, SubmissionViewSet
 from grades.views import GradeViewSet, SubmissionViewSet as GradeSubmissionViewSet
 from dashboard.views import StudentDashboardView, InstructorDashboardView, AdminDashboardView
+from core.search_views import SearchView
 
 # ✅ Swagger schema view (public, no auth required)
 schema_view = get_schema_view(
@@ -64,11 +65,17 @@ urlpatterns = [
     path("accounts/", include("accounts.urls")),   # ✅ include accounts routes
     path("users/", include("users.urls")),
 
+    # Analytics
+    path("analytics/", include("analytics.urls")),
+
     # Dashboards
     path("dashboard/student/", StudentDashboardView.as_view(), name="student-dashboard"),
     path("dashboard/instructor/", InstructorDashboardView.as_view(), name="instructor-dashboard"),
     path("dashboard/admin/", AdminDashboardView.as_view(), name="admin-dashboard"),
 
+    # Full-text search (before the router so it is not taken for a route prefix)
+    path("api/search/", SearchView.as_view(), name="search"),
+
     # API router
     path("api/", include(router.urls)),
 
@@ -1,14 +1,15 @@
 from django.contrib import admin
+from core.replicas import ReplicaChangeListMixin
 from .models import StudentProfile, InstructorProfile
 
 
 @admin.register(StudentProfile)
-class StudentProfileAdmin(admin.ModelAdmin):
+class StudentProfileAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
     list_display = ("user", "enrollment_date", "grade_level")
     search_fields = ("user__username", "user__email")
 
 
 @admin.register(InstructorProfile)
-class InstructorProfileAdmin(admin.ModelAdmin):
+class InstructorProfileAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
     list_display = ("user", "hire_date", "expertise")
     search_fields = ("user__username", "user__email")
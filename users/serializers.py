@@ -1,10 +1,11 @@
 from rest_framework import serializers
 from accounts.models import CustomUser, Profile
+from core.sparse import SparseSerializerMixin
 from courses.models import Course, Module
 from assignments.models import Assignment, Submission
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     """
     Nested serializer for user profile information (Users).
     """
@@ -14,7 +15,7 @@ class ProfileSerializer(serializers.ModelSerializer):
         ref_name = "UsersProfile"   # ✅ unique schema name
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for CustomUser.
     Includes nested profile information.
@@ -35,15 +36,16 @@ class UserSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "is_staff", "is_superuser", "is_active"]
         ref_name = "UsersCustomUser"   # ✅ unique schema name
+        expandable_fields = {"profile": None}
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        if not getattr(instance, "profile", None):
+        if "profile" in self.fields and not getattr(instance, "profile", None):
             representation["profile"] = None
         return representation
 
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for Course.
     Includes instructor username for clarity.
@@ -56,7 +58,7 @@ class CourseSerializer(serializers.ModelSerializer):
         ref_name = "UsersCourse"   # ✅ unique schema name
 
 
-class ModuleSerializer(serializers.ModelSerializer):
+class ModuleSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for Module.
     Includes course title for clarity.
@@ -69,7 +71,7 @@ class ModuleSerializer(serializers.ModelSerializer):
         ref_name = "UsersModule"   # ✅ unique schema name
 
 
-class AssignmentSerializer(serializers.ModelSerializer):
+class AssignmentSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for Assignment.
     Includes module title and creator username for clarity.
@@ -92,7 +94,7 @@ class AssignmentSerializer(serializers.ModelSerializer):
         ref_name = "UsersAssignment"   # ✅ unique schema name
 
 
-class SubmissionSerializer(serializers.ModelSerializer):
+class SubmissionSerializer(SparseSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for Submission.
     Includes assignment title and student username for clarity.
@@ -3,6 +3,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 
 from accounts.models import CustomUser
+from core.mixins import SparseFieldsMixin
 from courses.models import Course, Module
 from assignments.models import Assignment, Submission
 
@@ -16,7 +17,7 @@ from .serializers import (
 from accounts.serializers import RegisterSerializer
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing users.
     - Admins: can view/manage all users.
@@ -47,7 +48,7 @@ class UserViewSet(viewsets.ModelViewSet):
         return super().create(request, *args, **kwargs)
 
 
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing courses.
     - Instructors: can view/create their own courses.
@@ -85,7 +86,7 @@ class CourseViewSet(viewsets.ModelViewSet):
         serializer.save(instructor=self.request.user)
 
 
-class ModuleViewSet(viewsets.ModelViewSet):
+class ModuleViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing modules.
     - Instructors/Admins: can create modules.
@@ -104,7 +105,7 @@ class ModuleViewSet(viewsets.ModelViewSet):
         return super().create(request, *args, **kwargs)
 
 
-class AssignmentViewSet(viewsets.ModelViewSet):
+class AssignmentViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing assignments.
     - Instructors: can create assignments for their courses.
@@ -142,7 +143,7 @@ class AssignmentViewSet(viewsets.ModelViewSet):
         serializer.save(created_by=self.request.user)
 
 
-class SubmissionViewSet(viewsets.ModelViewSet):
+class SubmissionViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing submissions.
     - Students: can create/view their own submissions.